@@ -7,6 +7,10 @@ class Settings(BaseSettings):
     llm_model: str = "llama-3.3-70b-versatile"
     llm_temperature: float = 0.1
     max_tokens: int = 2048
+    llm_timeout_s: float = 60.0
+    llm_base_url: Optional[str] = None  # Groq-compatible endpoint override (None = api.groq.com)
+    context_token_budget: int = 2500  # approximate tokens of retrieved evidence per prompt
+    context_doc_max_tokens: int = 700  # cap for any single document (long case excerpts)
     
     # ChromaDB Settings
     chromadb_path: str = "./vectorstore"
@@ -15,11 +19,71 @@ class Settings(BaseSettings):
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     chunk_size: int = 500
     chunk_overlap: int = 50
+    embedding_workers: int = 2
+    embedding_timeout_s: float = 10.0
+    embedding_batch_max_size: int = 32
+    embedding_batch_max_wait_ms: float = 5.0
+    multilingual_embedding_model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    embedding_backend: str = "torch"  # "torch" or "onnx" (scripts/export_onnx_embedding.py)
+    onnx_model_dir: str = "models/onnx"  # relative to the backend directory
+    onnx_quantized: bool = True  # serve the int8 export when there is one
+    onnx_intra_op_threads: int = 0  # 0 = ONNX Runtime default (all physical cores)
+
+    # Retrieval Settings
+    retrieval_workers: int = 8
+    retrieval_timeout_s: float = 10.0
+    retrieval_backend: str = "chroma"  # "chroma" or "mmap" (scripts/export_mmap_index.py)
+    ann_retrieval: bool = False  # IVF/int8 index for case_law (scripts/build_ann_index.py)
+    ann_nprobe: int = 16  # partitions scanned per query; higher = better recall, slower
+    ann_rerank_k: int = 100  # candidates re-scored on exact vectors
+    hybrid_retrieval: bool = True  # fuse BM25 with vector results
+    section_fast_path: bool = True  # answer "IPC 302"-style queries from the section table
+    rrf_k: int = 60
+    # "split": statutes_english or statutes_hindi by query language (both for Hinglish).
+    # "unified": one search over statutes_unified (scripts/build_unified_statutes.py),
+    # embedded with multilingual_embedding_model
+    statute_index: str = "split"
+    
+    # Re-ranking Settings
+    rerank_enabled: bool = False  # downloads the cross-encoder and loads torch; enable after benchmarking
+    reranker_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_fetch_multiplier: int = 3  # candidates fetched per collection = base count x this
+    rerank_timeout_s: float = 1.5  # past this the vector order is used as-is
+    rerank_skip_gap: float = 0.25  # skip when the top vector score leads the next by this much
+    rerank_min_score: float = 0.1
+    rerank_relative: float = 0.2  # also drop documents scoring below this fraction of the best
+    rerank_min_docs: int = 2
+    rerank_max_docs: int = 8
+    rerank_max_pending: int = 1  # batches queued or running; past this, requests keep the vector order
+    
+    # Batch Query Settings
+    batch_max_queries: int = 1000
+    batch_chunk_size: int = 64  # queries embedded and retrieved together
+    batch_llm_concurrency: int = 4
+    
+    # Cache Settings
+    embedding_cache_size: int = 2048
+    retrieval_cache_size: int = 4096
+    retrieval_cache_ttl_s: float = 600.0
+    cache_dir: str = "cache"  # relative to the backend directory
+    answer_cache_enabled: bool = True
+    answer_cache_threshold: float = 0.97
+    answer_cache_max_entries: int = 10000
+    
+    # Summarization Job Settings
+    max_upload_mb: int = 50
+    summarize_workers: int = 2  # jobs processed concurrently
+    summarize_extract_workers: int = 2  # processes for PDF text extraction
+    summarize_job_lease_s: float = 120.0  # running jobs without a heartbeat this long are re-queued
+    summary_segment_tokens: int = 3000  # map step: approximate tokens per segment prompt
+    summary_reduce_tokens: int = 6000  # reduce step: partial summaries combined per prompt
+    summary_map_concurrency: int = 4  # segment summaries in flight per job
     
     # API Settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
+    log_level: str = "INFO"  # DEBUG adds per-request and per-span log lines
     
     # HuggingFace (optional)
     hf_token: Optional[str] = None
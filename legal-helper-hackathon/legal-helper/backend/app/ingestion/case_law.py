@@ -0,0 +1,267 @@
+"""
+Streaming case-law ingestion.
+A producer thread reads judgments from the HuggingFace stream (or a local
+JSONL/Parquet file) into a bounded queue, an embedding thread encodes them in
+large batches and the calling thread writes each batch to Chroma, so reading,
+embedding and writing overlap and memory stays flat regardless of max_cases.
+Progress is checkpointed after every write so an interrupted run resumes
+without re-reading what it already processed: the HuggingFace stream is
+skipped ahead, a JSONL file is seeked to the saved byte offset and Parquet
+row groups before the position are not read.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.ingestion.incremental import text_sha256
+
+logger = logging.getLogger(__name__)
+
+HF_DATASET = "opennyaiorg/InJudgements_dataset"
+SOURCE_NAME = "InJudgements_dataset"
+
+_DONE = object()
+
+
+def iter_cases(source: Optional[str] = None, start: int = 0, offset: int = 0) -> Iterator[tuple[int, int, dict]]:
+    """
+    Yield (position, offset, record) from record `start` on, reading a local .jsonl/.parquet
+    stand-in or the HuggingFace stream. For JSONL, `offset` is the byte offset just past
+    the record, and passing a saved one seeks straight to record `start`; it is 0 otherwise.
+    """
+    if source is None:
+        from datasets import load_dataset
+        dataset = load_dataset(HF_DATASET, split="train", streaming=True)
+        for position, case in enumerate(dataset.skip(start) if start else dataset, start=start):
+            yield position, 0, case
+    elif source.endswith(".jsonl"):
+        with open(source, "rb") as f:
+            position = 0
+            if offset:
+                f.seek(offset)
+                position = start
+            for line in f:
+                offset += len(line)
+                if not line.strip():
+                    continue
+                if position >= start:
+                    # Records before start are only counted, not parsed
+                    yield position, offset, json.loads(line)
+                position += 1
+    elif source.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(source)
+        group, position = 0, 0
+        # Row groups that end before start are never read
+        while group < parquet.num_row_groups and position + parquet.metadata.row_group(group).num_rows <= start:
+            position += parquet.metadata.row_group(group).num_rows
+            group += 1
+        if group < parquet.num_row_groups:
+            row_groups = list(range(group, parquet.num_row_groups))
+            for batch in parquet.iter_batches(batch_size=1024, row_groups=row_groups):
+                for case in batch.to_pylist():
+                    if position >= start:
+                        yield position, 0, case
+                    position += 1
+    else:
+        raise ValueError(f"Unsupported case-law source: {source}")
+
+
+class CaseLawCheckpoint:
+    """Stream position (and JSONL byte offset) and court counts as of the last batch written to Chroma."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.position = -1
+        self.sc_count = 0
+        self.hc_count = 0
+        self.offset = 0
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self.position = data.get("position", -1)
+        self.sc_count = data.get("sc_count", 0)
+        self.hc_count = data.get("hc_count", 0)
+        self.offset = data.get("offset", 0)
+
+    def save(self, position: int, sc_count: int, hc_count: int, offset: int = 0):
+        self.position, self.sc_count, self.hc_count, self.offset = position, sc_count, hc_count, offset
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "position": position, "sc_count": sc_count, "hc_count": hc_count, "offset": offset
+        }), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def reset(self):
+        self.position, self.sc_count, self.hc_count, self.offset = -1, 0, 0, 0
+        self.path.unlink(missing_ok=True)
+
+
+class CaseLawPipeline:
+    def __init__(self, collection, model, max_cases: int = 1500, source: Optional[str] = None,
+                 batch_size: int = 256, queue_batches: int = 4, checkpoint: CaseLawCheckpoint = None,
+                 skip_existing: bool = True):
+        self.collection = collection
+        self.model = model
+        self.max_cases = max_cases
+        self.source = source
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.skip_existing = skip_existing
+
+        # Bounded queues are what keep memory flat: the producer blocks when embedding falls behind
+        self._records = queue.Queue(maxsize=batch_size * queue_batches)
+        self._batches = queue.Queue(maxsize=queue_batches)
+        self._stop = threading.Event()
+        self._errors = []
+
+        self.written = 0
+        self.skipped_existing = 0
+
+    def run(self) -> dict:
+        start_position, sc_count, hc_count, offset = -1, 0, 0, 0
+        if self.checkpoint:
+            start_position = self.checkpoint.position
+            sc_count, hc_count = self.checkpoint.sc_count, self.checkpoint.hc_count
+            offset = self.checkpoint.offset
+            if start_position >= 0:
+                logger.info(f"Resuming case-law stream after record {start_position} "
+                            f"(SC: {sc_count}, HC: {hc_count})")
+
+        threads = [
+            threading.Thread(target=self._guard, args=(self._produce, start_position, sc_count, hc_count, offset),
+                             name="case-law-reader", daemon=True),
+            threading.Thread(target=self._guard, args=(self._embed,), name="case-law-embedder", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            self._write()
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join(timeout=5)
+
+        if self._errors:
+            raise self._errors[0]
+        return {"written": self.written, "skipped_existing": self.skipped_existing}
+
+    def _guard(self, target, *args):
+        try:
+            target(*args)
+        except Exception as e:
+            logger.error(f"{threading.current_thread().name} failed: {e}")
+            self._errors.append(e)
+            self._stop.set()
+            self._put(self._records, _DONE)
+            self._put(self._batches, _DONE)
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Blocking put that gives up once the pipeline is stopping."""
+        while True:
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    return False
+
+    def _produce(self, start_position: int, sc_count: int, hc_count: int, offset: int = 0):
+        target_sc = self.max_cases // 3  # ~1/3 Supreme Court
+        target_hc = self.max_cases - target_sc
+
+        for i, offset, case in iter_cases(self.source, start_position + 1, offset):
+            if self._stop.is_set() or sc_count + hc_count >= self.max_cases:
+                break
+
+            # Determine court type from the case
+            text = case.get('Text', case.get('judgment', ''))[:10000]
+            court = "Supreme Court" if "Supreme Court" in text[:500] else "High Court"
+
+            # Balance courts
+            if court == "Supreme Court":
+                if sc_count >= target_sc:
+                    continue
+                sc_count += 1
+            else:
+                if hc_count >= target_hc:
+                    if sc_count >= target_sc:
+                        break
+                    continue
+                hc_count += 1
+
+            # Create searchable chunk (first 3000 chars for embedding)
+            doc_text = text[:3000]
+            record = {
+                "id": f"case_{text_sha256(doc_text)[:16]}",
+                "document": doc_text,
+                "metadata": {
+                    "court": court,
+                    "case_id": case.get('id', f"case_{i}"),
+                    "source": SOURCE_NAME
+                },
+                "position": (i, sc_count, hc_count, offset)
+            }
+            if not self._put(self._records, record):
+                return
+
+        self._put(self._records, _DONE)
+
+    def _embed(self):
+        done = False
+        while not done:
+            batch = []
+            while len(batch) < self.batch_size:
+                record = self._records.get()
+                if record is _DONE:
+                    done = True
+                    break
+                batch.append(record)
+            if not batch:
+                break
+
+            # The same judgment can appear twice in the dataset; one upsert must not repeat an ID
+            unique = {}
+            for record in batch:
+                unique.setdefault(record["id"], record)
+            to_embed = list(unique.values())
+            if self.skip_existing:
+                existing = set(self.collection.get(ids=list(unique), include=[])["ids"])
+                to_embed = [r for r in to_embed if r["id"] not in existing]
+            self.skipped_existing += len(batch) - len(to_embed)
+
+            embeddings = self.model.encode([r["document"] for r in to_embed]).tolist() if to_embed else []
+            # The last record's position is still checkpointed when every case was already stored
+            if not self._put(self._batches, (to_embed, embeddings, batch[-1]["position"])):
+                return
+
+        self._put(self._batches, _DONE)
+
+    def _write(self):
+        while True:
+            item = self._batches.get()
+            if item is _DONE:
+                return
+            records, embeddings, position = item
+            if records:
+                self.collection.upsert(
+                    ids=[r["id"] for r in records],
+                    documents=[r["document"] for r in records],
+                    metadatas=[r["metadata"] for r in records],
+                    embeddings=embeddings
+                )
+                self.written += len(records)
+            if self.checkpoint:
+                self.checkpoint.save(*position)
+
+            _, sc_count, hc_count, _ = position
+            logger.info(f"  Progress: {sc_count + hc_count} cases (SC: {sc_count}, HC: {hc_count}), "
+                        f"written: {self.written}, already stored: {self.skipped_existing}")
@@ -0,0 +1,135 @@
+"""
+Incremental ingestion helpers.
+Source files are fingerprinted so unchanged files are skipped outright, and
+chunk IDs are derived from chunk content so only new or edited chunks are
+re-embedded. Chunks whose source changed or disappeared are deleted.
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "ingest_manifest.json"
+
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_chunk_ids(prefix: str, documents: list[str]) -> list[str]:
+    """Content-addressed chunk IDs; repeated text within a source gets a counter suffix."""
+    seen = {}
+    ids = []
+    for doc in documents:
+        digest = text_sha256(doc)[:16]
+        n = seen.get(digest, 0)
+        seen[digest] = n + 1
+        ids.append(f"{prefix}_{digest}" if n == 0 else f"{prefix}_{digest}_{n}")
+    return ids
+
+
+class IngestManifest:
+    """Fingerprints of every source file as of the last successful ingestion."""
+
+    def __init__(self, vectorstore_dir: Path):
+        self.path = Path(vectorstore_dir) / MANIFEST_FILE
+        try:
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_unchanged(self, collection_name: str, source: str, fingerprint: str) -> bool:
+        return self.entries.get(f"{collection_name}/{source}") == fingerprint
+
+    def record(self, collection_name: str, source: str, fingerprint: str):
+        self.entries[f"{collection_name}/{source}"] = fingerprint
+
+    def forget(self, collection_name: str, source: str):
+        self.entries.pop(f"{collection_name}/{source}", None)
+
+    def clear(self):
+        self.entries = {}
+
+    def save(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class IngestState:
+    """Mode and bookkeeping shared by the ingest_* functions for one run."""
+
+    def __init__(self, vectorstore_dir: Path, incremental: bool = True):
+        self.incremental = incremental
+        self.manifest = IngestManifest(vectorstore_dir)
+        self.changed_collections = set()
+
+    def should_skip(self, collection, source: str, fingerprint: str) -> bool:
+        """True when an incremental run can keep this source's chunks as they are."""
+        if not self.incremental or not self.manifest.is_unchanged(collection.name, source, fingerprint):
+            return False
+        existing = collection.get(where={"source": source}, limit=1, include=[])
+        return bool(existing["ids"])
+
+    def write_chunks(self, collection, model, source: str, documents: list[str], metadatas: list[dict],
+                     ids: list[str], fingerprint: str = None, batch_size: int = 100) -> dict:
+        """
+        Store one source's chunks. Full mode adds everything; incremental mode
+        embeds only chunks with new IDs, refreshes changed metadata in place
+        and deletes the source's chunks that are no longer produced.
+        """
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+
+        existing_meta = {}
+        if self.incremental:
+            existing = collection.get(where={"source": source}, include=["metadatas"])
+            existing_meta = dict(zip(existing["ids"], existing["metadatas"]))
+
+        new_idx = [i for i, chunk_id in enumerate(ids) if chunk_id not in existing_meta]
+        for j in range(0, len(new_idx), batch_size):
+            batch = new_idx[j:j + batch_size]
+            batch_docs = [documents[i] for i in batch]
+            embeddings = model.encode(batch_docs).tolist()
+            collection.upsert(
+                documents=batch_docs,
+                embeddings=embeddings,
+                metadatas=[metadatas[i] for i in batch],
+                ids=[ids[i] for i in batch]
+            )
+        stats["added"] = len(new_idx)
+
+        if self.incremental:
+            changed = [i for i, chunk_id in enumerate(ids)
+                       if chunk_id in existing_meta and existing_meta[chunk_id] != metadatas[i]]
+            if changed:
+                collection.update(ids=[ids[i] for i in changed], metadatas=[metadatas[i] for i in changed])
+            stats["updated"] = len(changed)
+            stats["unchanged"] = len(ids) - len(new_idx) - len(changed)
+
+            stale = sorted(set(existing_meta) - set(ids))
+            for j in range(0, len(stale), batch_size):
+                collection.delete(ids=stale[j:j + batch_size])
+            stats["deleted"] = len(stale)
+
+        if stats["added"] or stats["updated"] or stats["deleted"]:
+            self.changed_collections.add(collection.name)
+        if fingerprint:
+            self.manifest.record(collection.name, source, fingerprint)
+
+        logger.info(
+            f"  {source}: {stats['added']} added, {stats['updated']} updated, "
+            f"{stats['unchanged']} unchanged, {stats['deleted']} deleted"
+        )
+        return stats
+
+    def remove_source(self, collection, source: str):
+        """Delete every chunk of a source that no longer exists."""
+        existing = collection.get(where={"source": source}, include=[])
+        if existing["ids"]:
+            collection.delete(ids=existing["ids"])
+            self.changed_collections.add(collection.name)
+            logger.info(f"  {source}: removed {len(existing['ids'])} chunks (source disappeared)")
+        self.manifest.forget(collection.name, source)
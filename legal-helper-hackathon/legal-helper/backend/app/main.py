@@ -1,15 +1,24 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
 from app.config import get_settings
 from app.routers import query, comparison, document
+from app.services.service_container import ServiceContainer
+from app.utils.metrics import ServiceStatsCollector
+from app.utils.timing import ServerTimingMiddleware
+import asyncio
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
 settings = get_settings()
 
+# Configure logging (LOG_LEVEL=DEBUG turns on per-request and per-span detail)
+logging.basicConfig(
+    level=settings.log_level.upper(),
+    format="%(asctime)s %(levelname)s %(name)s %(message)s"
+)
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="AI legal Helper API",
     description="Backend for AI-Powered Legal Research Assistant",
@@ -27,6 +36,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Timing header, request metrics and per-request span logs (outermost, so it times everything)
+app.add_middleware(ServerTimingMiddleware)
+
 # Include Routers
 app.include_router(query.router, prefix="/api", tags=["Legal Query"])
 app.include_router(comparison.router, prefix="/api", tags=["Comparison"])
@@ -35,9 +47,22 @@ app.include_router(document.router, prefix="/api", tags=["Document Processing"])
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up AI Legal Helper Backend...")
-    # Add any startup logic here, e.g. checking specific DB connections
-    # ChromaDB client is initialized in RAGService on demand or we could preload it
-    pass
+    # One container per worker process; warmup runs off the event loop so
+    # /health keeps answering while the model loads and /ready reports 503
+    app.state.services = ServiceContainer()
+    REGISTRY.register(ServiceStatsCollector(app.state.services))
+    app.state.warmup_task = asyncio.create_task(app.state.services.astart())
+
+@app.get("/ready")
+async def readiness_check():
+    container = getattr(app.state, "services", None)
+    status = container.status() if container else {"ready": False}
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus exposition: request/stage/collection latency histograms, cache and batcher counters."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/")
 async def root():
@@ -7,6 +7,7 @@ class LegalQuery(BaseModel):
     filters: Optional[Dict[str, Any]] = None
 
 class Source(BaseModel):
+    id: Optional[str] = None
     type: str
     citation: str
     title: str
@@ -20,6 +21,11 @@ class LegalResponse(BaseModel):
     confidence: float
     language: str
     query_time_ms: Optional[float] = None
+    cached: bool = False
+
+class BatchQueryRequest(BaseModel):
+    queries: List[LegalQuery]
+    concurrency: Optional[int] = None
 
 class ComparisonRequest(BaseModel):
     ipc_section: str
@@ -27,9 +33,26 @@ class ComparisonRequest(BaseModel):
 class ComparisonResponse(BaseModel):
     ipc: Optional[Dict[str, Any]]
     bns: Optional[Dict[str, Any]]
+    mapping: Optional[Dict[str, Any]] = None
     differences: List[str]
 
+class BulkComparisonRequest(BaseModel):
+    ipc_sections: List[str]
+
+class BulkComparisonResponse(BaseModel):
+    results: Dict[str, ComparisonResponse]
+
 class SummarizationResponse(BaseModel):
     summary: str
     key_points: List[str]
     citations: List[str]
+
+class SummarizationJob(BaseModel):
+    job_id: str
+    status: str
+    stage: Optional[str] = None
+    progress: float = 0.0
+    filename: Optional[str] = None
+    cached: bool = False
+    result: Optional[Dict[str, Any]] = None  # SummarizationResponse fields once done
+    error: Optional[str] = None
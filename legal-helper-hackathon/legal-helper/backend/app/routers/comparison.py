@@ -1,11 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.models.schemas import ComparisonRequest, ComparisonResponse
+from app.models.schemas import (
+    ComparisonRequest, ComparisonResponse, BulkComparisonRequest, BulkComparisonResponse
+)
 from app.services.rag_service import RAGService
+from app.services.service_container import get_rag_service
+from app.utils.timing import TimedRoute
 
-router = APIRouter()
-
-def get_rag_service():
-    return RAGService()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/compare", response_model=ComparisonResponse)
 async def compare_sections(
@@ -17,3 +18,16 @@ async def compare_sections(
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/compare/batch", response_model=BulkComparisonResponse)
+async def compare_sections_bulk(
+    request: BulkComparisonRequest,
+    rag_service: RAGService = Depends(get_rag_service)
+):
+    if len(request.ipc_sections) > 500:
+        raise HTTPException(status_code=400, detail="At most 500 sections per request")
+    try:
+        results = await rag_service.compare_sections_bulk(request.ipc_sections)
+        return {"results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,48 +1,67 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from app.models.schemas import SummarizationResponse
-from app.services.llm_service import LLMService
-import PyPDF2
-import io
+from app.models.schemas import SummarizationJob
+from app.services.summarization_jobs import SummarizationJobManager, UploadTooLarge, InvalidUpload
+from app.services.job_store import FAILED
+from app.services.service_container import get_job_manager
+from app.utils.timing import TimedRoute, stage
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-def get_llm_service():
-    return LLMService()
+async def _submit(job_manager: SummarizationJobManager, file: UploadFile) -> dict:
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    try:
+        return await job_manager.submit(file, file.filename)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _job_response(job: dict) -> dict:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "filename": job["filename"],
+        "cached": job["cached"],
+        "result": job["result"],
+        "error": job["error"]
+    }
 
 @router.post("/summarize")
 async def summarize_document(
     file: UploadFile = File(...),
-    llm_service: LLMService = Depends(get_llm_service)
+    job_manager: SummarizationJobManager = Depends(get_job_manager)
 ):
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    """Synchronous summarization: runs through the job queue and waits for the result."""
+    with stage("upload"):
+        job = await _submit(job_manager, file)
+    # Extraction and the LLM calls run in the job workers; time the wait as a whole
+    with stage("summarize"):
+        job = await job_manager.wait(job["id"])
     
-    try:
-        content = await file.read()
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-            
-        result = await llm_service.summarize_document(text)
-        
-        # Parse JSON from string result if needed, or return raw
-        # Assuming llm_service returns a dict with 'raw_response' which is a JSON string
-        import json
-        raw_json_str = result.get('raw_response', '{}')
-        
-        # Strip code blocks if present
-        clean_json = raw_json_str.replace('```json', '').replace('```', '')
-        
-        try:
-            parsed_result = json.loads(clean_json)
-            return parsed_result
-        except json.JSONDecodeError:
-            return {
-                "summary": raw_json_str, # Fallback to raw text
-                "key_points": [],
-                "citations": []
-            }
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    return job["result"]
+
+@router.post("/summarize/jobs", response_model=SummarizationJob, status_code=202)
+async def create_summarization_job(
+    file: UploadFile = File(...),
+    job_manager: SummarizationJobManager = Depends(get_job_manager)
+):
+    """Queue a PDF for summarization and return its job ID immediately."""
+    return _job_response(await _submit(job_manager, file))
+
+@router.get("/summarize/jobs/{job_id}", response_model=SummarizationJob)
+async def get_summarization_job(
+    job_id: str,
+    job_manager: SummarizationJobManager = Depends(get_job_manager)
+):
+    """Poll a job: status, stage, progress (0-1) and the summary once done."""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
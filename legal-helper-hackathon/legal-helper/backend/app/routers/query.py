@@ -1,16 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.models.schemas import LegalQuery, LegalResponse
+from fastapi.responses import StreamingResponse
+from app.models.schemas import LegalQuery, LegalResponse, BatchQueryRequest
+from app.config import get_settings
 from app.services.rag_service import RAGService
+from app.services.service_container import get_rag_service
+from app.utils.timing import TimedRoute
+import json
 import time
 
-router = APIRouter()
-
-from functools import lru_cache
-
-# Dependency to get RAG Service
-@lru_cache()
-def get_rag_service():
-    return RAGService()
+router = APIRouter(route_class=TimedRoute)
+settings = get_settings()
 
 @router.post("/query", response_model=LegalResponse)
 async def query_legal(
@@ -29,6 +28,66 @@ async def query_legal(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/query/stream")
+async def query_legal_stream(
+    request: LegalQuery,
+    rag_service: RAGService = Depends(get_rag_service)
+):
+    """
+    Server-Sent Events variant of /query: a `sources` event as soon as retrieval
+    completes, `token` events while the LLM answers, then `done` with timing.
+    """
+    start_time = time.time()
+
+    async def event_stream():
+        try:
+            async for event, data in rag_service.query_stream(request.query, request.filters):
+                if event == "done":
+                    data["query_time_ms"] = (time.time() - start_time) * 1000
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/query/batch")
+async def query_legal_batch(
+    request: BatchQueryRequest,
+    rag_service: RAGService = Depends(get_rag_service)
+):
+    """
+    Bulk variant of /query. Streams one NDJSON line per query as it completes:
+    {"index": i, "query": ..., <LegalResponse fields>} or {"index": i, "error": ...}.
+    """
+    if len(request.queries) > settings.batch_max_queries:
+        raise HTTPException(status_code=400, detail=f"At most {settings.batch_max_queries} queries per request")
+    if request.concurrency is not None and not 1 <= request.concurrency <= settings.batch_llm_concurrency:
+        raise HTTPException(
+            status_code=400, detail=f"concurrency must be between 1 and {settings.batch_llm_concurrency}"
+        )
+
+    items = [{"query": q.query, "filters": q.filters} for q in request.queries]
+    start_time = time.time()
+
+    async def ndjson_stream():
+        done = set()
+        try:
+            async for index, response in rag_service.query_batch(items, request.concurrency):
+                done.add(index)
+                response = {"index": index, "query": items[index]["query"], **response,
+                            "query_time_ms": (time.time() - start_time) * 1000}
+                yield json.dumps(response, default=str) + "\n"
+        except Exception as e:
+            for index in range(len(items)):
+                if index not in done:
+                    yield json.dumps({"index": index, "query": items[index]["query"], "error": str(e)}) + "\n"
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
 @router.get("/cases")
 async def get_cases(
     category: str = None, 
@@ -38,3 +97,8 @@ async def get_cases(
     # This is a placeholder for a simple retrieval endpoint
     # In a real app we'd query Chroma directly or a regular DB
     return {"message": "Case browsing not fully implemented in this hackathon demo yet."}
+
+@router.get("/stats")
+async def get_stats(rag_service: RAGService = Depends(get_rag_service)):
+    """Cache hit/miss counters and embedding batcher stats for sizing."""
+    return rag_service.cache_stats()
@@ -0,0 +1,237 @@
+"""
+Approximate nearest-neighbour search for large collections (case_law).
+An inverted-file (IVF) index partitions the vectors around k-means
+centroids and stores them as int8 scalar-quantized codes, a quarter of the
+float32 footprint. A query scans only the nprobe closest partitions on the
+codes, then re-ranks the best rerank_k candidates on the exact vectors of the
+memory-mapped export it was built from, so returned distances are exact.
+"""
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Optional
+
+import numpy as np
+
+from app.services.mmap_vector_store import (
+    MmapCollection, MmapVectorStore, publish_version, read_current_version
+)
+
+logger = logging.getLogger(__name__)
+
+ANN_DIR = "ann"
+
+_BLOCK_ROWS = 8192
+
+
+def _sq_distances(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Squared L2 between every row and every centroid (rows x centroids)."""
+    return (
+        np.einsum("ij,ij->i", matrix, matrix)[:, None]
+        - 2.0 * matrix @ centroids.T
+        + np.einsum("ij,ij->i", centroids, centroids)[None, :]
+    )
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(matrix.shape[0], dtype=np.int32)
+    for start in range(0, matrix.shape[0], _BLOCK_ROWS):
+        block = np.asarray(matrix[start:start + _BLOCK_ROWS], dtype=np.float32)
+        labels[start:start + len(block)] = np.argmin(_sq_distances(block, centroids), axis=1)
+    return labels
+
+
+def train_centroids(matrix: np.ndarray, nlist: int, iterations: int = 20,
+                    sample_size: int = 100000, seed: int = 0) -> np.ndarray:
+    """Lloyd's k-means on a random sample of the rows."""
+    rng = np.random.default_rng(seed)
+    n = matrix.shape[0]
+    sample_rows = np.sort(rng.choice(n, size=min(n, sample_size), replace=False))
+    sample = np.asarray(matrix[sample_rows], dtype=np.float32)
+    nlist = min(nlist, len(sample))
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = np.argmin(_sq_distances(sample, centroids), axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # Re-seed empty partitions so every list stays useful
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = sample[rng.choice(len(sample), size=len(empty), replace=False)]
+    return centroids
+
+
+class AnnIndex:
+    def __init__(self, directory: str, exact: MmapCollection):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.centroids = np.load(os.path.join(directory, "centroids.npy"))
+        self.codes = np.load(os.path.join(directory, "codes.npy"), mmap_mode="r")
+        self.rows = np.load(os.path.join(directory, "rows.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(directory, "offsets.npy"))
+        self.scale = np.load(os.path.join(directory, "scale.npy"))
+        self.minimum = np.load(os.path.join(directory, "minimum.npy"))
+        self.exact = exact
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def search(self, query_embedding: list[float], n_results: int, where: Optional[dict] = None,
+               nprobe: int = 16, rerank_k: int = 100) -> dict:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        nprobe = max(1, min(nprobe, len(self.centroids)))
+        probe = np.argpartition(_sq_distances(query[None, :], self.centroids)[0], nprobe - 1)[:nprobe]
+
+        positions = np.concatenate([np.arange(self.offsets[p], self.offsets[p + 1]) for p in probe])
+        candidates = np.asarray(self.rows[positions])
+        if where:
+            allowed = self.exact.filter_rows(where)
+            keep = np.isin(candidates, allowed)
+            positions, candidates = positions[keep], candidates[keep]
+        if len(candidates) < n_results:
+            # Too few rows in the probed partitions (e.g. a narrow filter): exact search is cheap here
+            return self.exact.query(query_embedding, n_results, where)
+
+        # x ~= minimum + scale * (code + 128), so q.x is an affine function of q' = q * scale
+        weighted = query * self.scale
+        bias = float(query @ self.minimum) + 128.0 * float(weighted.sum())
+        approx = np.asarray(self.codes[positions], dtype=np.float32) @ weighted + bias
+        scores = 2.0 * approx - self.exact.sq_norms[candidates]
+
+        k = min(max(rerank_k, n_results), len(candidates))
+        shortlist = candidates[np.argpartition(-scores, k - 1)[:k]]
+        return self.exact.query_rows(query, np.sort(shortlist), n_results)
+
+
+class AnnIndexStore:
+    """Per-collection IVF indexes, used only while they match the current mmap export."""
+
+    def __init__(self, vectorstore_path: str, mmap_store: MmapVectorStore = None):
+        self.root = os.path.join(vectorstore_path, ANN_DIR)
+        self.mmap_store = mmap_store or MmapVectorStore(vectorstore_path)
+        self._indexes = {}
+
+    def get(self, name: str) -> Optional[AnnIndex]:
+        version = read_current_version(os.path.join(self.root, name))
+        exact = self.mmap_store.get(name)
+        if version is None or exact is None:
+            return None
+        cached = self._indexes.get(name)
+        if cached and cached[0] == (version, exact.version):
+            return cached[1]
+        try:
+            index = AnnIndex(os.path.join(self.root, name, version), exact)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not open ANN index for {name}: {e}")
+            return None
+        if index.meta.get("mmap_version") != exact.version:
+            # Remembered as None so the warning is logged once per export, not per query
+            logger.warning(f"ANN index for {name} is stale; rebuild it with scripts/build_ann_index.py")
+            index = None
+        self._indexes[name] = ((version, exact.version), index)
+        return index
+
+
+def build_ann_index(vectorstore_path: str, name: str, nlist: int = None, iterations: int = 20) -> int:
+    """Build an IVF/int8 index over the collection's current mmap export."""
+    exact = MmapVectorStore(vectorstore_path).get(name)
+    if exact is None or len(exact) == 0:
+        logger.warning(f"  No mmap export for {name}; run scripts/export_mmap_index.py first")
+        return 0
+
+    n = len(exact)
+    nlist = max(1, min(nlist or int(4 * np.sqrt(n)), n))
+    started = time.perf_counter()
+    centroids = train_centroids(exact.embeddings, nlist, iterations=iterations)
+    nlist = len(centroids)
+    labels = _assign(exact.embeddings, centroids)
+
+    # Per-dimension scalar quantization to int8
+    minimum = np.full(exact.embeddings.shape[1], np.inf, dtype=np.float32)
+    maximum = np.full(exact.embeddings.shape[1], -np.inf, dtype=np.float32)
+    for start in range(0, n, _BLOCK_ROWS):
+        block = np.asarray(exact.embeddings[start:start + _BLOCK_ROWS], dtype=np.float32)
+        minimum = np.minimum(minimum, block.min(axis=0))
+        maximum = np.maximum(maximum, block.max(axis=0))
+    scale = np.maximum(maximum - minimum, 1e-12) / 255.0
+
+    # Rows are stored grouped by partition so each list is one contiguous slice
+    order = np.argsort(labels, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))]).astype(np.int64)
+
+    collection_dir = os.path.join(vectorstore_path, ANN_DIR, name)
+    version = uuid.uuid4().hex[:12]
+    version_dir = os.path.join(collection_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    codes = np.lib.format.open_memmap(
+        os.path.join(version_dir, "codes.npy"), mode="w+", dtype=np.int8, shape=exact.embeddings.shape
+    )
+    for start in range(0, n, _BLOCK_ROWS):
+        rows = order[start:start + _BLOCK_ROWS]
+        block = np.asarray(exact.embeddings[np.sort(rows)], dtype=np.float32)[np.argsort(np.argsort(rows))]
+        codes[start:start + len(rows)] = np.clip(np.rint((block - minimum) / scale) - 128, -128, 127)
+    codes.flush()
+    del codes
+
+    np.save(os.path.join(version_dir, "centroids.npy"), centroids.astype(np.float32))
+    np.save(os.path.join(version_dir, "rows.npy"), order.astype(np.int64))
+    np.save(os.path.join(version_dir, "offsets.npy"), offsets)
+    np.save(os.path.join(version_dir, "scale.npy"), scale.astype(np.float32))
+    np.save(os.path.join(version_dir, "minimum.npy"), minimum)
+    with open(os.path.join(version_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"mmap_version": exact.version, "nlist": nlist, "count": n,
+                   "dim": int(exact.embeddings.shape[1])}, f)
+    publish_version(collection_dir, version)
+
+    logger.info(f"  ANN index for {name}: {n} vectors, {nlist} lists, "
+                f"built in {time.perf_counter() - started:.1f}s")
+    return n
+
+
+def recall_report(vectorstore_path: str, name: str, nprobes: list[int], rerank_ks: list[int],
+                  k: int = 10, n_queries: int = 200, seed: int = 0) -> list[dict]:
+    """
+    Recall@k and latency of each (nprobe, rerank_k) setting against brute force.
+    Queries are stored vectors with their own row excluded from both rankings.
+    """
+    index = AnnIndexStore(vectorstore_path).get(name)
+    if index is None:
+        return []
+    exact = index.exact
+    rng = np.random.default_rng(seed)
+    query_rows = rng.choice(len(exact), size=min(n_queries, len(exact)), replace=False)
+    queries = [np.asarray(exact.embeddings[row], dtype=np.float32) for row in query_rows]
+
+    def top_ids(results, row):
+        return [i for i in results["ids"][0] if i != exact.ids[row]][:k]
+
+    truth, brute_times = [], []
+    for row, query in zip(query_rows, queries):
+        started = time.perf_counter()
+        truth.append(set(top_ids(exact.query(query, k + 1), row)))
+        brute_times.append(time.perf_counter() - started)
+
+    report = [{"nprobe": "brute_force", "rerank_k": None, "recall": 1.0,
+               "mean_ms": round(1000 * float(np.mean(brute_times)), 3),
+               "p95_ms": round(1000 * float(np.percentile(brute_times, 95)), 3)}]
+    for nprobe in nprobes:
+        for rerank_k in rerank_ks:
+            hits, times = 0, []
+            for row, query, expected in zip(query_rows, queries, truth):
+                started = time.perf_counter()
+                found = top_ids(index.search(query, k + 1, nprobe=nprobe, rerank_k=rerank_k), row)
+                times.append(time.perf_counter() - started)
+                hits += len(expected & set(found))
+            report.append({
+                "nprobe": nprobe, "rerank_k": rerank_k,
+                "recall": round(hits / max(1, sum(len(t) for t in truth)), 4),
+                "mean_ms": round(1000 * float(np.mean(times)), 3),
+                "p95_ms": round(1000 * float(np.percentile(times, 95)), 3)
+            })
+    return report
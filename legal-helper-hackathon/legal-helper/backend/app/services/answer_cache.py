@@ -0,0 +1,123 @@
+"""
+Semantic cache for LLM answers.
+A previous answer is reused when a new query embedding is within a cosine
+threshold of an answered query with the same language, filters and retrieved
+source set, or when the normalized query text matches exactly (the section
+fast path answers without an embedding). Entries live in SQLite so they
+survive restarts.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticAnswerCache:
+    def __init__(self, path: str, threshold: float = 0.97, max_entries: int = 10000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                context_key TEXT NOT NULL,
+                query_key TEXT,
+                embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(answers)")}
+        if "query_key" not in columns:
+            self._conn.execute("ALTER TABLE answers ADD COLUMN query_key TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_context ON answers (context_key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_last_used ON answers (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def context_key(language: str, filters: dict, sources: list[dict]) -> str:
+        """Answers are only interchangeable for the same language, filters and evidence."""
+        source_ids = sorted(doc.get("id") or doc.get("citation", "") for doc in sources)
+        payload = json.dumps([language, filters or {}, source_ids], sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray:
+        if embedding is None:
+            return np.zeros(0, dtype=np.float32)
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding: list[float], context_key: str, query_key: str = None):
+        """Return an exact query match or the closest cached response above the threshold, or None."""
+        query = self._normalize(embedding)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, query_key, embedding, response FROM answers WHERE context_key = ?", (context_key,)
+            ).fetchall()
+
+            best_id, best_score, best_response = None, -1.0, None
+            for row_id, row_query_key, blob, response in rows:
+                if query_key and row_query_key == query_key:
+                    best_id, best_score, best_response = row_id, 1.0, response
+                    break
+                stored = np.frombuffer(blob, dtype=np.float32)
+                if not query.size or stored.shape != query.shape:
+                    continue
+                score = float(np.dot(query, stored))
+                if score > best_score:
+                    best_id, best_score, best_response = row_id, score, response
+
+            if best_id is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE answers SET last_used = ? WHERE id = ?", (time.time(), best_id))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(best_response)
+
+    def store(self, embedding: list[float], context_key: str, response: dict, query_key: str = None):
+        now = time.time()
+        blob = self._normalize(embedding).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO answers (context_key, query_key, embedding, response, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (context_key, query_key, blob, json.dumps(response), now, now)
+            )
+            # Size-bounded: evict least recently used entries
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM answers WHERE id IN (SELECT id FROM answers ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "size": count,
+            "maxsize": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
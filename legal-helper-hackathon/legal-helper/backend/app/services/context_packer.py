@@ -0,0 +1,98 @@
+"""
+Token-budgeted context assembly for LLM prompts.
+Retrieved documents are taken in relevance order; sentences already present
+in an earlier document (overlapping ingestion windows) are dropped, long
+excerpts are reduced to their most query-relevant sentences, and documents
+are packed until the token budget is spent.
+"""
+import math
+import re
+
+from app.services.lexical_index import tokenize
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?।])\s+")
+_ASCII_RE = re.compile(r"[\x00-\x7f]")
+
+# Below this many tokens a document is not worth including in truncated form
+_MIN_DOC_TOKENS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate LLM token count without a tokenizer: ~4 characters per token
+    for Latin script, ~1.5 for Devanagari and other non-ASCII text.
+    """
+    ascii_chars = len(_ASCII_RE.findall(text))
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def _sentence_key(sentence: str) -> str:
+    return " ".join(tokenize(sentence))
+
+
+def _select_sentences(sentences: list[str], query_terms: set[str], max_tokens: int) -> str:
+    """Highest-overlap sentences that fit max_tokens, restored to document order."""
+    scored = []
+    for position, sentence in enumerate(sentences):
+        terms = set(tokenize(sentence))
+        scored.append((len(terms & query_terms), -position, position, sentence))
+    scored.sort(reverse=True)
+
+    chosen, used = [], 0
+    for _, _, position, sentence in scored:
+        cost = estimate_tokens(sentence)
+        if used + cost > max_tokens:
+            continue
+        chosen.append((position, sentence))
+        used += cost
+
+    if not chosen and scored:
+        # A single run-on sentence longer than the limit: keep its head
+        sentence = scored[0][3]
+        keep = max(1, int(len(sentence) * max_tokens / max(1, estimate_tokens(sentence))))
+        return sentence[:keep].rsplit(" ", 1)[0] + " …"
+
+    chosen.sort()
+    # Mark gaps so the model does not read non-adjacent sentences as continuous text
+    parts, previous = [], None
+    for position, sentence in chosen:
+        if previous is not None and position != previous + 1:
+            parts.append("…")
+        parts.append(sentence)
+        previous = position
+    return " ".join(parts)
+
+
+def pack_context(query: str, documents: list[dict], token_budget: int, doc_max_tokens: int) -> list[dict]:
+    """
+    Return copies of the documents (best first) whose "text" fits the budget in total.
+    Documents that contribute nothing new are dropped.
+    """
+    query_terms = {term for term in tokenize(query) if len(term) > 2}
+    seen_sentences = set()
+    packed, remaining = [], token_budget
+
+    for doc in documents:
+        if remaining < _MIN_DOC_TOKENS:
+            break
+        sentences, keys = [], set()
+        for sentence in _SENTENCE_RE.split(doc.get("text", "")):
+            key = _sentence_key(sentence)
+            if key and key not in seen_sentences and key not in keys:
+                keys.add(key)
+                sentences.append(sentence.strip())
+        if not sentences:
+            continue
+
+        limit = min(doc_max_tokens, remaining)
+        text = " ".join(sentences)
+        if estimate_tokens(text) > limit:
+            text = _select_sentences(sentences, query_terms, limit)
+        cost = estimate_tokens(text)
+        if not text or cost > remaining:
+            continue
+
+        packed.append({**doc, "text": text})
+        seen_sentences |= keys
+        remaining -= cost
+    return packed
@@ -0,0 +1,85 @@
+"""
+Micro-batching front end for EmbeddingService.
+Concurrent callers are collected for a few milliseconds and encoded with a
+single batched forward pass, then each caller gets its own vector back.
+"""
+import asyncio
+import logging
+
+from app.services.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    def __init__(self, embedding_service: EmbeddingService, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.embedding_service = embedding_service
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        self._loop = None
+
+        self.batches = 0
+        self.texts = 0
+        self.max_batch_seen = 0
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text, sharing the forward pass with other pending callers."""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _ensure_worker(self):
+        # The worker is bound to the loop that first uses it (uvicorn runs one per worker)
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait_s
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Callers that timed out or were cancelled no longer need a vector
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await self.embedding_service.aget_embeddings(texts)
+            except Exception as e:
+                logger.error(f"Batched embedding failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.texts += len(texts)
+            self.max_batch_seen = max(self.max_batch_seen, len(texts))
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "pending": self._queue.qsize() if self._queue else 0
+        }
@@ -1,15 +1,67 @@
-from sentence_transformers import SentenceTransformer
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 class EmbeddingService:
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", max_workers: int = 2,
+                 normalize: bool = False):
+        # Imported here so the ONNX backend never pays for loading torch
+        from sentence_transformers import SentenceTransformer
+
         # Explicitly force CPU to avoid "meta tensor" errors with accelerate/transformers on some Windows setups
         self.model = SentenceTransformer(model_name, device="cpu")
+        self.model_name = model_name
+        # all-MiniLM normalises in its own pipeline; models without that step need it here
+        self.normalize = normalize
+        # Encoding is CPU-bound; a small bounded pool keeps it off the event loop
+        # without oversubscribing the cores torch already parallelises over
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding")
 
     def get_embeddings(self, texts: list[str]) -> list[list[float]]:
-        embeddings = self.model.encode(texts)
+        embeddings = self.model.encode(texts, normalize_embeddings=self.normalize)
         return embeddings.tolist()
 
     def get_embedding(self, text: str) -> list[float]:
-        embedding = self.model.encode(text)
-        print(f"[DEBUG] Generated embedding for '{text[:20]}...': dims={len(embedding)}, start={embedding[:3]}", flush=True)
+        embedding = self.model.encode(text, normalize_embeddings=self.normalize)
+        logger.debug("Embedded %d chars, dims=%d", len(text), len(embedding))
         return embedding.tolist()
+
+    async def aget_embeddings(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get_embeddings, texts)
+
+    async def aget_embedding(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get_embedding, text)
+
+
+def create_embedding_service(model_name: str, max_workers: int = 2, normalize: bool = False):
+    """
+    EmbeddingService, or its ONNX Runtime counterpart when embedding_backend="onnx"
+    and the model has been exported (scripts/export_onnx_embedding.py).
+    """
+    settings = get_settings()
+    if settings.embedding_backend == "onnx":
+        from app.services.onnx_embedding import CONFIG_FILE, OnnxEmbeddingService, export_dir
+
+        directory = export_dir(os.path.join(BASE_DIR, settings.onnx_model_dir), model_name)
+        if os.path.exists(os.path.join(directory, CONFIG_FILE)):
+            service = OnnxEmbeddingService(
+                directory,
+                max_workers=max_workers,
+                normalize=normalize,
+                quantized=settings.onnx_quantized,
+                intra_op_threads=settings.onnx_intra_op_threads
+            )
+            logger.info(f"ONNX embedding backend: {service.model_file}")
+            return service
+        logger.warning(f"No ONNX export of {model_name} in {directory} "
+                       f"(run scripts/export_onnx_embedding.py); using PyTorch")
+    return EmbeddingService(model_name=model_name, max_workers=max_workers, normalize=normalize)
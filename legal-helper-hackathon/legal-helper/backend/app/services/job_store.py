@@ -0,0 +1,148 @@
+"""
+Persistent store for background jobs.
+Job state and progress live in SQLite so they survive restarts and can be
+polled from any worker; finished results are also kept by input content
+hash so identical inputs are answered without re-running the job.
+Every uvicorn worker shares the file: a job is run by whichever worker claims
+it first (a conditional UPDATE, atomic across processes), and a running job
+whose owner stops heartbeating is handed back to the queue.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobStore:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stage TEXT,
+                progress REAL NOT NULL DEFAULT 0,
+                content_hash TEXT NOT NULL,
+                filename TEXT,
+                input_path TEXT,
+                error TEXT,
+                cached INTEGER NOT NULL DEFAULT 0,
+                owner TEXT,
+                heartbeat REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        # Stores created before jobs were claimed by owner
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, ddl in (("owner", "TEXT"), ("heartbeat", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {ddl}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                kind TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (kind, content_hash)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+        self._conn.commit()
+
+    def create(self, kind: str, content_hash: str, filename: str = None, input_path: str = None,
+               status: str = QUEUED, cached: bool = False) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        progress = 1.0 if status == DONE else 0.0
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, progress, content_hash, filename, input_path, cached, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, status, progress, content_hash, filename, input_path, int(cached), now, now)
+            )
+            self._conn.commit()
+        return job_id
+
+    def update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def claim(self, job_id: str, owner: str) -> bool:
+        """Move a queued job to running for `owner`. False if another worker got it first."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, heartbeat = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, owner, now, now, job_id, QUEUED)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def heartbeat(self, owner: str):
+        """Mark every job `owner` is running as still alive."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = ?", (time.time(), owner, RUNNING)
+            )
+            self._conn.commit()
+
+    def requeue_stale(self, kind: str, lease_s: float) -> int:
+        """Return running jobs whose owner has not heartbeaten within lease_s to the queue."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, stage = NULL, progress = 0, updated_at = ? "
+                "WHERE kind = ? AND status = ? AND (heartbeat IS NULL OR heartbeat < ?)",
+                (QUEUED, time.time(), kind, RUNNING, time.time() - lease_s)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def queued(self, kind: str) -> list[dict]:
+        """Jobs waiting for a worker, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE kind = ? AND status = ? ORDER BY created_at", (kind, QUEUED)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["cached"] = bool(job["cached"])
+        job["result"] = self.get_result(job["kind"], job["content_hash"]) if job["status"] == DONE else None
+        return job
+
+    def get_result(self, kind: str, content_hash: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM results WHERE kind = ? AND content_hash = ?", (kind, content_hash)
+            ).fetchone()
+        return json.loads(row["result"]) if row else None
+
+    def put_result(self, kind: str, content_hash: str, result: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (kind, content_hash, result, created_at) VALUES (?, ?, ?, ?)",
+                (kind, content_hash, json.dumps(result, ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
@@ -0,0 +1,187 @@
+"""
+Lexical retrieval built alongside each Chroma collection at ingestion time:
+a BM25 inverted index for free-text queries and a section-number table that
+answers exact citations ("IPC 302", "BNS Section 103") without the embedder.
+"""
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Optional
+
+from app.utils.filters import matches_where
+from app.utils.text_processing import normalize_section_number
+
+logger = logging.getLogger(__name__)
+
+LEXICAL_DIR = "lexical"
+
+_TOKEN_RE = re.compile(r"[\wऀ-ॿ]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def section_key(statute_type: str, section: str) -> str:
+    number = normalize_section_number(section)
+    return f"{statute_type.upper()} {number}" if statute_type and number else ""
+
+
+class LexicalIndex:
+    def __init__(self, ids: list[str], documents: list[str], metadatas: list[dict],
+                 k1: float = 1.5, b: float = 0.75):
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.k1 = k1
+        self.b = b
+
+        self.postings = defaultdict(list)
+        self.doc_lengths = []
+        self.sections = defaultdict(list)
+        self.positions = {doc_id: idx for idx, doc_id in enumerate(ids)}
+        for idx, (doc, metadata) in enumerate(zip(documents, metadatas)):
+            terms = Counter(tokenize(doc))
+            self.doc_lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings[term].append((idx, tf))
+
+            key = section_key(metadata.get("statute_type", ""),
+                              metadata.get("section") or metadata.get("section_number") or "")
+            if key:
+                self.sections[key].append(idx)
+
+        n_docs = len(documents)
+        self.avg_doc_length = sum(self.doc_lengths) / n_docs if n_docs else 0.0
+        self.idf = {
+            term: math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: str, n_results: int, where: Optional[dict] = None) -> list[tuple[int, float]]:
+        """BM25 top-n as (doc index, score), best first."""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for idx, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / (self.avg_doc_length or 1))
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if where:
+            ranked = [item for item in ranked if matches_where(self.metadatas[item[0]], where)]
+        return ranked[:n_results]
+
+    def lookup_section(self, key: str, where: Optional[dict] = None) -> list[int]:
+        """Doc indices for an exact "IPC 302"-style citation."""
+        statute_type, _, number = key.partition(" ")
+        indices = self.sections.get(section_key(statute_type, number), [])
+        if where:
+            indices = [idx for idx in indices if matches_where(self.metadatas[idx], where)]
+        return indices
+
+    def to_results(self, hits: list[tuple[int, float]]) -> dict:
+        """Chroma-shaped query results for (doc index, distance) pairs."""
+        return {
+            "ids": [[self.ids[idx] for idx, _ in hits]],
+            "documents": [[self.documents[idx] for idx, _ in hits]],
+            "metadatas": [[self.metadatas[idx] for idx, _ in hits]],
+            "distances": [[distance for _, distance in hits]]
+        }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "documents": self.documents, "metadatas": self.metadatas},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["ids"], data["documents"], data["metadatas"])
+
+    @classmethod
+    def from_collection(cls, collection, page_size: int = 1000) -> "LexicalIndex":
+        ids, documents, metadatas = [], [], []
+        offset = 0
+        while True:
+            page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+            if not page["ids"]:
+                break
+            ids.extend(page["ids"])
+            documents.extend(page["documents"])
+            metadatas.extend(page["metadatas"])
+            offset += len(page["ids"])
+        return cls(ids, documents, metadatas)
+
+
+def index_path(vectorstore_path: str, collection_name: str) -> str:
+    return os.path.join(vectorstore_path, LEXICAL_DIR, f"{collection_name}.json")
+
+
+def build_lexical_indexes(client, vectorstore_path: str, names) -> dict:
+    """Rebuild the lexical index files for the given collections. Called by the ingestion scripts."""
+    counts = {}
+    for name in names:
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        index = LexicalIndex.from_collection(collection)
+        index.save(index_path(vectorstore_path, name))
+        counts[name] = len(index)
+        logger.info(f"  Lexical index for {name}: {len(index)} docs, {len(index.sections)} section keys")
+    return counts
+
+
+class LexicalIndexStore:
+    """Loads per-collection indexes lazily and reloads them when ingestion rewrites the file."""
+
+    def __init__(self, vectorstore_path: str):
+        self.vectorstore_path = vectorstore_path
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str) -> Optional[LexicalIndex]:
+        path = index_path(self.vectorstore_path, collection_name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self._indexes.get(collection_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with self._lock:
+            cached = self._indexes.get(collection_name)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            try:
+                index = LexicalIndex.load(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load lexical index {path}: {e}")
+                return None
+            self._indexes[collection_name] = (mtime, index)
+            return index
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = 60) -> list[tuple[str, float]]:
+    """Fuse ranked ID lists: score(d) = sum over lists of 1 / (k + rank)."""
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
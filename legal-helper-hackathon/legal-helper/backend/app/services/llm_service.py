@@ -1,26 +1,59 @@
-from groq import Groq
+from groq import AsyncGroq
 from app.config import get_settings
+from app.services.context_packer import pack_context
+from app.utils.timing import stage
+from app.utils.metrics import LLM_ERRORS, LLM_TOKENS
+import asyncio
+import json
 import logging
 
 settings = get_settings()
 
 class LLMService:
     def __init__(self):
-        # Initialize Groq client
-        self.client = Groq(api_key=settings.groq_api_key)
+        # Async Groq client so a slow completion never blocks the event loop
+        # llm_base_url points the client at any Groq/OpenAI-compatible server (benchmarks/stub_llm_server.py)
+        self.client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            base_url=settings.llm_base_url,
+            timeout=settings.llm_timeout_s
+        )
         self.model = "llama-3.3-70b-versatile"  # Fast and smart
         logging.info(f"Initialized LLM Service with Groq model: {self.model}")
 
-    async def generate_legal_response(self, query: str, context_documents: list[dict], language: str = "en") -> dict:
-        try:
-            context_text = "\n\n".join([f"Source ({doc['citation']}): {doc['text']}" for doc in context_documents])
-            
-            # specific language instructions
-            language_instruction = f"Respond in {language} language."
-            if language.lower() in ['hi', 'hindi']:
-                language_instruction = "Respond in Hindi using Devanagari script. Do NOT use Hinglish (Hindi in English script)."
+    async def _complete(self, **kwargs):
+        with stage("llm"):
+            try:
+                completion = await asyncio.wait_for(
+                    self.client.chat.completions.create(**kwargs),
+                    timeout=settings.llm_timeout_s
+                )
+            except Exception:
+                LLM_ERRORS.inc()
+                raise
+        self._record_usage(getattr(completion, "usage", None))
+        return completion
+
+    @staticmethod
+    def _record_usage(usage):
+        if usage:
+            LLM_TOKENS.labels("prompt").inc(usage.prompt_tokens or 0)
+            LLM_TOKENS.labels("completion").inc(usage.completion_tokens or 0)
+
+    def _build_legal_messages(self, query: str, context_documents: list[dict], language: str) -> list[dict]:
+        # Deduplicated, query-focused evidence within a fixed token budget
+        packed = pack_context(query, context_documents, settings.context_token_budget, settings.context_doc_max_tokens)
+        context_text = "\n\n".join([f"Source ({doc['citation']}): {doc['text']}" for doc in packed])
+        
+        # specific language instructions
+        language_instruction = f"Respond in {language} language."
+        if language.lower() in ['hi', 'hindi']:
+            language_instruction = "Respond in Hindi using Devanagari script. Do NOT use Hinglish (Hindi in English script)."
+        elif language.lower() == 'mixed':
+            language_instruction = ("The user wrote in Hinglish (Hindi mixed with English). Respond in the same "
+                                    "simple mix of Hindi and English, in Latin script, keeping legal terms in English.")
 
-            prompt = f"""You are an expert legal research assistant specializing in Indian law. 
+        prompt = f"""You are an expert legal research assistant specializing in Indian law. 
 Your role is to provide accurate, well-cited legal information based on the context provided.
 
 Context (Retrieved Legal Documents):
@@ -40,37 +73,45 @@ Instructions:
 
 Answer:"""
 
-            # Call Groq API
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert legal assistant specializing in Indian law."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+        return [
+            {
+                "role": "system",
+                "content": "You are an expert legal assistant specializing in Indian law."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    @staticmethod
+    def estimate_confidence(context_documents: list[dict]) -> float:
+        """Simple confidence estimation based on retrieval scores."""
+        avg_relevance = 0.0
+        if context_documents:
+            scores = [doc.get('relevance_score', 0) for doc in context_documents]
+            avg_relevance = sum(scores) / len(scores) if scores else 0.0
+        return round(avg_relevance, 2)
+
+    async def generate_legal_response(self, query: str, context_documents: list[dict], language: str = "en") -> dict:
+        try:
+            # Call Groq API (hard deadline covers client retries as well)
+            chat_completion = await self._complete(
+                messages=self._build_legal_messages(query, context_documents, language),
                 model=self.model,
                 temperature=0.1,
                 max_tokens=2048,
             )
             
             answer = chat_completion.choices[0].message.content
-            
-            # Simple confidence estimation based on retrieval scores
-            avg_relevance = 0.0
-            if context_documents:
-                scores = [doc.get('relevance_score', 0) for doc in context_documents]
-                avg_relevance = sum(scores) / len(scores) if scores else 0.0
 
-            return {
-                "answer": answer,
-                "sources": context_documents,
-                "confidence": round(avg_relevance, 2),
-                "language": language
-            }
+            with stage("build_response"):
+                return {
+                    "answer": answer,
+                    "sources": context_documents,
+                    "confidence": self.estimate_confidence(context_documents),
+                    "language": language
+                }
         except Exception as e:
             logging.error(f"Error generating legal response: {str(e)}")
             return {
@@ -80,12 +121,87 @@ Answer:"""
                 "language": language
             }
 
-    async def summarize_document(self, text: str) -> dict:
+    async def stream_legal_response(self, query: str, context_documents: list[dict], language: str = "en"):
+        """
+        Yield answer text fragments as Groq produces them. llm_timeout_s is a deadline
+        for the whole stream, creation and every chunk, not just the first response.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.llm_timeout_s
+        with stage("llm"):
+            try:
+                stream = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        messages=self._build_legal_messages(query, context_documents, language),
+                        model=self.model,
+                        temperature=0.1,
+                        max_tokens=2048,
+                        stream=True,
+                    ),
+                    timeout=settings.llm_timeout_s
+                )
+            except Exception:
+                LLM_ERRORS.inc()
+                raise
+            chunks = stream.__aiter__()
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=max(deadline - loop.time(), 0))
+                    except StopAsyncIteration:
+                        return
+                    # Groq reports usage on the last chunk (x_groq); OpenAI-compatible servers on chunk.usage
+                    self._record_usage(
+                        getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+                    )
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            except Exception:
+                # Timeouts and API errors; a client disconnect (GeneratorExit) is not counted
+                LLM_ERRORS.inc()
+                raise
+            finally:
+                # Release the HTTP connection on timeout or when the client goes away
+                await stream.close()
+
+    @staticmethod
+    def parse_summary(result: dict) -> dict:
+        """
+        Turn summarize_document output into {summary, key_points, citations}.
+        Output that is not a JSON object falls back to the raw text, marked "unparsed".
+        """
+        raw_json_str = result.get('raw_response', '{}')
+        
+        # Strip code blocks if present
+        clean_json = raw_json_str.replace('```json', '').replace('```', '')
+        
         try:
-            prompt = f"""Please analyze the following legal document text and provide a summary.
+            parsed = json.loads(clean_json)
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return parsed
+        return {
+            "summary": raw_json_str, # Fallback to raw text
+            "key_points": [],
+            "citations": [],
+            "unparsed": True
+        }
+
+    async def summarize_document(self, text: str, part: tuple = None) -> dict:
+        """
+        Summarize text that fits one prompt (callers bound its size). part=(i, n)
+        marks it as segment i of n of a longer document, the map step of
+        hierarchical summarization.
+        """
+        scope = "the following legal document text"
+        if part:
+            scope = f"the following text, part {part[0]} of {part[1]} of a longer legal document"
+        try:
+            prompt = f"""Please analyze {scope} and provide a summary.
 
 Document Text:
-{text[:10000]}
+{text}
 
 Instructions:
 1. Provide a concise summary of the document.
@@ -100,7 +216,7 @@ Respond in JSON format:
 }}
 """
             
-            chat_completion = self.client.chat.completions.create(
+            chat_completion = await self._complete(
                 messages=[
                     {
                         "role": "user",
@@ -115,3 +231,34 @@ Respond in JSON format:
         except Exception as e:
             logging.error(f"Error summarizing document: {str(e)}")
             return {"error": str(e)}
+
+    async def reduce_summaries(self, partials: list[dict]) -> dict:
+        """Combine summaries of consecutive parts into one (the reduce step)."""
+        parts_text = "\n\n".join(
+            f"Part {i}:\nSummary: {p.get('summary', '')}\nKey points: {'; '.join(p.get('key_points', []))}"
+            for i, p in enumerate(partials, start=1)
+        )
+        try:
+            prompt = f"""The following are summaries of consecutive parts of one legal document, in order.
+
+{parts_text}
+
+Instructions:
+1. Write a single concise summary of the whole document.
+2. Merge the key legal arguments or points, removing repetition.
+
+Respond in JSON format:
+{{
+  "summary": "...",
+  "key_points": ["...", "..."]
+}}
+"""
+            chat_completion = await self._complete(
+                messages=[{"role": "user", "content": prompt}],
+                model=self.model,
+                temperature=0.1,
+            )
+            return {"raw_response": chat_completion.choices[0].message.content}
+        except Exception as e:
+            logging.error(f"Error reducing summaries: {str(e)}")
+            return {"error": str(e)}
@@ -0,0 +1,211 @@
+"""
+In-process exact vector search over memory-mapped NumPy matrices.
+Each collection is exported to <vectorstore>/mmap/<name>/<version>/ as a
+contiguous float16/float32 embedding matrix plus parallel id, document and
+metadata arrays. The matrix (and its row norms) is opened with mmap_mode="r",
+so every uvicorn worker on the host shares the same page-cache pages instead
+of holding its own copy. The ids, documents and metadata in records.json are
+parsed into each worker's own memory, so only the vectors are shared; for
+case_law the text is the larger part. Distances match Chroma's default
+squared-L2 space so results are directly comparable when A/B testing against
+Chroma.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Optional
+
+import numpy as np
+
+from app.utils.filters import matches_where
+
+logger = logging.getLogger(__name__)
+
+MMAP_DIR = "mmap"
+CURRENT_FILE = "CURRENT"
+
+# float16 rows are upcast in blocks so a query never materialises a full float32 copy
+_BLOCK_ROWS = 8192
+
+
+def read_current_version(collection_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(collection_dir, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def publish_version(collection_dir: str, version: str):
+    """Atomically point CURRENT at a new version, keeping only it and the one before."""
+    previous = read_current_version(collection_dir)
+    current_path = os.path.join(collection_dir, CURRENT_FILE)
+    with open(f"{current_path}.tmp", "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(f"{current_path}.tmp", current_path)
+
+    # Keep the version before this one for workers that have not reloaded yet
+    for entry in os.listdir(collection_dir):
+        entry_path = os.path.join(collection_dir, entry)
+        if os.path.isdir(entry_path) and entry not in (version, previous):
+            shutil.rmtree(entry_path, ignore_errors=True)
+
+
+class MmapCollection:
+    def __init__(self, directory: str):
+        self.version = os.path.basename(os.path.normpath(directory))
+        self.embeddings = np.load(os.path.join(directory, "embeddings.npy"), mmap_mode="r")
+        self.sq_norms = np.load(os.path.join(directory, "sq_norms.npy"), mmap_mode="r")
+        with open(os.path.join(directory, "records.json"), "r", encoding="utf-8") as f:
+            records = json.load(f)
+        self.ids = records["ids"]
+        self.documents = records["documents"]
+        self.metadatas = records["metadatas"]
+        self._masks = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def filter_rows(self, where: Optional[dict]) -> Optional[np.ndarray]:
+        """Row indices passing the filter (None = all rows). Cached per distinct filter."""
+        if not where:
+            return None
+        key = json.dumps(where, sort_keys=True)
+        rows = self._masks.get(key)
+        if rows is None:
+            rows = np.fromiter(
+                (i for i, metadata in enumerate(self.metadatas) if matches_where(metadata, where)),
+                dtype=np.int64
+            )
+            if len(self._masks) < 256:
+                self._masks[key] = rows
+        return rows
+
+    def _dot(self, matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        if matrix.dtype == np.float32:
+            return matrix @ query
+        out = np.empty(matrix.shape[0], dtype=np.float32)
+        for start in range(0, matrix.shape[0], _BLOCK_ROWS):
+            block = np.asarray(matrix[start:start + _BLOCK_ROWS], dtype=np.float32)
+            out[start:start + len(block)] = block @ query
+        return out
+
+    def _top(self, distances: np.ndarray, rows: Optional[np.ndarray], n_results: int) -> dict:
+        k = min(n_results, len(distances))
+        if k == 0:
+            top = np.empty(0, dtype=np.int64)
+        else:
+            top = np.argpartition(distances, k - 1)[:k]
+            top = top[np.argsort(distances[top])]
+        positions = top if rows is None else rows[top]
+
+        return {
+            "ids": [[self.ids[i] for i in positions]],
+            "documents": [[self.documents[i] for i in positions]],
+            "metadatas": [[self.metadatas[i] for i in positions]],
+            "distances": [[max(0.0, float(d)) for d in distances[top]]]
+        }
+
+    def query(self, query_embedding: list[float], n_results: int, where: Optional[dict] = None) -> dict:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        rows = self.filter_rows(where)
+
+        if rows is None:
+            dots = self._dot(self.embeddings, query)
+            sq_norms = self.sq_norms
+        else:
+            dots = self._dot(self.embeddings[rows], query)
+            sq_norms = self.sq_norms[rows]
+
+        # Squared L2, the same space Chroma uses by default
+        distances = sq_norms - 2.0 * dots + float(query @ query)
+        return self._top(distances, rows, n_results)
+
+    def query_rows(self, query_embedding: list[float], rows: np.ndarray, n_results: int) -> dict:
+        """Exact search restricted to the given row indices (the ANN re-ranking pass)."""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        dots = self._dot(self.embeddings[rows], query)
+        distances = self.sq_norms[rows] - 2.0 * dots + float(query @ query)
+        return self._top(distances, rows, n_results)
+
+
+class MmapVectorStore:
+    """Per-collection mapped matrices, reloaded when an export publishes a new version."""
+
+    def __init__(self, vectorstore_path: str):
+        self.root = os.path.join(vectorstore_path, MMAP_DIR)
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[MmapCollection]:
+        version = read_current_version(os.path.join(self.root, name))
+        if version is None:
+            return None
+        cached = self._collections.get(name)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            cached = self._collections.get(name)
+            if cached and cached[0] == version:
+                return cached[1]
+            try:
+                collection = MmapCollection(os.path.join(self.root, name, version))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not open mmap export for {name}: {e}")
+                return None
+            self._collections[name] = (version, collection)
+            return collection
+
+
+def export_collection(collection, vectorstore_path: str, dtype: str = "float16", page_size: int = 1000) -> int:
+    """
+    Write one Chroma collection as a new mmap version and publish it.
+    Workers holding the previous version keep their mapping until they reload.
+    """
+    ids, documents, metadatas, embeddings = [], [], [], []
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas", "embeddings"], limit=page_size, offset=offset)
+        if not page["ids"]:
+            break
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        metadatas.extend(page["metadatas"])
+        embeddings.extend(page["embeddings"])
+        offset += len(page["ids"])
+    if not ids:
+        return 0
+
+    matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+    stored = matrix.astype(np.dtype(dtype))
+    # Norms of the stored (possibly rounded) rows keep distances self-consistent
+    sq_norms = np.einsum("ij,ij->i", stored.astype(np.float32), stored.astype(np.float32))
+
+    collection_dir = os.path.join(vectorstore_path, MMAP_DIR, collection.name)
+    version = uuid.uuid4().hex[:12]
+    version_dir = os.path.join(collection_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    np.save(os.path.join(version_dir, "embeddings.npy"), stored)
+    np.save(os.path.join(version_dir, "sq_norms.npy"), sq_norms.astype(np.float32))
+    with open(os.path.join(version_dir, "records.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "documents": documents, "metadatas": metadatas}, f, ensure_ascii=False)
+
+    publish_version(collection_dir, version)
+
+    logger.info(f"  Exported {collection.name}: {len(ids)} x {matrix.shape[1]} {dtype}")
+    return len(ids)
+
+
+def export_mmap_indexes(client, vectorstore_path: str, names, dtype: str = "float16") -> dict:
+    counts = {}
+    for name in names:
+        try:
+            collection = client.get_collection(name=name)
+        except Exception:
+            continue
+        counts[name] = export_collection(collection, vectorstore_path, dtype=dtype)
+    return counts
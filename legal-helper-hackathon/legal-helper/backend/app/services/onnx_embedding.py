@@ -0,0 +1,177 @@
+"""
+ONNX Runtime embedding backend (embedding_backend="onnx").
+scripts/export_onnx_embedding.py exports a SentenceTransformer's transformer to
+<onnx_model_dir>/<model>/model.onnx, optionally a dynamically int8-quantized
+model.int8.onnx, plus its tokenizer.json and pooling config. Serving needs only
+onnxruntime and tokenizers: no torch import, a smaller resident set per worker
+and faster CPU inference. Mean pooling and normalisation are reproduced here,
+and the export is only kept if it passes a cosine parity check against the
+PyTorch model.
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import onnxruntime as ort
+from tokenizers import Tokenizer
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = "embedding_config.json"
+MODEL_FILE = "model.onnx"
+QUANTIZED_FILE = "model.int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+def export_dir(base_dir: str, model_name: str) -> str:
+    """Directory holding the export of a model, e.g. models/onnx/sentence-transformers__all-MiniLM-L6-v2."""
+    return os.path.join(base_dir, model_name.replace("/", "__"))
+
+
+class OnnxEmbeddingService:
+    """Drop-in replacement for EmbeddingService backed by an exported ONNX model."""
+
+    def __init__(self, directory: str, max_workers: int = 2, normalize: bool = False,
+                 quantized: bool = True, intra_op_threads: int = 0):
+        with open(os.path.join(directory, CONFIG_FILE), "r", encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.model_name = self.config["model_name"]
+        # The exported pipeline's own Normalize step, or the caller's request for one
+        self.normalize = normalize or self.config["normalize"]
+
+        model_file = os.path.join(directory, QUANTIZED_FILE)
+        if not quantized or not os.path.exists(model_file):
+            model_file = os.path.join(directory, MODEL_FILE)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(model_file, sess_options=options, providers=["CPUExecutionProvider"])
+        self.model_file = model_file
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(directory, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.config["max_seq_length"])
+        self.tokenizer.enable_padding(pad_id=self.config["pad_token_id"], pad_token=self.config["pad_token"])
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding")
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Pooled float32 embeddings, one row per text (padded to the longest text in the batch)."""
+        encodings = self.tokenizer.encode_batch(texts)
+        attention_mask = np.asarray([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.asarray([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.asarray([e.type_ids for e in encodings], dtype=np.int64)
+        }
+        hidden = self.session.run(None, {name: value for name, value in feeds.items() if name in self._input_names})[0]
+
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+    def get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        return self.encode(texts).tolist()
+
+    def get_embedding(self, text: str) -> list[float]:
+        embedding = self.encode([text])[0]
+        logger.debug("Embedded %d chars, dims=%d", len(text), len(embedding))
+        return embedding.tolist()
+
+    async def aget_embeddings(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get_embeddings, texts)
+
+    async def aget_embedding(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get_embedding, text)
+
+
+def export_onnx_model(model_name: str, directory: str, quantize: bool = True, opset: int = 14) -> dict:
+    """
+    Export a SentenceTransformer's transformer to ONNX (and int8) with its tokenizer
+    and pooling settings. Only mean-pooling models are supported, as served above.
+    Torch is imported here so the serving path above never loads it.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0]
+    pooling = next((module for module in st_model if isinstance(module, Pooling)), None)
+    if pooling is None or not pooling.pooling_mode_mean_tokens:
+        raise ValueError(f"{model_name} does not use mean pooling; the ONNX backend only supports mean pooling")
+
+    os.makedirs(directory, exist_ok=True)
+    hf_model = transformer.auto_model.eval()
+    tokenizer = transformer.tokenizer
+    sample = tokenizer(["export sample", "a slightly longer export sample"], padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    class _Wrapper(torch.nn.Module):
+        # Positional inputs in input_names order; only the token embeddings are needed for pooling
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    model_path = os.path.join(directory, MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            _Wrapper(hf_model), tuple(sample[name] for name in input_names), model_path,
+            input_names=input_names, output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes, opset_version=opset, do_constant_folding=True
+        )
+
+    quantized_path = os.path.join(directory, QUANTIZED_FILE)
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+    elif os.path.exists(quantized_path):
+        os.remove(quantized_path)
+
+    # tokenizer.json is the fast tokenizer's full definition, readable by the tokenizers library alone
+    tokenizer_dir = os.path.join(directory, "hf_tokenizer")
+    tokenizer.save_pretrained(tokenizer_dir)
+    shutil.move(os.path.join(tokenizer_dir, TOKENIZER_FILE), os.path.join(directory, TOKENIZER_FILE))
+    shutil.rmtree(tokenizer_dir)
+
+    config = {
+        "model_name": model_name,
+        "pooling": "mean",
+        "normalize": any(isinstance(module, Normalize) for module in st_model),
+        "max_seq_length": st_model.max_seq_length,
+        "dimensions": st_model.get_sentence_embedding_dimension(),
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+        "quantized": quantize
+    }
+    with open(os.path.join(directory, CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=1)
+    logger.info(f"Exported {model_name} to {directory} ({'fp32 + int8' if quantize else 'fp32'})")
+    return config
+
+
+def parity_check(reference, onnx_service: OnnxEmbeddingService, texts: list[str]) -> dict:
+    """Cosine similarity of ONNX embeddings to a SentenceTransformer's (the reference), per text."""
+    expected = reference.encode(texts, normalize_embeddings=True)
+    actual = onnx_service.encode(texts)
+    actual /= np.clip(np.linalg.norm(actual, axis=1, keepdims=True), 1e-12, None)
+    cosines = (expected * actual).sum(axis=1)
+    return {
+        "model_file": os.path.basename(onnx_service.model_file),
+        "texts": len(texts),
+        "min_cosine": round(float(cosines.min()), 5),
+        "mean_cosine": round(float(cosines.mean()), 5)
+    }
@@ -2,27 +2,105 @@
 Updated RAG Service for Partitioned Collections
 Queries the correct collection based on language, domain, and statute type.
 """
+import asyncio
+import os
+import time
 import chromadb
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import zip_longest
 from app.config import get_settings
 from app.services.llm_service import LLMService
-from app.services.embedding_service import EmbeddingService
-from app.utils.text_processing import detect_language
+from app.services.embedding_service import EmbeddingService, create_embedding_service
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.reranker import RerankerBusy, RerankerService, adaptive_cutoff
+from app.services.answer_cache import SemanticAnswerCache
+from app.utils.cache import LRUCache, CollectionVersions
+from app.services.lexical_index import LexicalIndexStore, reciprocal_rank_fusion
+from app.services.section_mapping import SectionMappingIndex, mapping_path
+from app.services.mmap_vector_store import MmapVectorStore
+from app.services.ann_index import AnnIndexStore
+from app.services.unified_statutes import UNIFIED_COLLECTION, collection_model, link_counterparts
+from app.utils.text_processing import detect_language, normalize_query, extract_section_number
+from app.utils.timing import stage
+from app.utils.metrics import COLLECTION_QUERY_SECONDS
+import json
 import logging
+from typing import Optional
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def load_reranker() -> Optional[RerankerService]:
+    """Build the cross-encoder, or disable re-ranking if the model cannot be loaded."""
+    try:
+        return RerankerService(settings.reranker_model, max_pending=settings.rerank_max_pending)
+    except Exception as e:
+        logger.warning(f"Re-ranker unavailable, using vector order only: {e}")
+        return None
 
 
 class RAGService:
-    def __init__(self):
-        # Use absolute path for vectorstore to avoid CWD issues
-        import os
+    # Documents per collection without re-ranking (and the base for over-fetching with it)
+    BASE_COUNTS = {"statute": 4, "regulation": 3, "case": 2}
+
+    def __init__(self, embedding_service: EmbeddingService = None, llm_service: LLMService = None,
+                 reranker: RerankerService = None):
+        # Use absolute path for vectorstore to avoid CWD issues (chromadb_path is relative to the backend)
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        vectorstore_path = os.path.join(base_dir, "vectorstore")
-        print(f"[DEBUG] RAG Service initializing with path: {vectorstore_path}", flush=True)
+        vectorstore_path = os.path.normpath(os.path.join(base_dir, settings.chromadb_path))
+        logger.info(f"RAG Service initializing with path: {vectorstore_path}")
         
+        self.vectorstore_path = vectorstore_path
         self.chroma_client = chromadb.PersistentClient(path=vectorstore_path)
-        self.embedding_service = EmbeddingService(model_name=settings.embedding_model)
-        self.llm_service = LLMService()
+        # Services are shared by the app's ServiceContainer; build our own when used standalone
+        self.embedding_service = embedding_service or create_embedding_service(
+            model_name=settings.embedding_model,
+            max_workers=settings.embedding_workers
+        )
+        self.llm_service = llm_service or LLMService()
+        self.reranker = reranker
+        if self.reranker is None and settings.rerank_enabled:
+            self.reranker = load_reranker()
+        # Concurrent queries share one batched encode instead of one forward pass each
+        self.embedding_batcher = EmbeddingBatcher(
+            self.embedding_service,
+            max_batch_size=settings.embedding_batch_max_size,
+            max_wait_ms=settings.embedding_batch_max_wait_ms
+        )
+        # Multilingual encoder for the unified statute index (the main one if it is already that model)
+        self.statute_embedding_service = None
+        self.statute_batcher = None
+        if settings.statute_index == "unified":
+            self._init_unified_statutes()
+        # normalized query -> embedding, and (embedding, collection, filter, k) -> results.
+        # Retrieval keys carry the collection version, so re-ingestion invalidates them.
+        self.embedding_cache = LRUCache(maxsize=settings.embedding_cache_size)
+        self.retrieval_cache = LRUCache(
+            maxsize=settings.retrieval_cache_size, ttl_s=settings.retrieval_cache_ttl_s
+        )
+        self.collection_versions = CollectionVersions(vectorstore_path)
+        # BM25 + section-number tables written next to each collection by the ingestion scripts
+        self.lexical_indexes = LexicalIndexStore(vectorstore_path)
+        # Optional in-process exact search over memory-mapped exports (retrieval_backend="mmap")
+        self.mmap_store = MmapVectorStore(vectorstore_path) if settings.retrieval_backend == "mmap" else None
+        # Quantized IVF search for collections that have an index (case_law), re-ranked on exact vectors
+        self.ann_store = AnnIndexStore(vectorstore_path, self.mmap_store) if settings.ann_retrieval else None
+        # Precomputed IPC -> BNS table (scripts/build_section_mapping.py) for /compare
+        self.section_mapping = SectionMappingIndex.load(mapping_path(vectorstore_path))
+        # Near-duplicate questions over the same evidence reuse a stored LLM answer
+        self.answer_cache = None
+        if settings.answer_cache_enabled:
+            self.answer_cache = SemanticAnswerCache(
+                os.path.join(base_dir, settings.cache_dir, "answer_cache.sqlite3"),
+                threshold=settings.answer_cache_threshold,
+                max_entries=settings.answer_cache_max_entries
+            )
+        # Chroma's client is synchronous; lookups run here so they never block the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.retrieval_workers, thread_name_prefix="retrieval"
+        )
         
         # Initialize collection references
         self._collections = {}
@@ -33,117 +111,648 @@ class RAGService:
         try:
             collections = self.chroma_client.list_collections()
             for coll in collections:
-                print(f"[DEBUG] Found collection: {coll.name} ({coll.count()} docs)", flush=True)
+                logger.info(f"Found collection: {coll.name} ({coll.count()} docs)")
         except Exception as e:
-            print(f"[DEBUG] Error listing collections: {e}", flush=True)
+            logger.warning(f"Error listing collections: {e}")
     
+    def _init_unified_statutes(self):
+        collection = self._get_collection(UNIFIED_COLLECTION)
+        if collection is None:
+            logger.warning(f"statute_index=unified but {UNIFIED_COLLECTION} does not exist "
+                           f"(run scripts/build_unified_statutes.py); using the split statute collections")
+            return
+        model_name = settings.multilingual_embedding_model
+        built_with = collection_model(collection)
+        if built_with and built_with != model_name:
+            logger.warning(f"{UNIFIED_COLLECTION} was built with {built_with}, not {model_name}; "
+                           f"using the split statute collections")
+            return
+        if model_name == self.embedding_service.model_name:
+            self.statute_embedding_service = self.embedding_service
+            self.statute_batcher = self.embedding_batcher
+            return
+        logger.info(f"Loading multilingual statute embedding model: {model_name}")
+        self.statute_embedding_service = create_embedding_service(
+            model_name=model_name,
+            max_workers=settings.embedding_workers,
+            normalize=True
+        )
+        self.statute_batcher = EmbeddingBatcher(
+            self.statute_embedding_service,
+            max_batch_size=settings.embedding_batch_max_size,
+            max_wait_ms=settings.embedding_batch_max_wait_ms
+        )
+
     def _get_collection(self, name: str):
         """Get a collection by name - always fetch fresh reference."""
         try:
             coll = self.chroma_client.get_collection(name=name)
             return coll
         except Exception as e:
-            print(f"[DEBUG] Collection {name} not found: {e}", flush=True)
+            logger.debug("Collection %s not found: %s", name, e)
             return None
 
     async def query(self, query: str, filters: dict = None, domain: str = None) -> dict:
         """
         Query the partitioned collections based on language and filters.
+        Embedding, vector search and the LLM call all run off the event loop.
         """
-        language = detect_language(query)
-        print(f"[DEBUG] Processing query: {query}, Language: {language}, Filters: {filters}, Domain: {domain}", flush=True)
-        
-        # Generate query embedding
-        query_embedding = self.embedding_service.get_embedding(query)
+        language, query_embedding, context_documents = await self._prepare(query, filters, domain)
+        return await self._answer(query, filters, language, query_embedding, context_documents)
+
+    async def _answer(self, query: str, filters: dict, language: str, query_embedding: list[float],
+                      context_documents: list) -> dict:
+        context_key, cached = await self._lookup_answer(query, query_embedding, language, filters, context_documents)
+        if cached:
+            return cached
         
-        context_documents = []
+        # Generate response using LLM
+        response = await self.llm_service.generate_legal_response(query, context_documents, language)
         
-        # Determine which statute collection to query based on language
-        statute_collection_name = "statutes_hindi" if language == "hi" else "statutes_english"
-        print(f"[DEBUG] Looking for collection: {statute_collection_name}", flush=True)
-        statute_coll = self._get_collection(statute_collection_name)
+        # Error responses come back without sources; only cache real answers
+        if response.get("sources"):
+            await self._store_answer(query, query_embedding, context_key, response)
         
-        if statute_coll:
-            print(f"[DEBUG] Found {statute_collection_name} with {statute_coll.count()} docs", flush=True)
-            
-            # --- DEBUG: Manual Embedding Check ---
-            # (Keeping this briefly to confirm fix)
-            # -------------------------------------
+        return response
 
-            where_filter = filters.copy() if filters else {}
-            
-            # FIX: Remove 'jurisdiction' filter as our data doesn't have this metadata
-            if 'jurisdiction' in where_filter:
-                print(f"[DEBUG] Removing invalid filter 'jurisdiction': {where_filter['jurisdiction']}", flush=True)
-                del where_filter['jurisdiction']
-            
+    async def query_batch(self, queries: list[dict], concurrency: int = None):
+        """
+        Answer many {"query", "filters"} items, yielding (index, response) as each completes.
+        A feeder task prepares items in chunks (one batched encode and one multi-query lookup
+        per collection per chunk) and starts an answer task per item; LLM calls are bounded
+        by one semaphore, and at most two chunks of items are in flight, so preparing the
+        next chunk overlaps with answering the previous one. If any task raises, the others
+        are cancelled and the error propagates to the caller.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.batch_llm_concurrency)
+        chunk_size = settings.batch_chunk_size
+        window = asyncio.Semaphore(2 * chunk_size)
+        finished = asyncio.Queue()
+        tasks = []
+
+        async def answer(index: int, item: dict, prepared):
+            language, query_embedding, context_documents = prepared
             try:
-                # Query with embedding
-                statute_results = statute_coll.query(
-                    query_embeddings=[query_embedding],
-                    n_results=4,
-                    where=where_filter if where_filter else None
-                )
-                
-                num_results = len(statute_results.get('documents', [[]])[0])
-                print(f"[DEBUG] Statute query returned {num_results} results", flush=True)
-                
-                if num_results == 0:
-                    print("[DEBUG] RETRYING with query_texts...", flush=True)
-                    statute_results = statute_coll.query(
-                        query_texts=[query],
-                        n_results=4,
-                        where=where_filter if where_filter else None
+                async with semaphore:
+                    response = await self._answer(
+                        item["query"], item.get("filters"), language, query_embedding, context_documents
                     )
-                    print(f"[DEBUG] Retry returned {len(statute_results.get('documents', [[]])[0])} results", flush=True)
+            finally:
+                window.release()
+            return index, response
 
-                self._process_results(statute_results, "statute", context_documents)
-            except Exception as e:
-                print(f"[DEBUG] Error querying statutes: {e}", flush=True)
-        else:
-            print(f"[DEBUG] Collection {statute_collection_name} NOT FOUND!", flush=True)
-        # Query regulations if domain is specified
-        if domain:
-            reg_coll = self._get_collection("regulations")
-            if reg_coll:
-                try:
-                    reg_results = reg_coll.query(
-                        query_embeddings=[query_embedding],
-                        n_results=3,
-                        where={"domain": domain.upper()}
-                    )
-                    print(f"[DEBUG] Regulations query returned {len(reg_results.get('documents', [[]])[0])} results", flush=True)
-                    self._process_results(reg_results, "regulation", context_documents)
-                except Exception as e:
-                    print(f"[DEBUG] Error querying regulations: {e}", flush=True)
-        
-        # Query case law
-        case_coll = self._get_collection("case_law")
-        if case_coll:
-            try:
-                case_results = case_coll.query(
-                    query_embeddings=[query_embedding],
-                    n_results=2
+        async def feed():
+            for start in range(0, len(queries), chunk_size):
+                chunk = queries[start:start + chunk_size]
+                for _ in chunk:
+                    await window.acquire()
+                prepared = await self._prepare_many(chunk)
+                for i, (item, p) in enumerate(zip(chunk, prepared)):
+                    task = asyncio.create_task(answer(start + i, item, p))
+                    task.add_done_callback(finished.put_nowait)
+                    tasks.append(task)
+
+        feeder = asyncio.create_task(feed())
+        feeder.add_done_callback(finished.put_nowait)
+        remaining = len(queries)
+        try:
+            while remaining:
+                task = await finished.get()
+                if task is feeder:
+                    task.result()  # re-raises a preparation failure
+                    continue
+                yield task.result()
+                remaining -= 1
+        finally:
+            # On error or when the consumer stops early, nothing is left running
+            for task in (feeder, *tasks):
+                task.cancel()
+
+    async def _prepare_many(self, items: list[dict]) -> list[tuple]:
+        """Batch counterpart of _prepare: (language, embedding, documents) per item."""
+        with stage("detect_language"):
+            languages = [detect_language(item["query"]) for item in items]
+        prepared = [None] * len(items)
+
+        # Exact citations take the section fast path individually
+        if settings.section_fast_path:
+            refs = [extract_section_number(item["query"]) for item in items]
+            fast = await asyncio.gather(*(
+                self._retrieve_section(item["query"], ref, language, item.get("filters"), item.get("domain"))
+                for item, ref, language in zip(items, refs, languages) if ref
+            ))
+            fast_iter = iter(fast)
+            for i, ref in enumerate(refs):
+                if ref:
+                    context_documents = next(fast_iter)
+                    if context_documents:
+                        prepared[i] = (languages[i], None, context_documents)
+
+        pending = [i for i in range(len(items)) if prepared[i] is None]
+        if not pending:
+            return prepared
+
+        # One encode call for every embedding not already cached
+        keys = [normalize_query(items[i]["query"]) for i in pending]
+        embeddings = [self.embedding_cache.get(key) for key in keys]
+        missing = [j for j, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            with stage("embed"):
+                encoded = await asyncio.wait_for(
+                    self.embedding_service.aget_embeddings([items[pending[j]]["query"] for j in missing]),
+                    timeout=settings.embedding_timeout_s
                 )
-                print(f"[DEBUG] Case law query returned {len(case_results.get('documents', [[]])[0])} results", flush=True)
-                self._process_results(case_results, "case", context_documents)
-            except Exception as e:
-                print(f"[DEBUG] Error querying case law: {e}", flush=True)
+            for j, embedding in zip(missing, encoded):
+                embeddings[j] = embedding
+                self.embedding_cache.set(keys[j], embedding)
+
+        retrieved = await self._retrieve_many([
+            (items[i]["query"], embedding, languages[i], items[i].get("filters"), items[i].get("domain"))
+            for i, embedding in zip(pending, embeddings)
+        ])
+        for i, embedding, context_documents in zip(pending, embeddings, retrieved):
+            prepared[i] = (languages[i], embedding, context_documents)
+        return prepared
+
+    async def query_stream(self, query: str, filters: dict = None, domain: str = None):
+        """
+        Streaming variant of query. Yields (event, data) pairs: "sources" once
+        retrieval completes, "token" per answer fragment, then "done" (or "error").
+        """
+        language, query_embedding, context_documents = await self._prepare(query, filters, domain)
+        yield "sources", {"sources": context_documents, "language": language}
+
+        context_key, cached = await self._lookup_answer(query, query_embedding, language, filters, context_documents)
+        if cached:
+            yield "token", {"text": cached["answer"]}
+            yield "done", {"confidence": cached["confidence"], "cached": True}
+            return
+
+        parts = []
+        try:
+            async for token in self.llm_service.stream_legal_response(query, context_documents, language):
+                parts.append(token)
+                yield "token", {"text": token}
+        except Exception as e:
+            logger.error(f"Error streaming legal response: {str(e)}")
+            yield "error", {"detail": str(e)}
+            return
+
+        confidence = self.llm_service.estimate_confidence(context_documents)
+        if context_documents:
+            await self._store_answer(query, query_embedding, context_key, {
+                "answer": "".join(parts),
+                "sources": context_documents,
+                "confidence": confidence,
+                "language": language
+            })
+        yield "done", {"confidence": confidence, "cached": False}
+
+    async def _prepare(self, query: str, filters: dict = None, domain: str = None):
+        """
+        Language detection, query embedding and retrieval shared by query and query_stream.
+        Exact citations ("IPC 302") are answered from the section table without embedding,
+        in which case the returned embedding is None.
+        """
+        with stage("detect_language"):
+            language = detect_language(query)
+        logger.debug("Processing query language=%s filters=%s domain=%s", language, filters, domain)
         
-        print(f"[DEBUG] Retrieved {len(context_documents)} total documents", flush=True)
+        section_ref = extract_section_number(query) if settings.section_fast_path else ""
+        if section_ref:
+            context_documents = await self._retrieve_section(query, section_ref, language, filters, domain)
+            if context_documents:
+                logger.debug("Section fast path for %s: %d documents", section_ref, len(context_documents))
+                return language, None, context_documents
         
-        # Generate response using LLM
-        response = await self.llm_service.generate_legal_response(query, context_documents, language)
+        # Generate query embedding (micro-batched with other in-flight queries)
+        query_embedding = await asyncio.wait_for(
+            self._embed(query),
+            timeout=settings.embedding_timeout_s
+        )
         
-        return response
+        context_documents = await self._retrieve(query, query_embedding, language, filters, domain)
+        logger.debug("Retrieved %d documents", len(context_documents))
+        return language, query_embedding, context_documents
+
+    async def _lookup_answer(self, query: str, query_embedding: list[float], language: str, filters: dict,
+                             context_documents: list):
+        """Returns (context_key, cached_response or None) from the semantic answer cache."""
+        if not self.answer_cache:
+            return None, None
+        context_key = SemanticAnswerCache.context_key(language, filters, context_documents)
+        cached = await asyncio.to_thread(
+            self.answer_cache.lookup, query_embedding, context_key, normalize_query(query)
+        )
+        if cached:
+            logger.debug("Semantic answer cache hit")
+            cached["cached"] = True
+        return context_key, cached
+
+    async def _store_answer(self, query: str, query_embedding: list[float], context_key: str, response: dict):
+        if self.answer_cache and context_key:
+            await asyncio.to_thread(
+                self.answer_cache.store, query_embedding, context_key, response, normalize_query(query)
+            )
+
+    @staticmethod
+    def _statute_where(filters: dict = None) -> dict:
+        where_filter = filters.copy() if filters else {}
+        
+        # FIX: Remove 'jurisdiction' filter as our data doesn't have this metadata
+        if 'jurisdiction' in where_filter:
+            logger.debug("Removing invalid filter 'jurisdiction': %s", where_filter['jurisdiction'])
+            del where_filter['jurisdiction']
+        return where_filter
+
+    async def _retrieve_section(self, query: str, section_ref: str, language: str,
+                                filters: dict = None, domain: str = None) -> list:
+        """
+        Exact-citation path: statutes come from the section table, regulations and
+        case law from BM25. No embedding, no vector search.
+        """
+        where_filter = self._statute_where(filters) or None
+        lookups = [
+            ("statute", name, where_filter, self.BASE_COUNTS["statute"], section_ref)
+            for name in self._statute_collections(language)
+        ]
+        if domain:
+            lookups.append(("regulation", "regulations", {"domain": domain.upper()}, 3, None))
+        lookups.append(("case", "case_law", None, 2, None))
+
+        loop = asyncio.get_running_loop()
+        with stage("retrieve"):
+            results = await asyncio.gather(*(
+                loop.run_in_executor(self._executor, partial(
+                    self._lexical_lookup_sync, name, query, n_results, where, section
+                ))
+                for _, name, where, n_results, section in lookups
+            ))
+        # Without a section match there is nothing to short-circuit; use the normal path
+        if not any(result for (doc_type, *_), result in zip(lookups, results) if doc_type == "statute"):
+            return []
+        return self._collect_results(lookups, results, self.BASE_COUNTS)
+
+    def _statute_collections(self, language: str) -> list[str]:
+        """
+        Statute collections for a query language; Hinglish queries search both.
+        With the unified index every language is one search over both.
+        """
+        if self.statute_embedding_service:
+            return [UNIFIED_COLLECTION]
+        if language == "hi":
+            return ["statutes_hindi"]
+        if language == "mixed":
+            return ["statutes_english", "statutes_hindi"]
+        return ["statutes_english"]
+
+    def _collect_results(self, lookups: list[tuple], results: list, limits: dict) -> list:
+        """
+        Context documents from per-lookup results, in lookup order. A type searched in
+        several collections (statutes for Hinglish queries) is interleaved and capped at
+        limits[type], so both languages are represented without growing the context.
+        """
+        by_type = {}
+        for (doc_type, *_), result in zip(lookups, results):
+            documents = []
+            self._process_results(result, doc_type, documents)
+            by_type.setdefault(doc_type, []).append(documents)
+
+        context_documents = []
+        for doc_type, per_collection in by_type.items():
+            if len(per_collection) == 1:
+                context_documents.extend(per_collection[0])
+                continue
+            merged = [doc for group in zip_longest(*per_collection) for doc in group if doc is not None]
+            context_documents.extend(merged[:limits[doc_type]])
+        return context_documents
+
+    def _lexical_lookup_sync(self, name: str, query: str, n_results: int, where: dict = None,
+                             section_ref: str = None):
+        index = self.lexical_indexes.get(name)
+        if index is None:
+            return None
+        if section_ref:
+            # Exact matches are fully relevant
+            hits = [(idx, 0.0) for idx in index.lookup_section(section_ref, where)[:n_results]]
+        else:
+            # BM25 scores are not comparable to vector distances; report a neutral distance
+            hits = [(idx, 0.5) for idx, _ in index.search(query, n_results, where)]
+        return index.to_results(hits) if hits else None
+
+    async def _retrieve(self, query: str, query_embedding: list[float], language: str,
+                        filters: dict = None, domain: str = None) -> list:
+        """Run the statute, regulation and case-law lookups concurrently."""
+        return (await self._retrieve_many([(query, query_embedding, language, filters, domain)]))[0]
+
+    async def _retrieve_many(self, items: list[tuple]) -> list[list]:
+        """
+        Retrieval for many (query, embedding, language, filters, domain) items at once.
+        Items hitting the same collection with the same filter share one multi-query
+        lookup; the statute, regulation and case-law lookups run concurrently.
+        """
+        # With a re-ranker, over-fetch and let it decide how many documents are worth keeping
+        multiplier = settings.rerank_fetch_multiplier if self.reranker else 1
+        counts = {doc_type: n * multiplier for doc_type, n in self.BASE_COUNTS.items()}
+
+        # (doc_type, collection, n_results, where json) -> [(item index, fallback_text)]
+        groups = {}
+        item_keys = []
+        for i, (query, _, language, filters, domain) in enumerate(items):
+            # Determine which statute collection(s) to query based on language
+            where_filter = self._statute_where(filters) or None
+            # The vector fallback re-embeds with Chroma's default model, which does not match the unified index
+            lookups = [
+                ("statute", name, where_filter, query if name != UNIFIED_COLLECTION else None)
+                for name in self._statute_collections(language)
+            ]
+            # Query regulations if domain is specified
+            if domain:
+                lookups.append(("regulation", "regulations", {"domain": domain.upper()}, None))
+            lookups.append(("case", "case_law", None, None))
+            item_keys.append([])
+            for doc_type, name, where, fallback_text in lookups:
+                key = (doc_type, name, counts[doc_type], json.dumps(where, sort_keys=True))
+                groups.setdefault(key, []).append((i, fallback_text))
+                item_keys[i].append(key)
+
+        keys = list(groups)
+        lookups = []
+        for key in keys:
+            _, name, n_results, where_json = key
+            members = groups[key]
+            if name == UNIFIED_COLLECTION:
+                lookup = self._query_unified_many(
+                    [items[i][0] for i, _ in members], n_results, where=json.loads(where_json)
+                )
+            else:
+                lookup = self._query_collection_many(
+                    name, [items[i][1] for i, _ in members], n_results,
+                    where=json.loads(where_json),
+                    fallback_texts=[fallback for _, fallback in members],
+                    query_texts=[items[i][0] for i, _ in members]
+                )
+            lookups.append(asyncio.wait_for(lookup, timeout=settings.retrieval_timeout_s))
+        results = await asyncio.gather(*lookups, return_exceptions=True)
+
+        per_item = [{} for _ in items]
+        for key, result in zip(keys, results):
+            doc_type = key[0]
+            if isinstance(result, Exception):
+                logger.warning(f"Error querying {doc_type} collection: {result!r}")
+                continue
+            for (i, _), item_result in zip(groups[key], result):
+                per_item[i][key] = item_result
+
+        retrieved = [
+            self._collect_results(keys_for_item, [by_key.get(key) for key in keys_for_item], counts)
+            for keys_for_item, by_key in zip(item_keys, per_item)
+        ]
+
+        if self.reranker:
+            retrieved = await asyncio.gather(*(
+                self._rerank(query, context_documents)
+                for (query, _, _, _, _), context_documents in zip(items, retrieved)
+            ))
+        return list(retrieved)
+
+    @classmethod
+    def _base_selection(cls, context_documents: list) -> list:
+        """The first BASE_COUNTS documents of each type, in retrieval order."""
+        taken = {}
+        selected = []
+        for doc in context_documents:
+            n = taken.get(doc["type"], 0)
+            if n < cls.BASE_COUNTS.get(doc["type"], 0):
+                taken[doc["type"]] = n + 1
+                selected.append(doc)
+        return selected
+
+    async def _rerank(self, query: str, context_documents: list) -> list:
+        """
+        Cross-encoder scores over all candidates with an adaptive cut-off. Falls back to
+        the fixed per-type counts when the vector scores are decisive or the deadline passes.
+        """
+        # RERANK_MIN_DOCS may be set below 2; the gap check needs two candidates
+        if len(context_documents) <= max(settings.rerank_min_docs, 1):
+            return context_documents
+
+        relevance = sorted((doc["relevance_score"] for doc in context_documents), reverse=True)
+        if relevance[0] - relevance[1] >= settings.rerank_skip_gap:
+            logger.debug("Vector scores decisive, skipping re-rank")
+            return self._base_selection(context_documents)
+
+        try:
+            with stage("rerank"):
+                scores = await asyncio.wait_for(
+                    self.reranker.ascore(query, [doc["text"] for doc in context_documents]),
+                    timeout=settings.rerank_timeout_s
+                )
+        except asyncio.TimeoutError:
+            logger.warning("Re-rank deadline exceeded, using vector order")
+            return self._base_selection(context_documents)
+        except RerankerBusy:
+            logger.debug("Re-ranker busy, using vector order")
+            return self._base_selection(context_documents)
+
+        keep = adaptive_cutoff(
+            scores,
+            min_score=settings.rerank_min_score,
+            relative=settings.rerank_relative,
+            min_keep=settings.rerank_min_docs,
+            max_keep=settings.rerank_max_docs
+        )
+        logger.debug("Re-rank kept %d of %d candidates", len(keep), len(context_documents))
+        return [{**context_documents[i], "rerank_score": round(scores[i], 4)} for i in keep]
+
+    async def _query_collection(self, name: str, query_embedding: list[float], n_results: int,
+                                where: dict = None, fallback_text: str = None, query_text: str = None):
+        """
+        Query a collection on the retrieval executor. Returns None if it does not exist.
+        With query_text and hybrid retrieval enabled, vector and BM25 rankings are fused.
+        """
+        return (await self._query_collection_many(
+            name, [query_embedding], n_results, where, [fallback_text], [query_text]
+        ))[0]
+
+    async def _query_collection_many(self, name: str, query_embeddings: list[list[float]], n_results: int,
+                                     where: dict = None, fallback_texts: list = None, query_texts: list = None):
+        """Per-query results for several embeddings; cache misses go to the store in one call."""
+        fallback_texts = fallback_texts or [None] * len(query_embeddings)
+        query_texts = query_texts or [None] * len(query_embeddings)
+        version = self.collection_versions.get(name)
+        where_key = json.dumps(where, sort_keys=True)
+
+        cache_keys, results, misses = [], [], []
+        for i, (embedding, query_text) in enumerate(zip(query_embeddings, query_texts)):
+            cache_key = (
+                hash(tuple(embedding)), name, version, where_key, n_results,
+                normalize_query(query_text) if query_text and settings.hybrid_retrieval else None
+            )
+            cache_keys.append(cache_key)
+            results.append(self.retrieval_cache.get(cache_key))
+            if results[-1] is None:
+                misses.append(i)
+
+        if misses:
+            loop = asyncio.get_running_loop()
+            with stage("retrieve"):
+                fetched = await loop.run_in_executor(
+                    self._executor,
+                    partial(
+                        self._query_collection_many_sync, name,
+                        [query_embeddings[i] for i in misses], n_results, where,
+                        [fallback_texts[i] for i in misses], [query_texts[i] for i in misses]
+                    )
+                )
+            for i, result in zip(misses, fetched):
+                results[i] = result
+                if result is not None:
+                    self.retrieval_cache.set(cache_keys[i], result)
+        return results
+
+    async def _query_unified_many(self, queries: list[str], n_results: int, where: dict = None):
+        """
+        Statute search over the unified index. The queries are embedded with the
+        multilingual model here, so that encode overlaps with the other lookups.
+        Hits are followed by their section in the other language (linked_ids).
+        """
+        embeddings = await self._embed_statute_many(queries)
+        results = await self._query_collection_many(
+            UNIFIED_COLLECTION, embeddings, n_results, where, query_texts=queries
+        )
+        index = self.lexical_indexes.get(UNIFIED_COLLECTION)
+        return [link_counterparts(result, index, n_results) for result in results]
+
+    async def _embed_statute_many(self, texts: list[str]) -> list[list[float]]:
+        """Multilingual embeddings through the LRU cache; a single text goes through the micro-batcher."""
+        shared = self.statute_embedding_service is self.embedding_service
+        keys = [normalize_query(text) if shared else ("multilingual", normalize_query(text)) for text in texts]
+        embeddings = [self.embedding_cache.get(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            with stage("embed"):
+                if len(missing) == 1:
+                    encoded = [await self.statute_batcher.embed(texts[missing[0]])]
+                else:
+                    encoded = await self.statute_embedding_service.aget_embeddings([texts[i] for i in missing])
+            for i, embedding in zip(missing, encoded):
+                embeddings[i] = embedding
+                self.embedding_cache.set(keys[i], embedding)
+        return embeddings
+
+    async def _embed(self, text: str) -> list[float]:
+        """Embed text through the LRU cache and the micro-batcher."""
+        key = normalize_query(text)
+        embedding = self.embedding_cache.get(key)
+        if embedding is None:
+            with stage("embed"):
+                embedding = await self.embedding_batcher.embed(text)
+            self.embedding_cache.set(key, embedding)
+        return embedding
+
+    def cache_stats(self) -> dict:
+        return {
+            "embedding_cache": self.embedding_cache.stats(),
+            "retrieval_cache": self.retrieval_cache.stats(),
+            "answer_cache": self.answer_cache.stats() if self.answer_cache else None,
+            "embedding_batcher": self.embedding_batcher.stats()
+        }
+
+    def _query_collection_many_sync(self, name: str, query_embeddings: list[list[float]], n_results: int,
+                                    where: dict = None, fallback_texts: list = None, query_texts: list = None):
+        fallback_texts = fallback_texts or [None] * len(query_embeddings)
+        query_texts = query_texts or [None] * len(query_embeddings)
+        lexical = self.lexical_indexes.get(name) if settings.hybrid_retrieval and all(query_texts) else None
+        # Over-fetch so fusion has candidates from both rankings to choose from
+        fetch_k = n_results * 2 if lexical else n_results
+
+        ann = self.ann_store.get(name) if self.ann_store else None
+        mmap_coll = self.mmap_store.get(name) if self.mmap_store and ann is None else None
+        backend = "ann" if ann is not None else "mmap" if mmap_coll is not None else "chroma"
+        start = time.perf_counter()
+        if ann is not None:
+            batch = [ann.search(embedding, fetch_k, where, nprobe=settings.ann_nprobe,
+                                rerank_k=settings.ann_rerank_k) for embedding in query_embeddings]
+        elif mmap_coll is not None:
+            batch = [mmap_coll.query(embedding, fetch_k, where) for embedding in query_embeddings]
+        else:
+            coll = self._get_collection(name)
+            if coll is None:
+                logger.debug("Collection %s not found", name)
+                return [None] * len(query_embeddings)
+
+            # Chroma accepts a list of query embeddings and answers them in one call
+            results = coll.query(
+                query_embeddings=query_embeddings,
+                n_results=fetch_k,
+                where=where
+            )
+            batch = [
+                {key: [results[key][i]] for key in ("ids", "documents", "metadatas", "distances")}
+                for i in range(len(query_embeddings))
+            ]
+
+            for i, fallback_text in enumerate(fallback_texts):
+                if fallback_text and not batch[i]["documents"][0]:
+                    logger.debug("No vector hits in %s, retrying with query text", name)
+                    batch[i] = coll.query(
+                        query_texts=[fallback_text],
+                        n_results=fetch_k,
+                        where=where
+                    )
+        self._observe_query(name, backend, start, len(query_embeddings))
+
+        if lexical:
+            start = time.perf_counter()
+            batch = [
+                self._fuse_with_bm25(results, lexical, query_text, n_results, where)
+                for results, query_text in zip(batch, query_texts)
+            ]
+            self._observe_query(name, "bm25_fusion", start, len(query_embeddings))
+        return batch
+
+    @staticmethod
+    def _observe_query(name: str, backend: str, start: float, n_queries: int):
+        elapsed = time.perf_counter() - start
+        COLLECTION_QUERY_SECONDS.labels(name, backend).observe(elapsed)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("span=collection_query collection=%s backend=%s queries=%d duration_ms=%.2f",
+                         name, backend, n_queries, elapsed * 1000)
+
+    @staticmethod
+    def _fuse_with_bm25(results: dict, lexical, query_text: str, n_results: int, where: dict = None) -> dict:
+        """Reciprocal-rank fusion of the vector results with BM25 over the same collection."""
+        vector_ids = results['ids'][0]
+        candidates = {
+            doc_id: (results['documents'][0][i], results['metadatas'][0][i], results['distances'][0][i])
+            for i, doc_id in enumerate(vector_ids)
+        }
+        bm25_hits = lexical.search(query_text, max(len(vector_ids), n_results * 2), where)
+        lexical_ids = [lexical.ids[idx] for idx, _ in bm25_hits]
+
+        # A lexical-only hit missed the vector top-k, so it is at least as far as the worst vector hit
+        default_distance = max((distance for *_, distance in candidates.values()), default=0.5)
+        for idx, _ in bm25_hits:
+            candidates.setdefault(
+                lexical.ids[idx], (lexical.documents[idx], lexical.metadatas[idx], default_distance)
+            )
+
+        fused = reciprocal_rank_fusion([vector_ids, lexical_ids], k=settings.rrf_k)[:n_results]
+        return {
+            "ids": [[doc_id for doc_id, _ in fused]],
+            "documents": [[candidates[doc_id][0] for doc_id, _ in fused]],
+            "metadatas": [[candidates[doc_id][1] for doc_id, _ in fused]],
+            "distances": [[candidates[doc_id][2] for doc_id, _ in fused]]
+        }
 
     def _process_results(self, results, doc_type: str, context_documents: list):
         """Process ChromaDB results and add to context documents."""
         if not results or not results.get('documents') or not results['documents'][0]:
             return
         
+        ids = results['ids'][0] if results.get('ids') else []
         for i, doc_text in enumerate(results['documents'][0]):
-            print(f"[DEBUG] Processing {doc_type} doc {i}: '{doc_text[:100]}...'", flush=True)
             metadata = results['metadatas'][0][i] if results.get('metadatas') else {}
             
             # Build citation based on document type
@@ -161,6 +770,7 @@ class RAGService:
             relevance = max(0, 1 - distance)
             
             context_documents.append({
+                "id": ids[i] if i < len(ids) else None,
                 "type": doc_type,
                 "citation": citation,
                 "citation": citation,
@@ -170,23 +780,66 @@ class RAGService:
                 "metadata": metadata
             })
 
+    async def _get_documents(self, name: str, ids: list[str]) -> dict:
+        """Fetch documents by ID as {id: {"text", "metadata"}}."""
+        def fetch():
+            coll = self._get_collection(name)
+            if coll is None or not ids:
+                return {}
+            page = coll.get(ids=ids, include=["documents", "metadatas"])
+            return {
+                doc_id: {"text": doc, "metadata": metadata}
+                for doc_id, doc, metadata in zip(page["ids"], page["documents"], page["metadatas"])
+            }
+
+        loop = asyncio.get_running_loop()
+        with stage("retrieve"):
+            return await loop.run_in_executor(self._executor, fetch)
+
+    @staticmethod
+    def _mapped_comparison(entry: dict, documents: dict) -> Optional[dict]:
+        ipc_data = documents.get(entry["ipc_id"])
+        bns_data = documents.get(entry["bns_id"])
+        if not ipc_data or not bns_data:
+            return None
+        return {
+            "ipc": ipc_data,
+            "bns": bns_data,
+            "mapping": {
+                "ipc_section": entry["ipc_section"],
+                "bns_section": entry["bns_section"],
+                "method": entry["method"],
+                "score": entry["score"],
+                # Only pairs stated in the source material are authoritative; the rest are nearest neighbours
+                "approximate": entry["method"] != "explicit"
+            },
+            "differences": []
+        }
+
     async def compare_sections(self, ipc_section: str) -> dict:
         """
         Compare IPC section with its BNS equivalent.
-        Uses both the statutes collection and the mapping collection.
+        Served from the precomputed mapping table when the section is in it,
+        otherwise from the statutes and mapping collections by vector search.
+        Table pairs inferred from embedding similarity are flagged mapping.approximate.
         """
-        query_embedding = self.embedding_service.get_embedding(f"IPC Section {ipc_section}")
+        entry = self.section_mapping.lookup(ipc_section)
+        if entry:
+            documents = await self._get_documents("statutes_english", [entry["ipc_id"], entry["bns_id"]])
+            comparison = self._mapped_comparison(entry, documents)
+            if comparison:
+                return comparison
+
+        query_embedding = await self._embed(f"IPC Section {ipc_section}")
         
-        # Search in IPC-BNS mapping collection for direct comparison
-        mapping_coll = self._get_collection("ipc_bns_mapping")
+        # Search the mapping collection and IPC statutes concurrently
+        mapping_results, ipc_results = await asyncio.gather(
+            self._query_collection("ipc_bns_mapping", query_embedding, 2, where={"type": "mapping"}),
+            self._query_collection("statutes_english", query_embedding, 1, where={"statute_type": "IPC"})
+        )
         mapping_data = None
         
-        if mapping_coll:
-            mapping_results = mapping_coll.query(
-                query_embeddings=[query_embedding],
-                n_results=2,
-                where={"type": "mapping"}
-            )
+        if mapping_results:
             if mapping_results['documents'] and mapping_results['documents'][0]:
                 mapping_data = {
                     "text": mapping_results['documents'][0][0],
@@ -194,18 +847,10 @@ class RAGService:
                 }
         
         # Find IPC section in English statutes
-        statute_coll = self._get_collection("statutes_english")
         ipc_data = None
         bns_data = None
         
-        if statute_coll:
-            # Search for IPC
-            ipc_results = statute_coll.query(
-                query_embeddings=[query_embedding],
-                n_results=1,
-                where={"statute_type": "IPC"}
-            )
-            
+        if ipc_results:
             if ipc_results['documents'] and ipc_results['documents'][0]:
                 ipc_data = {
                     "text": ipc_results['documents'][0][0],
@@ -214,14 +859,12 @@ class RAGService:
             
             # Search for similar BNS section using IPC text
             if ipc_data:
-                ipc_embedding = self.embedding_service.get_embedding(ipc_data['text'][:500])
-                bns_results = statute_coll.query(
-                    query_embeddings=[ipc_embedding],
-                    n_results=1,
-                    where={"statute_type": "BNS"}
+                ipc_embedding = await self._embed(ipc_data['text'][:500])
+                bns_results = await self._query_collection(
+                    "statutes_english", ipc_embedding, 1, where={"statute_type": "BNS"}
                 )
                 
-                if bns_results['documents'] and bns_results['documents'][0]:
+                if bns_results and bns_results['documents'] and bns_results['documents'][0]:
                     bns_data = {
                         "text": bns_results['documents'][0][0],
                         "metadata": bns_results['metadatas'][0][0]
@@ -234,20 +877,34 @@ class RAGService:
             "differences": []  # Can be populated by LLM comparison if needed
         }
 
+    async def compare_sections_bulk(self, ipc_sections: list[str]) -> dict:
+        """Compare many sections: one document fetch for all mapped sections, vector search for the rest."""
+        entries = {section: self.section_mapping.lookup(section) for section in ipc_sections}
+        ids = sorted({
+            doc_id for entry in entries.values() if entry
+            for doc_id in (entry["ipc_id"], entry["bns_id"])
+        })
+        documents = await self._get_documents("statutes_english", ids)
+
+        results = {}
+        for section, entry in entries.items():
+            results[section] = self._mapped_comparison(entry, documents) if entry else None
+
+        unmapped = [section for section, result in results.items() if result is None]
+        fallbacks = await asyncio.gather(*(self.compare_sections(section) for section in unmapped))
+        results.update(zip(unmapped, fallbacks))
+        return results
+
     async def get_ipc_bns_explanation(self, section_query: str) -> dict:
         """Get detailed explanation of IPC-BNS differences."""
-        query_embedding = self.embedding_service.get_embedding(section_query)
-        
-        mapping_coll = self._get_collection("ipc_bns_mapping")
-        if not mapping_coll:
-            return {"error": "Mapping collection not available"}
+        query_embedding = await self._embed(section_query)
         
         # Get explanation content
-        results = mapping_coll.query(
-            query_embeddings=[query_embedding],
-            n_results=3,
-            where={"type": "explanation"}
+        results = await self._query_collection(
+            "ipc_bns_mapping", query_embedding, 3, where={"type": "explanation"}
         )
+        if results is None:
+            return {"error": "Mapping collection not available"}
         
         explanations = []
         if results['documents'] and results['documents'][0]:
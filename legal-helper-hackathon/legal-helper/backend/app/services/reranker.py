@@ -0,0 +1,71 @@
+"""
+Cross-encoder re-ranking of retrieved candidates.
+A small CPU cross-encoder scores (query, passage) pairs in one batched call;
+an adaptive cut-off then keeps only the documents that are actually relevant
+instead of a fixed number per collection.
+A caller's deadline cannot stop a batch already running on the executor, so
+the number of batches queued or running is bounded: past it, ascore raises
+RerankerBusy and the caller keeps the vector order instead of queueing.
+"""
+import asyncio
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RerankerBusy(Exception):
+    """Raised when max_pending batches are already queued or running."""
+
+
+class RerankerService:
+    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2", max_length: int = 512,
+                 max_pending: int = 1):
+        # Imported here so torch is only loaded when re-ranking is enabled
+        from sentence_transformers import CrossEncoder
+
+        self.model = CrossEncoder(model_name, max_length=max_length, device="cpu")
+        # One worker: a batch already uses every core torch gives it
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        """Relevance probabilities in [0, 1] (sigmoid of the cross-encoder logits)."""
+        if not passages:
+            return []
+        logits = self.model.predict([(query, passage) for passage in passages], batch_size=32)
+        return [1.0 / (1.0 + math.exp(-float(logit))) for logit in logits]
+
+    async def ascore(self, query: str, passages: list[str]) -> list[float]:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise RerankerBusy()
+            self._pending += 1
+        # Released when the batch itself finishes (or is cancelled before starting),
+        # not when a timed-out caller stops waiting for it
+        future = self._executor.submit(self.score, query, passages)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+
+def adaptive_cutoff(scores: list[float], min_score: float, relative: float,
+                    min_keep: int, max_keep: int) -> list[int]:
+    """
+    Indices to keep, best first: everything scoring at least min_score and at
+    least `relative` times the best score, bounded to [min_keep, max_keep].
+    """
+    order = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+    if not order:
+        return []
+    floor = max(min_score, scores[order[0]] * relative)
+    keep = [i for i in order if scores[i] >= floor][:max_keep]
+    if len(keep) < min_keep:
+        keep = order[:min_keep]
+    return keep
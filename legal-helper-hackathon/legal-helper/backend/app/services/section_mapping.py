@@ -0,0 +1,146 @@
+"""
+Precomputed IPC <-> BNS section correspondence.
+Built offline from explicit references (the comparison PDF chunks in
+ipc_bns_mapping and the sample dataset's maps_to_bns) and, for the remaining
+sections, from similarity of the stored statute embeddings. At query time
+/api/compare becomes a dictionary lookup plus a fetch by document ID. Each
+entry records its method: "explicit" pairs are authoritative, "embedding"
+pairs are only the most similar BNS section and are returned as approximate.
+"""
+import json
+import logging
+import os
+import re
+from typing import Optional
+
+import numpy as np
+
+from app.utils.text_processing import normalize_section_number
+
+logger = logging.getLogger(__name__)
+
+MAPPING_FILE = "ipc_bns_map.json"
+
+_PAIR_RE = re.compile(
+    r'IPC\s*(?:Section|Sec\.?|S\.)?\s*(\d+[A-Z]{0,2})\W{1,20}?BNS\s*(?:Section|Sec\.?|S\.)?\s*(\d+[A-Z]{0,2})',
+    re.IGNORECASE
+)
+
+
+def mapping_path(vectorstore_path: str) -> str:
+    return os.path.join(vectorstore_path, MAPPING_FILE)
+
+
+class SectionMappingIndex:
+    def __init__(self, ipc_to_bns: dict = None, bns_to_ipc: dict = None):
+        self.ipc_to_bns = ipc_to_bns or {}
+        self.bns_to_ipc = bns_to_ipc or {}
+
+    def __len__(self) -> int:
+        return len(self.ipc_to_bns)
+
+    def lookup(self, ipc_section: str) -> Optional[dict]:
+        return self.ipc_to_bns.get(normalize_section_number(ipc_section))
+
+    def lookup_bns(self, bns_section: str) -> Optional[dict]:
+        return self.bns_to_ipc.get(normalize_section_number(bns_section))
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"ipc_to_bns": self.ipc_to_bns, "bns_to_ipc": self.bns_to_ipc}, f, indent=1)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SectionMappingIndex":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"No IPC-BNS mapping table at {path}; /compare will use vector search")
+            return cls()
+        return cls(data.get("ipc_to_bns", {}), data.get("bns_to_ipc", {}))
+
+
+def _statutes_by_section(collection, statute_type: str) -> dict:
+    """section number -> (doc id, embedding) for one statute type, first chunk wins."""
+    page = collection.get(where={"statute_type": statute_type}, include=["metadatas", "embeddings"])
+    sections = {}
+    for doc_id, metadata, embedding in zip(page["ids"], page["metadatas"], page["embeddings"]):
+        number = normalize_section_number(metadata.get("section", ""))
+        if number and number not in sections:
+            sections[number] = (doc_id, embedding)
+    return sections
+
+
+def _explicit_pairs(client, sample_data_path: str = None) -> dict:
+    """IPC -> BNS pairs stated outright in the source material."""
+    pairs = {}
+    try:
+        mapping_docs = client.get_collection("ipc_bns_mapping").get(include=["documents"])["documents"]
+    except Exception:
+        mapping_docs = []
+    for doc in mapping_docs:
+        for ipc, bns in _PAIR_RE.findall(doc):
+            pairs.setdefault(normalize_section_number(ipc), normalize_section_number(bns))
+
+    if sample_data_path and os.path.exists(sample_data_path):
+        with open(sample_data_path, "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                ipc = item.get("full_reference", "")
+                bns = item.get("maps_to_bns", "")
+                if ipc.upper().startswith("IPC") and bns:
+                    pairs[normalize_section_number(ipc)] = normalize_section_number(bns)
+    return pairs
+
+
+def build_section_mapping(client, vectorstore_path: str, sample_data_path: str = None,
+                          min_score: float = 0.55) -> SectionMappingIndex:
+    """Compute the full correspondence table and write it next to the vector store."""
+    statutes = client.get_collection("statutes_english")
+    ipc = _statutes_by_section(statutes, "IPC")
+    bns = _statutes_by_section(statutes, "BNS")
+    explicit = _explicit_pairs(client, sample_data_path)
+
+    ipc_to_bns = {}
+    if ipc and bns:
+        ipc_keys, bns_keys = list(ipc), list(bns)
+        ipc_matrix = np.asarray([ipc[k][1] for k in ipc_keys], dtype=np.float32)
+        bns_matrix = np.asarray([bns[k][1] for k in bns_keys], dtype=np.float32)
+        ipc_matrix /= np.linalg.norm(ipc_matrix, axis=1, keepdims=True) + 1e-12
+        bns_matrix /= np.linalg.norm(bns_matrix, axis=1, keepdims=True) + 1e-12
+        similarity = ipc_matrix @ bns_matrix.T
+        bns_position = {k: j for j, k in enumerate(bns_keys)}
+
+        for i, ipc_section in enumerate(ipc_keys):
+            target = explicit.get(ipc_section)
+            if target in bns_position:
+                j, method = bns_position[target], "explicit"
+            else:
+                j, method = int(np.argmax(similarity[i])), "embedding"
+                if similarity[i, j] < min_score:
+                    continue
+            bns_section = bns_keys[j]
+            ipc_to_bns[ipc_section] = {
+                "ipc_section": ipc_section,
+                "bns_section": bns_section,
+                "ipc_id": ipc[ipc_section][0],
+                "bns_id": bns[bns_section][0],
+                "method": method,
+                "score": round(float(similarity[i, j]), 4)
+            }
+
+    # Reverse table keeps the strongest IPC match for each BNS section
+    bns_to_ipc = {}
+    for entry in ipc_to_bns.values():
+        current = bns_to_ipc.get(entry["bns_section"])
+        rank = (entry["method"] == "explicit", entry["score"])
+        if current is None or rank > (current["method"] == "explicit", current["score"]):
+            bns_to_ipc[entry["bns_section"]] = entry
+
+    index = SectionMappingIndex(ipc_to_bns, bns_to_ipc)
+    index.save(mapping_path(vectorstore_path))
+    explicit_count = sum(1 for e in ipc_to_bns.values() if e["method"] == "explicit")
+    logger.info(f"  IPC-BNS mapping: {len(ipc_to_bns)} of {len(ipc)} IPC sections mapped "
+                f"({explicit_count} explicit)")
+    return index
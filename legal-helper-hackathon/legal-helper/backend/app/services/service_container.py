@@ -0,0 +1,127 @@
+"""
+Process-wide service container.
+Builds the embedding model, Chroma client, LLM client and RAG service once per
+worker and warms them up before the worker reports ready.
+"""
+import asyncio
+import logging
+import os
+import time
+
+from fastapi import HTTPException, Request
+
+from app.config import get_settings
+from app.services.embedding_service import EmbeddingService, create_embedding_service
+from app.services.llm_service import LLMService
+from app.services.rag_service import RAGService
+from app.services.job_store import JobStore
+from app.services.summarization_jobs import SummarizationJobManager
+from app.services.summarizer import MapReduceSummarizer
+from app.utils.pdf_text import PageTextCache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ServiceContainer:
+    def __init__(self):
+        self.embedding_service: EmbeddingService = None
+        self.llm_service: LLMService = None
+        self.reranker = None
+        self.rag_service: RAGService = None
+        self.job_manager: SummarizationJobManager = None
+        self.ready = False
+        self.error: str = None
+        self.warmup_time_ms: float = None
+
+    def start(self):
+        """
+        Load the model, open the vector store and warm the embedding path. Blocking;
+        the app calls astart, which also starts the job workers before reporting ready.
+        """
+        start_time = time.time()
+        try:
+            logger.info("Loading embedding model: %s (%s backend)", settings.embedding_model,
+                        settings.embedding_backend)
+            self.embedding_service = create_embedding_service(
+                model_name=settings.embedding_model,
+                max_workers=settings.embedding_workers
+            )
+            self.llm_service = LLMService()
+            self.rag_service = RAGService(
+                embedding_service=self.embedding_service,
+                llm_service=self.llm_service
+            )
+            # Loaded by the RAG service when rerank_enabled (None if the model is unavailable)
+            self.reranker = self.rag_service.reranker
+            cache_dir = os.path.join(BASE_DIR, settings.cache_dir)
+            job_store = JobStore(os.path.join(cache_dir, "jobs.sqlite3"))
+            self.job_manager = SummarizationJobManager(
+                summarizer=MapReduceSummarizer(
+                    self.llm_service,
+                    segment_cache=job_store,
+                    segment_tokens=settings.summary_segment_tokens,
+                    reduce_tokens=settings.summary_reduce_tokens,
+                    concurrency=settings.summary_map_concurrency
+                ),
+                job_store=job_store,
+                upload_dir=os.path.join(cache_dir, "uploads"),
+                page_cache=PageTextCache(os.path.join(cache_dir, "pdf_pages")),
+                page_content_dir=os.path.join(cache_dir, "pdf_page_text"),
+                max_upload_bytes=settings.max_upload_mb * (1 << 20),
+                workers=settings.summarize_workers,
+                extract_workers=settings.summarize_extract_workers,
+                lease_s=settings.summarize_job_lease_s
+            )
+
+            # First encode pays for lazy torch/ONNX Runtime and tokenizer initialisation
+            self.embedding_service.get_embedding("warmup query for legal helper")
+            if self.reranker:
+                self.reranker.score("warmup query", ["warmup passage"])
+
+            self.warmup_time_ms = (time.time() - start_time) * 1000
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Service warmup failed: {e}")
+            raise
+
+    async def astart(self):
+        """start() off the event loop, then the job workers on it; ready only once both are running."""
+        await asyncio.to_thread(self.start)
+        try:
+            # Job workers live on the serving loop; this also picks up jobs interrupted by a restart
+            await self.job_manager.start()
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Summarization workers failed to start: {e}")
+            raise
+        self.ready = True
+        logger.info("Services ready in %.0f ms", self.warmup_time_ms)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup_time_ms": self.warmup_time_ms,
+            "error": self.error
+        }
+
+
+def get_container(request: Request) -> ServiceContainer:
+    container = getattr(request.app.state, "services", None)
+    if container is None or not container.ready:
+        raise HTTPException(status_code=503, detail="Service is warming up")
+    return container
+
+
+def get_rag_service(request: Request) -> RAGService:
+    return get_container(request).rag_service
+
+
+def get_llm_service(request: Request) -> LLMService:
+    return get_container(request).llm_service
+
+
+def get_job_manager(request: Request) -> SummarizationJobManager:
+    return get_container(request).job_manager
@@ -0,0 +1,258 @@
+"""
+Background PDF summarization.
+Uploads are written to disk and hashed, a job row is created and its ID is
+returned immediately. Worker tasks extract page text in a process pool
+(reporting progress per shard) and run map-reduce summarization over every
+page; results are stored by file content hash, so re-uploading a PDF that was already summarized is instant.
+With several uvicorn workers each one queues job IDs locally, but a job only
+runs in the worker that claims it in the shared job store. Each upload has its
+own file, so a finished job never deletes an input another job is reading.
+Job-store and file operations run in threads, off the event loop.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from app.services.job_store import JobStore, QUEUED, RUNNING, DONE, FAILED
+from app.services.summarizer import MapReduceSummarizer
+from app.utils.pdf_text import PageTextCache, extract_page_range, pdf_page_count
+
+logger = logging.getLogger(__name__)
+
+KIND = "summarize"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class InvalidUpload(Exception):
+    pass
+
+_READ_CHUNK = 1 << 20
+_SHARD_PAGES = 8
+
+# Share of the progress bar given to extraction; the LLM call takes the rest
+_EXTRACT_PROGRESS = 0.6
+
+# A waiter re-reads the job this often, in case another worker ran it
+_WAIT_POLL_S = 1.0
+
+
+class SummarizationJobManager:
+    def __init__(self, summarizer: MapReduceSummarizer, job_store: JobStore, upload_dir: str,
+                 page_cache: PageTextCache, page_content_dir: str = None, max_upload_bytes: int = None,
+                 workers: int = 2, extract_workers: int = 2, lease_s: float = 120.0):
+        self.summarizer = summarizer
+        self.job_store = job_store
+        self.upload_dir = upload_dir
+        self.page_cache = page_cache
+        self.page_content_dir = page_content_dir
+        self.max_upload_bytes = max_upload_bytes
+        self.workers = workers
+        # Running jobs are heartbeaten every lease_s / 4; past lease_s without one they are re-queued
+        self.lease_s = lease_s
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        os.makedirs(upload_dir, exist_ok=True)
+
+        # PDF parsing is CPU-bound and holds the GIL; keep it out of the serving process
+        self._pool = ProcessPoolExecutor(max_workers=extract_workers)
+        self._queue: asyncio.Queue = None
+        self._tasks = []
+        self._events = {}
+        self._local = set()
+
+    async def start(self):
+        """Start worker tasks on the running loop and pick up jobs interrupted by a restart."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._maintain()))
+        logger.info(f"Summarization workers started ({self.workers}, id {self.worker_id})")
+
+    async def _maintain(self):
+        """
+        Heartbeat the jobs this process is running, re-queue jobs whose owner died,
+        and queue locally every job still waiting (claiming decides who runs it).
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.job_store.heartbeat, self.worker_id)
+                requeued = await asyncio.to_thread(self.job_store.requeue_stale, KIND, self.lease_s)
+                if requeued:
+                    logger.info(f"Re-queued {requeued} summarization job(s) abandoned by a stopped worker")
+                for job in await asyncio.to_thread(self.job_store.queued, KIND):
+                    if job["input_path"] and await asyncio.to_thread(os.path.exists, job["input_path"]):
+                        self._enqueue(job["id"])
+                    else:
+                        await asyncio.to_thread(
+                            self.job_store.update, job["id"], status=FAILED, error="Upload was lost before processing"
+                        )
+            except Exception as e:
+                logger.error(f"Summarization job maintenance failed: {e}")
+            await asyncio.sleep(self.lease_s / 4)
+
+    def _enqueue(self, job_id: str):
+        if job_id not in self._local:
+            self._local.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def submit(self, upload, filename: str) -> dict:
+        """
+        Spool an upload (any object with async read(n)) to disk in fixed-size chunks
+        and queue it; memory use does not grow with the file. Returns the job row.
+        Raises UploadTooLarge past max_upload_bytes and InvalidUpload for non-PDF content.
+        """
+        await self.start()
+        # Starlette reports the spooled size up front; reject before copying anything
+        size_hint = getattr(upload, "size", None)
+        if self.max_upload_bytes and size_hint and size_hint > self.max_upload_bytes:
+            raise UploadTooLarge(f"File exceeds the {self.max_upload_bytes // (1 << 20)} MB limit")
+        tmp_path = os.path.join(self.upload_dir, f"{uuid.uuid4().hex}.part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                while True:
+                    data = await upload.read(_READ_CHUNK)
+                    if not data:
+                        break
+                    if size == 0 and not data.startswith(b"%PDF"):
+                        raise InvalidUpload("File is not a PDF")
+                    size += len(data)
+                    if self.max_upload_bytes and size > self.max_upload_bytes:
+                        raise UploadTooLarge(f"File exceeds the {self.max_upload_bytes // (1 << 20)} MB limit")
+                    digest.update(data)
+                    f.write(data)
+        except Exception:
+            await asyncio.to_thread(os.remove, tmp_path)
+            raise
+        if size == 0:
+            await asyncio.to_thread(os.remove, tmp_path)
+            raise InvalidUpload("File is empty")
+        content_hash = digest.hexdigest()
+
+        if await asyncio.to_thread(self.job_store.get_result, KIND, content_hash) is not None:
+            await asyncio.to_thread(os.remove, tmp_path)
+            job_id = await asyncio.to_thread(
+                self.job_store.create, KIND, content_hash, filename, status=DONE, cached=True
+            )
+            return await self.get(job_id)
+
+        # One file per upload: identical uploads in flight never share (or delete) each other's input
+        input_path = tmp_path[:-len(".part")] + ".pdf"
+        await asyncio.to_thread(os.replace, tmp_path, input_path)
+        job_id = await asyncio.to_thread(
+            self.job_store.create, KIND, content_hash, filename, input_path=input_path
+        )
+        self._enqueue(job_id)
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> dict:
+        return await asyncio.to_thread(self.job_store.get, job_id)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def wait(self, job_id: str) -> dict:
+        """
+        Block until the job finishes (used by the synchronous /summarize endpoint).
+        Woken by this process's workers, and polls in case another worker claimed the job.
+        """
+        event = self._events.setdefault(job_id, asyncio.Event())
+        try:
+            while True:
+                event.clear()
+                job = await self.get(job_id)
+                if job is None or job["status"] in (DONE, FAILED):
+                    return job
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=_WAIT_POLL_S)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._events.pop(job_id, None)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._local.discard(job_id)
+            try:
+                # Every worker process may have queued this job; only the one that claims it runs it
+                if await asyncio.to_thread(self.job_store.claim, job_id, self.worker_id):
+                    await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Summarization job {job_id} failed: {e}")
+                await asyncio.to_thread(self.job_store.update, job_id, status=FAILED, error=str(e))
+                # A failed job is not retried, so its upload is not needed either
+                job = await self.get(job_id)
+                if job and job["input_path"]:
+                    await asyncio.to_thread(self._discard_upload, job["input_path"])
+            finally:
+                event = self._events.get(job_id)
+                if event:
+                    event.set()
+                self._queue.task_done()
+
+    async def _update(self, job_id: str, **fields):
+        await asyncio.to_thread(self.job_store.update, job_id, **fields)
+
+    async def _run(self, job_id: str):
+        job = await self.get(job_id)
+        content_hash, input_path = job["content_hash"], job["input_path"]
+
+        # An identical upload may have finished while this one was queued
+        if await asyncio.to_thread(self.job_store.get_result, KIND, content_hash) is None:
+            await self._update(job_id, stage="extracting", progress=0.0)
+            pages = await self._extract(job_id, content_hash, input_path)
+
+            await self._update(job_id, stage="summarizing", progress=_EXTRACT_PROGRESS)
+            result = await self.summarizer.summarize(
+                pages,
+                on_progress=lambda fraction: self._update(
+                    job_id, progress=round(_EXTRACT_PROGRESS + (1 - _EXTRACT_PROGRESS) * fraction, 3)
+                )
+            )
+            await asyncio.to_thread(self.job_store.put_result, KIND, content_hash, result)
+        else:
+            await self._update(job_id, cached=1)
+
+        await self._update(job_id, status=DONE, stage=None, progress=1.0)
+        await asyncio.to_thread(self._discard_upload, input_path)
+
+    async def _extract(self, job_id: str, content_hash: str, input_path: str) -> list[str]:
+        pages = await asyncio.to_thread(self.page_cache.get, content_hash)
+        if pages is not None:
+            return pages
+
+        loop = asyncio.get_running_loop()
+        page_count = await loop.run_in_executor(self._pool, pdf_page_count, input_path)
+        shards = [(start, min(start + _SHARD_PAGES, page_count)) for start in range(0, page_count, _SHARD_PAGES)]
+
+        async def run_shard(start: int, end: int):
+            return start, await loop.run_in_executor(
+                self._pool, extract_page_range, input_path, start, end, self.page_content_dir
+            )
+
+        by_start = {}
+        for completed, next_done in enumerate(asyncio.as_completed([run_shard(*shard) for shard in shards]), start=1):
+            start, shard_pages = await next_done
+            by_start[start] = shard_pages
+            await self._update(job_id, progress=round(_EXTRACT_PROGRESS * completed / len(shards), 3))
+        pages = [page for start, _ in shards for page in by_start[start]]
+
+        await asyncio.to_thread(self.page_cache.put, content_hash, pages)
+        return pages
+
+    @staticmethod
+    def _discard_upload(input_path: str):
+        """Delete a finished job's upload (no other job reads it)."""
+        try:
+            os.remove(input_path)
+        except OSError:
+            pass
@@ -0,0 +1,167 @@
+"""
+Hierarchical (map-reduce) summarization for long documents.
+Page text is split into token-bounded segments, each segment is summarized
+concurrently (bounded by a semaphore), and the partial summaries are reduced,
+in groups if they do not fit one prompt, into the final summary. Segment
+summaries are cached by segment text hash, so pages that reappear (re-uploads,
+documents sharing an annexure) are not sent to the LLM again.
+"""
+import asyncio
+import hashlib
+import logging
+from typing import Awaitable, Callable, Optional
+
+from app.services.context_packer import estimate_tokens
+from app.services.job_store import JobStore
+from app.services.llm_service import LLMService
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_KIND = "summary_segment"
+
+# Bump when the segment prompt changes so stale cached summaries are not reused
+_PROMPT_VERSION = "1"
+
+# Citations listed in the final response; segments repeat the same ones often
+_MAX_CITATIONS = 50
+
+
+def split_segments(pages: list[str], max_tokens: int) -> list[str]:
+    """Consecutive page text grouped into segments of at most max_tokens (pages split by line if needed)."""
+    pieces = []
+    for page in pages:
+        if estimate_tokens(page) <= max_tokens:
+            pieces.append(page)
+            continue
+        current = ""
+        for line in page.splitlines():
+            if current and estimate_tokens(current) + estimate_tokens(line) > max_tokens:
+                pieces.append(current)
+                current = ""
+            current = f"{current}\n{line}" if current else line
+            while estimate_tokens(current) > max_tokens:
+                # A single enormous line: cut by characters proportionally
+                cut = max(1, int(len(current) * max_tokens / estimate_tokens(current)))
+                pieces.append(current[:cut])
+                current = current[cut:]
+        if current:
+            pieces.append(current)
+
+    segments, current, used = [], [], 0
+    for piece in pieces:
+        cost = estimate_tokens(piece)
+        if current and used + cost > max_tokens:
+            segments.append("\n".join(current))
+            current, used = [], 0
+        current.append(piece)
+        used += cost
+    if current:
+        segments.append("\n".join(current))
+    return [segment for segment in segments if segment.strip()]
+
+
+def _merge_citations(partials: list[dict]) -> list[str]:
+    seen, citations = set(), []
+    for partial in partials:
+        for citation in partial.get("citations", []):
+            key = " ".join(str(citation).lower().split())
+            if key and key not in seen:
+                seen.add(key)
+                citations.append(str(citation))
+    return citations[:_MAX_CITATIONS]
+
+
+class MapReduceSummarizer:
+    def __init__(self, llm_service: LLMService, segment_cache: JobStore,
+                 segment_tokens: int = 3000, reduce_tokens: int = 6000, concurrency: int = 4):
+        self.llm_service = llm_service
+        self.segment_cache = segment_cache
+        self.segment_tokens = segment_tokens
+        self.reduce_tokens = reduce_tokens
+        self.concurrency = concurrency
+
+    async def summarize(self, pages: list[str], on_progress: Optional[Callable[[float], Awaitable]] = None) -> dict:
+        """Return {summary, key_points, citations} covering every page (on_progress is awaited)."""
+        segments = split_segments(pages, self.segment_tokens)
+        if not segments:
+            return {"summary": "", "key_points": [], "citations": []}
+        if len(segments) == 1:
+            result = await self._summarize_segment(segments[0], None)
+            if on_progress:
+                await on_progress(1.0)
+            return result
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+
+        async def map_segment(i: int, segment: str) -> dict:
+            nonlocal done
+            async with semaphore:
+                partial = await self._summarize_segment(segment, (i + 1, len(segments)))
+            done += 1
+            if on_progress:
+                # The reduce step is counted as one more unit of work
+                await on_progress(done / (len(segments) + 1))
+            return partial
+
+        partials = await asyncio.gather(*(map_segment(i, s) for i, s in enumerate(segments)))
+        logger.info(f"Summarized {len(segments)} segments, reducing")
+
+        result = await self._reduce(list(partials))
+        result["citations"] = _merge_citations(partials)
+        if on_progress:
+            await on_progress(1.0)
+        return result
+
+    async def _summarize_segment(self, segment: str, part: Optional[tuple]) -> dict:
+        key = hashlib.sha256(f"{_PROMPT_VERSION}\n{segment}".encode("utf-8")).hexdigest()
+        cached = await asyncio.to_thread(self.segment_cache.get_result, SEGMENT_KIND, key)
+        if cached is not None:
+            return cached
+
+        result = await self.llm_service.summarize_document(segment, part=part)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        raw = self.llm_service.parse_summary(result)
+        parsed = self._normalize(raw)
+        # A malformed response is used once but not cached, so the next run asks again
+        if not raw.get("unparsed"):
+            await asyncio.to_thread(self.segment_cache.put_result, SEGMENT_KIND, key, parsed)
+        return parsed
+
+    async def _reduce(self, partials: list[dict]) -> dict:
+        """Reduce partial summaries, in groups that fit reduce_tokens, until one remains."""
+        while True:
+            groups, current, used = [], [], 0
+            for partial in partials:
+                cost = estimate_tokens(partial["summary"]) + estimate_tokens(" ".join(partial["key_points"]))
+                if current and used + cost > self.reduce_tokens:
+                    groups.append(current)
+                    current, used = [], 0
+                current.append(partial)
+                used += cost
+            groups.append(current)
+
+            reduced = await asyncio.gather(*(self._reduce_group(group) for group in groups))
+            if len(reduced) == 1:
+                return reduced[0]
+            if len(reduced) == len(partials):
+                # Every partial is too large to pair up; combine them as-is rather than loop
+                return await self._reduce_group(reduced)
+            partials = list(reduced)
+
+    async def _reduce_group(self, group: list[dict]) -> dict:
+        if len(group) == 1:
+            return dict(group[0])
+        result = await self.llm_service.reduce_summaries(group)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        return self._normalize(self.llm_service.parse_summary(result))
+
+    @staticmethod
+    def _normalize(parsed: dict) -> dict:
+        return {
+            "summary": str(parsed.get("summary", "")),
+            "key_points": [str(p) for p in parsed.get("key_points", []) or []],
+            "citations": [str(c) for c in parsed.get("citations", []) or []]
+        }
@@ -0,0 +1,175 @@
+"""
+Unified bilingual statute index (statute_index="unified").
+statutes_english (IPC/BNS CSV sections) and statutes_hindi (chunks of the Hindi
+PDFs) are copied into one collection embedded with a multilingual model, so a
+query in either language is answered by a single search over both. Every
+document carries its "IPC 302"-style section_key and the IDs of the same
+section in the other language (linked_ids); at query time link_counterparts
+follows those links, so a hit also brings its section in the other language.
+"""
+import logging
+from collections import defaultdict
+from typing import Optional
+
+from app.services.lexical_index import section_key
+
+logger = logging.getLogger(__name__)
+
+UNIFIED_COLLECTION = "statutes_unified"
+SOURCE_COLLECTIONS = ("statutes_english", "statutes_hindi")
+MULTILINGUAL_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+# Hindi sections span several chunks; a handful of links is enough to reach the counterpart
+_MAX_LINKS = 5
+
+
+def _read_all(collection, page_size: int = 1000) -> tuple[list, list, list]:
+    ids, documents, metadatas = [], [], []
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+        if not page["ids"]:
+            break
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        metadatas.extend(page["metadatas"])
+        offset += len(page["ids"])
+    return ids, documents, metadatas
+
+
+def _read_ids(collection, page_size: int = 1000) -> set[str]:
+    ids = set()
+    offset = 0
+    while True:
+        page = collection.get(include=[], limit=page_size, offset=offset)
+        if not page["ids"]:
+            break
+        ids.update(page["ids"])
+        offset += len(page["ids"])
+    return ids
+
+
+def link_sections(ids: list[str], metadatas: list[dict]) -> list[dict]:
+    """Metadata with section_key and linked_ids (same section, other language) added."""
+    by_key = defaultdict(lambda: defaultdict(list))
+    keys = []
+    for doc_id, metadata in zip(ids, metadatas):
+        key = section_key(metadata.get("statute_type", ""), metadata.get("section") or "")
+        keys.append(key)
+        if key:
+            by_key[key][metadata.get("language", "")].append(doc_id)
+
+    linked = []
+    for key, metadata in zip(keys, metadatas):
+        others = [
+            doc_id for language, doc_ids in by_key[key].items()
+            if language != metadata.get("language", "") for doc_id in doc_ids
+        ] if key else []
+        linked.append({
+            **metadata,
+            "section_key": key,
+            "linked_ids": ",".join(others[:_MAX_LINKS])
+        })
+    return linked
+
+
+def link_counterparts(result: Optional[dict], index, n_results: int) -> Optional[dict]:
+    """
+    Chroma-shaped results with each hit followed by its first linked document in
+    the other language (at the hit's distance), unless that section is already
+    present in that language. Linked documents are read from the collection's
+    lexical index; the list is capped at n_results.
+    """
+    if not result or not result.get("ids") or not result["ids"][0] or index is None:
+        return result
+    hits = list(zip(result["ids"][0], result["documents"][0], result["metadatas"][0], result["distances"][0]))
+    covered = {(metadata.get("section_key"), metadata.get("language")) for _, _, metadata, _ in hits}
+    seen = set()
+    expanded = []
+    for doc_id, document, metadata, distance in hits:
+        if doc_id not in seen:
+            seen.add(doc_id)
+            expanded.append((doc_id, document, metadata, distance))
+        for linked_id in filter(None, (metadata.get("linked_ids") or "").split(",")):
+            idx = index.positions.get(linked_id)
+            if idx is None or linked_id in seen:
+                continue
+            linked = index.metadatas[idx]
+            pair = (linked.get("section_key"), linked.get("language"))
+            if pair not in covered:
+                covered.add(pair)
+                seen.add(linked_id)
+                expanded.append((linked_id, index.documents[idx], linked, distance))
+            break
+    expanded = expanded[:n_results]
+    return {
+        "ids": [[hit[0] for hit in expanded]],
+        "documents": [[hit[1] for hit in expanded]],
+        "metadatas": [[hit[2] for hit in expanded]],
+        "distances": [[hit[3] for hit in expanded]]
+    }
+
+
+def build_unified_statutes(client, model_name: str = MULTILINGUAL_MODEL, batch_size: int = 64) -> int:
+    """
+    Rebuild the unified collection from the two statute collections in place:
+    documents are upserted under their source IDs and only IDs that no longer
+    exist are deleted, so a running API keeps searching a complete index. The
+    embedding model is recorded in the collection metadata so the API can
+    refuse to query it with a different one; changing the model recreates it.
+    """
+    # Build-time only; the API imports this module and may serve with the ONNX backend
+    from sentence_transformers import SentenceTransformer
+
+    ids, documents, metadatas = [], [], []
+    for name in SOURCE_COLLECTIONS:
+        try:
+            source = client.get_collection(name)
+        except Exception:
+            logger.warning(f"  {name} not found, leaving it out of {UNIFIED_COLLECTION}")
+            continue
+        source_ids, source_documents, source_metadatas = _read_all(source)
+        ids.extend(source_ids)
+        documents.extend(source_documents)
+        metadatas.extend({**metadata, "source_collection": name} for metadata in source_metadatas)
+    metadatas = link_sections(ids, metadatas)
+
+    collection = client.get_or_create_collection(UNIFIED_COLLECTION, metadata={"embedding_model": model_name})
+    if collection_model(collection) != model_name:
+        # Vectors from two models cannot share an index (and the API refuses it until restarted anyway)
+        logger.warning(f"  {UNIFIED_COLLECTION} was built with {collection_model(collection) or 'an unknown model'}, "
+                       f"recreating it for {model_name}")
+        client.delete_collection(UNIFIED_COLLECTION)
+        collection = client.create_collection(UNIFIED_COLLECTION, metadata={"embedding_model": model_name})
+    existing_ids = _read_ids(collection)
+
+    if ids:
+        logger.info(f"  Embedding {len(ids)} statute documents with {model_name}")
+        model = SentenceTransformer(model_name, device="cpu")
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        # Normalised, so squared-L2 distances behave like the MiniLM collections (2 - 2cos)
+        embeddings = model.encode(documents[start:end], normalize_embeddings=True)
+        collection.upsert(
+            ids=ids[start:end],
+            documents=documents[start:end],
+            metadatas=metadatas[start:end],
+            embeddings=embeddings.tolist()
+        )
+
+    # Only after every current document is in place
+    stale = sorted(existing_ids - set(ids))
+    for start in range(0, len(stale), batch_size):
+        collection.delete(ids=stale[start:start + batch_size])
+    if stale:
+        logger.info(f"  Removed {len(stale)} documents no longer in the statute collections")
+    if not ids:
+        return 0
+    linked = sum(1 for metadata in metadatas if metadata["linked_ids"])
+    logger.info(f"  {UNIFIED_COLLECTION}: {len(ids)} documents, {linked} linked across languages")
+    return len(ids)
+
+
+def collection_model(collection) -> str:
+    """The embedding model a unified collection was built with ("" if unknown)."""
+    return (collection.metadata or {}).get("embedding_model", "")
@@ -0,0 +1,126 @@
+"""
+Caches and content fingerprints shared by the API and the ingestion scripts.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+COLLECTION_VERSIONS_FILE = "collection_versions.json"
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry TTL and hit/miss counters."""
+
+    def __init__(self, maxsize: int = 1024, ttl_s: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_s if self.ttl_s else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def file_sha256(path, block_size: int = 1 << 20) -> str:
+    """Content fingerprint used to key on-disk caches and the ingest manifest."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def bump_collection_version(vectorstore_path: str, *names: str):
+    """
+    Record that collections were rebuilt. Called by the ingestion scripts so
+    running API workers stop serving cached results for those collections.
+    """
+    path = os.path.join(vectorstore_path, COLLECTION_VERSIONS_FILE)
+    versions = _read_versions(path)
+    for name in names:
+        versions[name] = uuid.uuid4().hex[:12]
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(versions, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_versions(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class CollectionVersions:
+    """Reads the version file written by bump_collection_version, re-reading only when it changes."""
+
+    def __init__(self, vectorstore_path: str):
+        self.path = os.path.join(vectorstore_path, COLLECTION_VERSIONS_FILE)
+        self._mtime = None
+        self._versions = {}
+
+    def get(self, name: str) -> str:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return ""
+        if mtime != self._mtime:
+            self._versions = _read_versions(self.path)
+            self._mtime = mtime
+        return self._versions.get(name, "")
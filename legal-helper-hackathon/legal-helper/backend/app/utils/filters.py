@@ -0,0 +1,41 @@
+"""
+Evaluates Chroma-style `where` filters against plain metadata dicts, for the
+retrieval paths that do not go through Chroma.
+"""
+from typing import Any, Optional
+
+_OPERATORS = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a is not None and a > b,
+    "$gte": lambda a, b: a is not None and a >= b,
+    "$lt": lambda a, b: a is not None and a < b,
+    "$lte": lambda a, b: a is not None and a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict):
+        return all(
+            op in _OPERATORS and _OPERATORS[op](value, operand)
+            for op, operand in condition.items()
+        )
+    return value == condition
+
+
+def matches_where(metadata: dict, where: Optional[dict]) -> bool:
+    """True when metadata satisfies a Chroma `where` filter (equality, comparison, $and/$or)."""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif not _matches_condition(metadata.get(key), condition):
+            return False
+    return True
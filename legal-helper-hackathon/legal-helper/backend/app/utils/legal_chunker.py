@@ -0,0 +1,185 @@
+"""
+Structure-aware chunking for statute and regulation PDFs.
+Text is split on section headings ("302. Punishment for murder.—",
+"३०२. हत्या के लिए दंड"), so a chunk never straddles two sections. A section
+that fits in max_chars is one chunk; a longer one is split at sub-section
+("(1)"), clause ("(a)", "(क)"), Explanation and Illustration boundaries (then
+sentences), and every continuation chunk repeats the section title instead of
+a fixed overlap. Each chunk carries section / parent_section metadata and the
+types of every block packed into it.
+"""
+import re
+from typing import Iterable, Iterator
+
+from app.utils.text_processing import clean_legal_text, normalize_section_number
+
+# Part of each source's ingest fingerprint: bump to re-chunk every PDF on the next run
+CHUNKER_VERSION = "legal-v3"
+
+_NUM = r"[0-9०-९]+"
+
+# "302. Title", "Section 302. Title", "धारा ३०२. शीर्षक" - the title must start with a letter
+SECTION_RE = re.compile(rf"^\s*(?:Section\s+|Sec\.\s*|धारा\s+)?({_NUM}[A-Z]{{0,2}})\s*[.।]\s*(?=[^\W\d_])")
+CHAPTER_RE = re.compile(r"^\s*(CHAPTER|अध्याय)\s+([IVXLC]+|[0-9०-९]+)\b", re.IGNORECASE)
+SUB_SECTION_RE = re.compile(rf"^\s*\(({_NUM})\)\s*")
+# "(a)", "(iv)", "(क)" - one letter or a roman numeral, so "(see) " or "(and) " is not a clause;
+# a space must follow so "(a)b" text is not taken as one
+CLAUSE_RE = re.compile(r"^\s*\(([a-z]|[ivxl]+|[क-ह])\)\s+")
+EXPLANATION_RE = re.compile(r"^\s*(Explanations?|स्पष्टीकरण)\s*[0-9०-९]*", re.IGNORECASE)
+ILLUSTRATION_RE = re.compile(r"^\s*(Illustrations?|दृष्टांत|दृष्टान्त)\b", re.IGNORECASE)
+_SENTENCE_RE = re.compile(r"(?<=[.;:।])\s+")
+
+# Short heading-only units (no "Title.—Body" dash) are table-of-contents entries or chapter titles
+_CONTENTS_MAX_CHARS = 200
+_BODY_DASH_RE = re.compile(r"[—–]|:-|\.-")
+_TITLE_MAX_CHARS = 120
+
+
+def _classify(line: str):
+    """(block_type, label) when the line opens a block that may start a new chunk, else None."""
+    match = SUB_SECTION_RE.match(line)
+    if match:
+        return "sub_section", f"({normalize_section_number(match.group(1))})"
+    match = CLAUSE_RE.match(line)
+    if match:
+        return "clause", f"({match.group(1)})"
+    match = EXPLANATION_RE.match(line)
+    if match:
+        return "explanation", "Explanation"
+    if ILLUSTRATION_RE.match(line):
+        return "illustration", "Illustration"
+    return None
+
+
+def _iter_units(pages: Iterable[str]) -> Iterator[dict]:
+    """Group lines into section units: heading, chapter and a list of (type, label, text) blocks."""
+    chapter = ""
+    unit = {"section": "", "title": "", "chapter": chapter, "blocks": [["preamble", "", []]]}
+    for page in pages:
+        for line in page.splitlines():
+            if not line.strip():
+                continue
+            chapter_match = CHAPTER_RE.match(line)
+            if chapter_match:
+                chapter = f"{chapter_match.group(1).upper()} {chapter_match.group(2)}"
+                yield unit
+                unit = {"section": "", "title": "", "chapter": chapter, "blocks": [["chapter", "", [line]]]}
+                continue
+            section_match = SECTION_RE.match(line)
+            if section_match:
+                yield unit
+                unit = {
+                    "section": normalize_section_number(section_match.group(1)),
+                    "title": clean_legal_text(_BODY_DASH_RE.split(line, maxsplit=1)[0])[:_TITLE_MAX_CHARS],
+                    "chapter": chapter,
+                    "blocks": [["section", "", [line]]]
+                }
+                continue
+            kind = _classify(line)
+            if kind:
+                block_type, label = kind
+                if block_type == "sub_section":
+                    unit["sub_section"] = label
+                elif block_type == "clause":
+                    # Clause (a) of sub-section (2) is labelled "(2)(a)"
+                    label = unit.get("sub_section", "") + label
+                else:
+                    unit.pop("sub_section", None)
+                unit["blocks"].append([block_type, label, [line]])
+            else:
+                unit["blocks"][-1][2].append(line)
+    yield unit
+
+
+def _split_long(text: str, max_chars: int) -> list[str]:
+    """Sentence-bounded pieces of at most max_chars (hard cut only for a single huge sentence)."""
+    pieces, current = [], ""
+    for sentence in _SENTENCE_RE.split(text):
+        if len(sentence) > max_chars:
+            # Keep a short lead-in ("299.") attached rather than emitting it alone
+            sentence, current = f"{current} {sentence}".strip(), ""
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > max_chars // 2 else max_chars
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_legal_text(pages: Iterable[str], max_chars: int = 1000) -> Iterator[tuple[str, dict]]:
+    """
+    Yield (chunk_text, metadata) with metadata keys section, parent_section,
+    block_type (preamble, chapter, contents, section, sub_section, clause,
+    explanation, illustration) of the block the chunk starts with, block_types
+    (every block type packed into the chunk, comma-separated, e.g.
+    "section,explanation,illustration") and chapter ("" when unknown).
+    """
+    contents = []
+
+    def flush_contents():
+        if contents:
+            text = " ".join(contents)
+            contents.clear()
+            for piece in _split_long(text, max_chars):
+                yield piece, {
+                    "section": "", "parent_section": "", "block_type": "contents",
+                    "block_types": "contents", "chapter": ""
+                }
+
+    for unit in _iter_units(pages):
+        blocks = [(kind, label, clean_legal_text(" ".join(lines))) for kind, label, lines in unit["blocks"]]
+        blocks = [block for block in blocks if block[2]]
+        if not blocks:
+            continue
+
+        number = unit["section"]
+        if len(blocks) == 1 and blocks[0][0] in ("section", "chapter") \
+                and len(blocks[0][2]) < _CONTENTS_MAX_CHARS and not _BODY_DASH_RE.search(blocks[0][2]):
+            contents.append(blocks[0][2])
+            continue
+        yield from flush_contents()
+
+        # Pack blocks greedily; a new chunk starts only at a block boundary.
+        # Room is left for the title that continuation chunks repeat.
+        total = sum(len(text) + 1 for _, _, text in blocks)
+        budget = max_chars if total <= max_chars else max(max_chars - len(unit["title"]) - 3, max_chars // 2)
+        chunk_texts, current, current_head, current_kinds = [], "", None, []
+        for kind, label, text in blocks:
+            for piece in _split_long(text, budget):
+                if current and len(current) + 1 + len(piece) > budget:
+                    chunk_texts.append((current_head, current_kinds, current))
+                    current = ""
+                if not current:
+                    current_head, current_kinds = (kind, label), []
+                if kind not in current_kinds:
+                    current_kinds.append(kind)
+                current = f"{current} {piece}".strip()
+        if current:
+            chunk_texts.append((current_head, current_kinds, current))
+
+        for i, ((kind, label), kinds, text) in enumerate(chunk_texts):
+            if i > 0 and unit["title"] and not text.startswith(unit["title"]):
+                # Continuation chunks carry the section title so they stay self-describing
+                text = f"{unit['title']} … {text}"
+            if not number or kind == "section":
+                section = number
+            elif kind in ("sub_section", "clause"):
+                section = f"{number}{label}"
+            else:
+                section = f"{number} {label}".strip()
+            yield text, {
+                "section": section,
+                "parent_section": number,
+                "block_type": kind,
+                "block_types": ",".join(kinds),
+                "chapter": unit["chapter"]
+            }
+
+    yield from flush_contents()
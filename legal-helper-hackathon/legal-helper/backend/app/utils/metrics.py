@@ -0,0 +1,79 @@
+"""
+Prometheus metrics for the API, served on /metrics.
+Request, stage and collection-query latencies are histograms observed where
+the work happens; cache, batcher and job-queue numbers already kept by the
+services are read at scrape time by ServiceStatsCollector, so the hot path
+does not pay for them. Each worker process exposes its own registry.
+"""
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Stage spans range from sub-millisecond lookups to multi-second LLM calls
+_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUESTS = Counter(
+    "legal_helper_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+REQUEST_SECONDS = Histogram(
+    "legal_helper_request_seconds", "HTTP request latency", ["method", "route"], buckets=_BUCKETS
+)
+STAGE_SECONDS = Histogram(
+    "legal_helper_stage_seconds", "Latency of pipeline stages (one observation per span)", ["stage"],
+    buckets=_BUCKETS
+)
+COLLECTION_QUERY_SECONDS = Histogram(
+    "legal_helper_collection_query_seconds", "Vector store lookups per collection and backend",
+    ["collection", "backend"], buckets=_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "legal_helper_llm_tokens_total", "Tokens reported by the LLM API", ["kind"]
+)
+LLM_ERRORS = Counter(
+    "legal_helper_llm_errors_total", "Failed or timed-out LLM calls"
+)
+
+
+class ServiceStatsCollector:
+    """Exports the counters kept by the container's caches, batcher and job queue."""
+
+    def __init__(self, container):
+        self.container = container
+
+    def collect(self):
+        container = self.container
+        ready = GaugeMetricFamily("legal_helper_ready", "1 once models are loaded and warm")
+        ready.add_metric([], 1.0 if container.ready else 0.0)
+        yield ready
+        if not container.ready:
+            return
+
+        stats = container.rag_service.cache_stats()
+        hits = CounterMetricFamily("legal_helper_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("legal_helper_cache_misses", "Cache misses", labels=["cache"])
+        entries = GaugeMetricFamily("legal_helper_cache_entries", "Entries currently cached", labels=["cache"])
+        for name in ("embedding_cache", "retrieval_cache", "answer_cache"):
+            cache = stats.get(name)
+            if not cache:
+                continue
+            hits.add_metric([name], cache["hits"])
+            misses.add_metric([name], cache["misses"])
+            entries.add_metric([name], cache["size"])
+        yield hits
+        yield misses
+        yield entries
+
+        batcher = stats["embedding_batcher"]
+        batches = CounterMetricFamily("legal_helper_embedding_batches", "Encode calls made by the micro-batcher")
+        batches.add_metric([], batcher["batches"])
+        yield batches
+        texts = CounterMetricFamily("legal_helper_embedding_batch_texts", "Texts encoded by the micro-batcher")
+        texts.add_metric([], batcher["texts"])
+        yield texts
+        pending = GaugeMetricFamily("legal_helper_embedding_pending", "Texts waiting for the next batch")
+        pending.add_metric([], batcher["pending"])
+        yield pending
+
+        if container.job_manager:
+            queued = GaugeMetricFamily("legal_helper_summarize_queue_depth", "Summarization jobs waiting for a worker")
+            queued.add_metric([], container.job_manager.queue_depth())
+            yield queued
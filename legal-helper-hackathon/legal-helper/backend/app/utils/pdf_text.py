@@ -0,0 +1,190 @@
+"""
+Page-level PDF text extraction.
+Pages are sharded across a process pool, and the extracted text is cached on
+disk keyed by the file's SHA-256 so re-runs skip PyPDF2 entirely. Uploads
+additionally use a per-page cache keyed by page content.
+"""
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from PyPDF2 import PdfReader
+
+from app.utils.cache import file_sha256
+
+logger = logging.getLogger(__name__)
+
+
+class PageTextCache:
+    """Extracted page text stored as <cache_dir>/<sha[:2]>/<sha>.json."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, file_hash: str) -> Path:
+        return self.cache_dir / file_hash[:2] / f"{file_hash}.json"
+
+    def get(self, file_hash: str) -> Optional[list[str]]:
+        try:
+            return json.loads(self._path(file_hash).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, file_hash: str, pages: list[str]):
+        path = self._path(file_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(pages, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+class PageContentCache:
+    """
+    Per-page text keyed by the hash of the page's content stream and the fonts and
+    Form XObjects it draws with (see _page_key), so the same page inside a
+    different file (a judgment attached to another filing, a re-saved copy) is
+    not run through PyPDF2 again.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, page_key: str) -> Path:
+        return self.cache_dir / page_key[:2] / f"{page_key}.txt"
+
+    def get(self, page_key: str) -> Optional[str]:
+        try:
+            return self._path(page_key).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(self, page_key: str, text: str):
+        path = self._path(page_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+# Bump when the key inputs change so entries keyed the old way are never reused
+_PAGE_KEY_VERSION = b"page-key-v2"
+
+
+def _stream_bytes(obj) -> bytes:
+    return obj.get_data() if hasattr(obj, "get_data") else str(obj).encode("utf-8")
+
+
+def _hash_resources(resources, digest, seen: set):
+    """
+    Feed everything that determines a page's extracted text besides its own content
+    stream into digest: each font's name, /Encoding and /ToUnicode map, and every
+    Form XObject's stream with its own resources, recursively.
+    """
+    resources = resources.get_object() if resources is not None else None
+    if not resources or id(resources) in seen:
+        return
+    seen.add(id(resources))
+
+    fonts = (resources.get("/Font") or {})
+    fonts = fonts.get_object() if hasattr(fonts, "get_object") else fonts
+    for name in sorted(fonts):
+        font = fonts[name].get_object()
+        digest.update(f"font {name} {font.get('/BaseFont', '')}\0".encode("utf-8"))
+        for entry in ("/Encoding", "/ToUnicode"):
+            value = font.get(entry)
+            if value is not None:
+                digest.update(entry.encode("utf-8") + _stream_bytes(value.get_object()) + b"\0")
+        # Type 3 glyphs are drawn by their own procedures and resources
+        _hash_resources(font.get("/Resources"), digest, seen)
+
+    xobjects = (resources.get("/XObject") or {})
+    xobjects = xobjects.get_object() if hasattr(xobjects, "get_object") else xobjects
+    for name in sorted(xobjects):
+        xobject = xobjects[name].get_object()
+        digest.update(f"xobject {name} {xobject.get('/Subtype', '')}\0".encode("utf-8"))
+        if xobject.get("/Subtype") == "/Form" and id(xobject) not in seen:
+            seen.add(id(xobject))
+            digest.update(xobject.get_data() + b"\0")
+            _hash_resources(xobject.get("/Resources"), digest, seen)
+
+
+def _page_key(page) -> Optional[str]:
+    """
+    SHA-256 of a page's content stream and of the resources its text depends on
+    (fonts with their encodings, Form XObjects recursively), or None if it cannot be read.
+    """
+    digest = hashlib.sha256(_PAGE_KEY_VERSION + b"\0")
+    try:
+        contents = page.get_contents()
+        digest.update((contents.get_data() if contents is not None else b"") + b"\0")
+        _hash_resources(page.get("/Resources"), digest, set())
+    except Exception:
+        return None
+    return digest.hexdigest()
+
+
+def _extract_page_range(args) -> list[str]:
+    """Process-pool worker: extract pages [start, end) of one PDF."""
+    pdf_path, start, end = args
+    reader = PdfReader(str(pdf_path))
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def pdf_page_count(pdf_path) -> int:
+    return len(PdfReader(str(pdf_path)).pages)
+
+
+def extract_page_range(pdf_path, start: int, end: int, page_cache_dir: str = None) -> list[str]:
+    """
+    Text of pages [start, end), one page at a time; picklable for use from any
+    process pool. With page_cache_dir, pages already seen in any file are read
+    from the content-addressed cache instead of being extracted.
+    """
+    if page_cache_dir is None:
+        return _extract_page_range((pdf_path, start, end))
+
+    cache = PageContentCache(page_cache_dir)
+    reader = PdfReader(str(pdf_path))
+    pages = []
+    for i in range(start, end):
+        page = reader.pages[i]
+        page_key = _page_key(page)
+        text = cache.get(page_key) if page_key else None
+        if text is None:
+            text = page.extract_text() or ""
+            if page_key:
+                cache.put(page_key, text)
+        pages.append(text)
+    return pages
+
+
+def extract_pdf_pages(pdf_path, workers: Optional[int] = None, cache: Optional[PageTextCache] = None,
+                      file_hash: Optional[str] = None) -> list[str]:
+    """Return the text of every page, extracting in parallel on a cache miss."""
+    if cache is not None:
+        file_hash = file_hash or file_sha256(pdf_path)
+        pages = cache.get(file_hash)
+        if pages is not None:
+            logger.info(f"  Page cache hit for {Path(pdf_path).name} ({len(pages)} pages)")
+            return pages
+
+    page_count = len(PdfReader(str(pdf_path)).pages)
+    workers = max(1, min(workers or os.cpu_count() or 1, page_count))
+
+    if workers == 1:
+        pages = _extract_page_range((pdf_path, 0, page_count))
+    else:
+        # A few shards per worker evens out pages that are much slower than others
+        shard_size = max(1, -(-page_count // (workers * 4)))
+        shards = [(pdf_path, start, min(start + shard_size, page_count))
+                  for start in range(0, page_count, shard_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pages = [page for shard in pool.map(_extract_page_range, shards) for page in shard]
+
+    if cache is not None:
+        cache.put(file_hash, pages)
+    return pages
@@ -1,6 +1,10 @@
 import re
+from functools import lru_cache
 from typing import Dict
-from langdetect import detect
+from langdetect import DetectorFactory, detect
+
+# langdetect samples randomly; a fixed seed makes the same text always get the same answer
+DetectorFactory.seed = 0
 
 def clean_legal_text(text: str) -> str:
     """
@@ -9,17 +13,11 @@ def clean_legal_text(text: str) -> str:
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
-def chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+def normalize_query(text: str) -> str:
     """
-    Splits text into overlapping chunks.
+    Normalizes a user query for cache lookups (case, whitespace, trailing punctuation).
     """
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunks.append(text[start:end])
-        start += chunk_size - overlap
-    return chunks
+    return clean_legal_text(text).lower().rstrip("?.!")
 
 def extract_section_number(text: str) -> str:
     """
@@ -30,6 +28,15 @@ def extract_section_number(text: str) -> str:
         return f"{match.group(1).upper()} {match.group(3)}"
     return ""
 
+DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+def normalize_section_number(value: str) -> str:
+    """
+    Normalizes stored section identifiers ("IPC_140", "302 A", "३०२") to "140", "302A", "302".
+    """
+    match = re.search(r'(\d+)\s*([A-Z]{0,2})\b', str(value).translate(DEVANAGARI_DIGITS).upper())
+    return f"{match.group(1)}{match.group(2)}" if match else ""
+
 def create_legal_metadata(doc: Dict, doc_type: str) -> Dict:
     """
     Creates standardized metadata for legal documents.
@@ -38,7 +45,7 @@ def create_legal_metadata(doc: Dict, doc_type: str) -> Dict:
         "source_type": doc_type,
         "title": doc.get("title", ""),
         "category": doc.get("category", ""),
-        "language": detect_language(doc.get("description", "") or doc.get("content", ""))
+        "language": _document_language(doc.get("description", "") or doc.get("content", ""))
     }
     
     if doc_type == "statute":
@@ -59,12 +66,84 @@ def create_legal_metadata(doc: Dict, doc_type: str) -> Dict:
         
     return metadata
 
+# Common romanized Hindi words (Hinglish queries). English homographs ("the", "mere")
+# are left out: a plain English query would otherwise count as Hinglish
+ROMANIZED_HINDI = frozenset("""
+kya kyu kyun kaise kab kahan kaun kaunsa kaunsi kitna kitni kitne kis kisi koi hai hain tha thi
+nahi nahin mein mai mujhe mera meri hamara hamari aap apna apni apne unka unki uska uski iska iski
+ka ki ke ko se aur ya lekin agar toh bhi sirf liye wala wali wale kar karna karne karta karti karte kiya
+kiye hota hoti hote hoga hogi raha rahi rahe sakta sakti sakte gaya gayi diya liya chahiye padega padegi
+milegi milta milti saza sazaa saja sajaa jurmana kanoon kanun dhara adhiniyam chori dhokha dhokhadhadi
+hatya shadi talak pati patni dahej zamanat jamanat giraftar giraftari thana vakil wakil adalat mukadma
+""".split())
+
+_DEVANAGARI_RE = re.compile(r'[\u0900-\u097F\uA8E0-\uA8FF]')
+_LATIN_WORD_RE = re.compile(r'[A-Za-z]+')
+# Acronyms such as IPC, BNS, FIR appear in Hindi queries too and say nothing about the language
+_ACRONYM_RE = re.compile(r'\b[A-Z][A-Za-z]?[A-Z]+\b')
+
+# Devanagari share of letters at or above which text is Hindi; between the two it is mixed
+_HINDI_SCRIPT_RATIO = 0.7
+_MIXED_SCRIPT_RATIO = 0.1
+
+# Longer texts (ingested documents) are sampled, not memoized
+_CACHE_MAX_CHARS = 512
+_SAMPLE_CHARS = 2000
+
+
 def detect_language(text: str) -> str:
     """
-    Detects if text is English or Hindi.
+    Detects if text is English ("en"), Hindi ("hi") or Hinglish ("mixed":
+    romanized Hindi, or Devanagari and Latin together).
+    Decided by Unicode script first; the seeded statistical model is only used
+    for Latin-script text with a single romanized-Hindi word. Queries are memoized.
     """
+    if not text:
+        return "en"
+    if len(text) <= _CACHE_MAX_CHARS:
+        return _detect_cached(text)
+    return _detect(text[:_SAMPLE_CHARS])
+
+
+def _document_language(text: str) -> str:
+    """
+    "en" or "hi" for stored documents, which are filtered by language: Hinglish
+    ("mixed") is taken by its majority script, so romanized Hindi is "en".
+    """
+    language = detect_language(text)
+    if language != "mixed":
+        return language
+    sample = text[:_SAMPLE_CHARS]
+    devanagari = len(_DEVANAGARI_RE.findall(sample))
+    latin = sum(len(word) for word in _LATIN_WORD_RE.findall(sample))
+    return "hi" if devanagari > latin else "en"
+
+
+@lru_cache(maxsize=4096)
+def _detect_cached(text: str) -> str:
+    return _detect(text)
+
+
+def _detect(text: str) -> str:
+    devanagari = len(_DEVANAGARI_RE.findall(text))
+    words = _LATIN_WORD_RE.findall(_ACRONYM_RE.sub(" ", text))
+    latin = sum(len(word) for word in words)
+    if devanagari + latin == 0:
+        return "en"
+
+    ratio = devanagari / (devanagari + latin)
+    if ratio >= _HINDI_SCRIPT_RATIO:
+        return "hi"
+    if ratio > _MIXED_SCRIPT_RATIO:
+        return "mixed"
+
+    hits = sum(1 for word in words if word.lower() in ROMANIZED_HINDI)
+    if hits == 0:
+        return "en"
+    if hits >= 2 or len(words) <= 2:
+        return "mixed"
+    # One marker word in otherwise Latin text: let the n-gram model decide
     try:
-        lang = detect(text)
-        return "hi" if lang == "hi" else "en"
-    except:
+        return "en" if detect(text) == "en" else "mixed"
+    except Exception:
         return "en"
@@ -0,0 +1,177 @@
+"""
+Per-request stage timings.
+The HTTP middleware starts a StageTimings for each request (held in a context
+variable, so tasks spawned by the request share it); services wrap their
+work in `stage("embed")`, `stage("retrieve")`, ... and the totals are returned
+in a Server-Timing header for load tests to break latency down by stage.
+Every span is also observed in the legal_helper_stage_seconds histogram and,
+with DEBUG logging enabled for this module, logged with its request ID.
+"""
+import contextvars
+import functools
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.utils.metrics import REQUESTS, REQUEST_SECONDS, STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar = contextvars.ContextVar("stage_timings", default=None)
+
+
+class StageTimings:
+    """
+    Wall-clock milliseconds per stage name. Overlapping spans of the same stage
+    (concurrent lookups under asyncio.gather) are counted once, from the first
+    start to the last end, so a stage never adds up to more than real time.
+    """
+
+    def __init__(self, request_id: str = None):
+        self.request_id = request_id or uuid.uuid4().hex[:16]
+        self.totals: dict[str, float] = {}
+        self._active: dict[str, tuple[int, float]] = {}
+
+    def enter(self, name: str):
+        depth, started = self._active.get(name, (0, time.perf_counter()))
+        self._active[name] = (depth + 1, started)
+
+    def exit(self, name: str):
+        depth, started = self._active[name]
+        if depth > 1:
+            self._active[name] = (depth - 1, started)
+            return
+        del self._active[name]
+        self.totals[name] = self.totals.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def header(self) -> str:
+        """Server-Timing header value, e.g. `embed;dur=3.10, llm;dur=812.44`."""
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in self.totals.items())
+
+
+def start_timings(request_id: str = None) -> StageTimings:
+    timings = StageTimings(request_id)
+    _current.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[StageTimings]:
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str):
+    """Time the enclosed block as `name` (request totals only inside a timed request)."""
+    timings = _current.get()
+    if timings is not None:
+        timings.enter(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if timings is not None:
+            timings.exit(name)
+        STAGE_SECONDS.labels(name).observe(elapsed)
+        if logger.isEnabledFor(logging.DEBUG):
+            request_id = timings.request_id if timings else None
+            logger.debug("span=%s duration_ms=%.2f request_id=%s", name, elapsed * 1000, request_id, extra={
+                "span": name, "duration_ms": round(elapsed * 1000, 2), "request_id": request_id
+            })
+
+
+class TimedRoute(APIRoute):
+    """
+    Route whose endpoint body is timed as the "handler" stage, so the middleware
+    can attribute the rest of the request (body parsing, response validation and
+    JSON encoding) to "serialize".
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kw):
+            timings = _current.get()
+            if timings is None:
+                return await endpoint(*args, **kw)
+            # Not a stage(): the handler span covers every other stage and is not worth a histogram
+            timings.enter("handler")
+            try:
+                return await endpoint(*args, **kw)
+            finally:
+                timings.exit("handler")
+
+        super().__init__(path, timed_endpoint, **kwargs)
+
+
+class ServerTimingMiddleware:
+    """
+    Per-request stage timings and request metrics, as pure ASGI middleware.
+    Latency is measured until the last body message is sent, so streamed
+    responses (/query/stream, /query/batch) include the retrieval and LLM work
+    done while streaming. Their headers go out before that work, so they carry
+    X-Request-ID but no Server-Timing header; the full breakdown is in the
+    stage histograms and the DEBUG request log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_timings(Headers(scope=scope).get("x-request-id"))
+        start = time.perf_counter()
+        status = 500
+        streamed = False
+        recorded = False
+
+        def close_totals():
+            total_ms = (time.perf_counter() - start) * 1000
+            if "handler" in timings.totals:
+                handler_ms = timings.totals.pop("handler")
+                if not streamed:
+                    # Body parsing, response validation and JSON encoding
+                    timings.totals["serialize"] = max(0.0, total_ms - handler_ms)
+            timings.totals["total"] = total_ms
+
+        def record():
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            elapsed = time.perf_counter() - start
+            # Route templates, not raw paths, keep the label set bounded (/summarize/jobs/{job_id})
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUESTS.labels(scope["method"], route, str(status)).inc()
+            REQUEST_SECONDS.labels(scope["method"], route).observe(elapsed)
+            if logger.isEnabledFor(logging.DEBUG):
+                close_totals()
+                logger.debug("request_id=%s method=%s route=%s status=%s %s", timings.request_id,
+                             scope["method"], route, status, timings.header())
+
+        async def timed_send(message):
+            nonlocal status, streamed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = timings.request_id
+                # Without a Content-Length the body is still being produced
+                streamed = "content-length" not in headers
+                if not streamed:
+                    close_totals()
+                    headers["Server-Timing"] = timings.header()
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            record()
@@ -0,0 +1,181 @@
+"""
+Benchmark fixtures.
+Builds everything the latency benchmark needs from the files bundled in data/,
+so runs are reproducible offline and without the HuggingFace dataset:
+
+  cases.jsonl   synthetic judgments (seeded) standing in for InJudgements,
+                written from the IPC/BNS section text
+  summarize.pdf multi-page text PDF uploaded to /api/summarize
+  vectorstore/  full ingest of the CSVs, PDFs and synthetic cases
+                (scripts/ingest_all_data.py --vectorstore-dir)
+
+Usage:
+    python benchmarks/build_fixtures.py [--cases 600] [--pdf-pages 40] [--seed 7]
+"""
+import argparse
+import csv
+import json
+import logging
+import random
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+FIXTURE_DIR = Path(__file__).parent / "output" / "fixtures"
+
+_STATES = ["Maharashtra", "Uttar Pradesh", "Kerala", "Punjab", "Rajasthan", "Karnataka", "Bihar", "Gujarat"]
+_NAMES = ["Ramesh Kumar", "Sunita Devi", "Mohd. Irfan", "K. Lakshmi", "Harpreet Singh", "Anil Sharma",
+          "Fatima Begum", "Suresh Yadav", "P. Venkatesh", "Meena Kumari"]
+_HIGH_COURTS = ["Bombay", "Allahabad", "Kerala", "Punjab and Haryana", "Rajasthan", "Karnataka", "Patna", "Gujarat"]
+
+
+def load_sections() -> list[dict]:
+    """IPC and BNS sections as {act, section, text} from the bundled CSVs."""
+    sections = []
+    with open(DATA_DIR / "ipc_sections.csv", "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            sections.append({
+                "act": "Indian Penal Code",
+                "section": row["Section"].replace("IPC_", ""),
+                "text": f"{row['Description']}\nPunishment: {row['Punishment']}"
+            })
+    with open(DATA_DIR / "bns_sections.csv", "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            sections.append({
+                "act": "Bharatiya Nyaya Sanhita",
+                "section": row["Section"],
+                "text": f"{row['Section _name']}\n{row['Description']}"
+            })
+    return sections
+
+
+def synthetic_case(rng: random.Random, i: int, sections: list[dict]) -> dict:
+    """One judgment-shaped record: court header, parties, and reasoning quoting 2-4 sections."""
+    # Every third case is a Supreme Court judgment, matching the ingest pipeline's court balance
+    supreme = i % 3 == 0
+    state = rng.choice(_STATES)
+    court = "In the Supreme Court of India" if supreme else f"In the High Court of {rng.choice(_HIGH_COURTS)}"
+    year = rng.randint(1985, 2023)
+    cited = rng.sample(sections, rng.randint(2, 4))
+
+    paragraphs = [
+        f"{court}\nCRIMINAL APPELLATE JURISDICTION\nCriminal Appeal No. {rng.randint(1, 2500)} of {year}",
+        f"{rng.choice(_NAMES)} ... Appellant\nVersus\nState of {state} ... Respondent",
+        "JUDGMENT",
+        f"1. This appeal arises from the judgment of conviction recorded against the appellant under "
+        + ", ".join(f"Section {s['section']} of the {s['act']}" for s in cited) + "."
+    ]
+    for n, section in enumerate(cited, start=2):
+        excerpt = " ".join(section["text"].split())[:rng.randint(400, 1200)]
+        paragraphs.append(
+            f"{n}. The relevant provision, Section {section['section']} of the {section['act']}, reads: "
+            f"\"{excerpt}\" The prosecution was required to prove each ingredient of this offence."
+        )
+    outcome = rng.choice(["The appeal is dismissed.", "The appeal is allowed and the conviction set aside.",
+                          "The sentence is modified to the period already undergone."])
+    paragraphs.append(f"{len(cited) + 2}. Having considered the evidence on record, we find as follows. {outcome}")
+    return {"id": f"bench_case_{i}", "Text": "\n\n".join(paragraphs)}
+
+
+def write_cases(path: Path, count: int, sections: list[dict], seed: int):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps(synthetic_case(rng, i, sections), ensure_ascii=False) + "\n")
+    logger.info(f"Wrote {count} synthetic cases to {path}")
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("ascii", "replace").decode("ascii")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_pdf_bytes(pages: list[list[str]]) -> bytes:
+    """Minimal PDF 1.4 writer: one Helvetica text block per page, extractable by PyPDF2."""
+    objects = [b"", b""]  # catalog and page tree are filled in once the kids are known
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    font_id, kids = len(objects), []
+    for lines in pages:
+        stream = ("BT /F1 9 Tf 12 TL 40 800 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in lines)
+                  + " ET").encode("ascii")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {len(objects)} 0 R >>".encode("ascii")
+        )
+        kids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode("ascii")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    return bytes(out)
+
+
+def summary_pdf_bytes(page_count: int, sections: list[dict], seed: int) -> bytes:
+    """
+    An act-like document: consecutive sections wrapped to 60 lines per page.
+    Different seeds give different text, so uploads miss the summary caches.
+    """
+    rng = random.Random(seed)
+    start = rng.randrange(0, max(1, len(sections) - page_count * 4))
+    lines = [f"Benchmark document {seed}", ""]
+    for section in sections[start:]:
+        lines.append(f"Section {section['section']} ({section['act']})")
+        for paragraph in section["text"].splitlines():
+            lines.extend(textwrap.wrap(paragraph, 95) or [""])
+        lines.append("")
+        if len(lines) >= page_count * 60:
+            break
+    pages = [lines[i:i + 60] for i in range(0, page_count * 60, 60)]
+    return text_pdf_bytes([page for page in pages if page])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build benchmark fixtures from the bundled data")
+    parser.add_argument("--output", default=str(FIXTURE_DIR), help="Fixture directory")
+    parser.add_argument("--cases", type=int, default=600, help="Synthetic judgments to generate and ingest")
+    parser.add_argument("--pdf-pages", type=int, default=40, help="Pages in the summarization PDF")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-ingest", action="store_true", help="Only write cases.jsonl and summarize.pdf")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    sections = load_sections()
+    write_cases(output / "cases.jsonl", args.cases, sections, args.seed)
+    (output / "summarize.pdf").write_bytes(summary_pdf_bytes(args.pdf_pages, sections, args.seed))
+    logger.info(f"Wrote {args.pdf_pages}-page summarization fixture to {output / 'summarize.pdf'}")
+
+    if not args.skip_ingest:
+        # A fresh ingest every time: fixture runs must not depend on what was there before
+        logger.info("Ingesting fixture vector store...")
+        subprocess.run([
+            sys.executable, str(BASE_DIR / "scripts" / "ingest_all_data.py"), "--full",
+            "--vectorstore-dir", str(output / "vectorstore"),
+            "--cases-file", str(output / "cases.jsonl"),
+            "--max-cases", str(args.cases)
+        ], cwd=str(BASE_DIR), check=True)
+
+    manifest = {"cases": args.cases, "pdf_pages": args.pdf_pages, "seed": args.seed,
+                "vectorstore": str(output / "vectorstore"), "pdf": str(output / "summarize.pdf")}
+    (output / "fixtures.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    logger.info(f"Fixtures ready in {output}")
+
+
+if __name__ == "__main__":
+    main()
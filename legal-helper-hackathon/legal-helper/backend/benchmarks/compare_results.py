@@ -0,0 +1,102 @@
+"""
+Diff two benchmark reports and gate regressions.
+Runs are matched by (scenario, concurrency). A run regresses when a gated
+latency percentile grows, or throughput drops, by more than --threshold percent
+and the absolute change is above --min-ms (so sub-millisecond stages do not
+flap). Exits 1 on any regression, so it can fail a CI job.
+
+Usage:
+    python benchmarks/compare_results.py baseline.json candidate.json [--threshold 10] [--gate p95,p99]
+"""
+import argparse
+import json
+import sys
+
+
+def load_runs(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return {(run["scenario"], run["concurrency"]): run for run in report["runs"]}
+
+
+def pct_change(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0 if new == 0 else float("inf")
+    return (new - old) / old * 100
+
+
+def compare(baseline: dict, candidate: dict, gate: list[str], threshold: float, min_ms: float,
+            stages: list[str] = None) -> tuple[list[dict], list[str]]:
+    """Per-metric rows and a list of regression messages."""
+    rows, regressions = [], []
+    for key in sorted(set(baseline) & set(candidate)):
+        old_run, new_run = baseline[key], candidate[key]
+        label = f"{key[0]}@{key[1]}"
+
+        change = pct_change(old_run["throughput_rps"], new_run["throughput_rps"])
+        rows.append({"run": label, "metric": "throughput_rps", "baseline": old_run["throughput_rps"],
+                     "candidate": new_run["throughput_rps"], "change_pct": change})
+        if change < -threshold:
+            regressions.append(f"{label} throughput {old_run['throughput_rps']} -> {new_run['throughput_rps']} req/s")
+
+        for stage in sorted(set(old_run["latency_ms"]) | set(new_run["latency_ms"])):
+            if stages and stage not in stages:
+                continue
+            old_stats = old_run["latency_ms"].get(stage, {})
+            new_stats = new_run["latency_ms"].get(stage, {})
+            for name in ("p50", "p95", "p99"):
+                old, new = old_stats.get(name, 0.0), new_stats.get(name, 0.0)
+                change = pct_change(old, new)
+                rows.append({"run": label, "metric": f"{stage}.{name}", "baseline": old,
+                             "candidate": new, "change_pct": change})
+                if name in gate and change > threshold and new - old > min_ms:
+                    regressions.append(f"{label} {stage}.{name} {old} -> {new} ms ({change:+.1f}%)")
+
+        new_errors, old_errors = sum(new_run["errors"].values()), sum(old_run["errors"].values())
+        if new_errors > old_errors:
+            regressions.append(f"{label} errors {old_errors} -> {new_errors}")
+
+    for key in sorted(set(baseline) - set(candidate)):
+        regressions.append(f"{key[0]}@{key[1]} missing from candidate")
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression in percent")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="Ignore latency changes smaller than this")
+    parser.add_argument("--gate", default="p95,p99", help="Percentiles that fail the comparison")
+    parser.add_argument("--stages", default=None, help="Only compare these stages (e.g. total,llm)")
+    parser.add_argument("--json", action="store_true", help="Print rows and regressions as JSON")
+    args = parser.parse_args()
+
+    rows, regressions = compare(
+        load_runs(args.baseline), load_runs(args.candidate),
+        gate=[g.strip() for g in args.gate.split(",")],
+        threshold=args.threshold,
+        min_ms=args.min_ms,
+        stages=[s.strip() for s in args.stages.split(",")] if args.stages else None
+    )
+
+    if args.json:
+        print(json.dumps({"rows": rows, "regressions": regressions}, indent=2))
+    else:
+        print(f"{'run':<16} {'metric':<20} {'baseline':>12} {'candidate':>12} {'change':>9}")
+        for row in rows:
+            print(f"{row['run']:<16} {row['metric']:<20} {row['baseline']:>12} {row['candidate']:>12} "
+                  f"{row['change_pct']:>+8.1f}%")
+        print()
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold}%:")
+            for message in regressions:
+                print(f"  {message}")
+        else:
+            print("No regressions")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
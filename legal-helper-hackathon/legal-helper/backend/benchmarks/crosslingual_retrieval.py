@@ -0,0 +1,187 @@
+"""
+Retrieval quality and latency of the split statute collections against the
+unified multilingual index (statute_index="split" vs "unified").
+
+split:   all-MiniLM query embedding, statutes_english or statutes_hindi chosen
+         by detected language (both, interleaved, for Hinglish)
+unified: multilingual query embedding, one search over statutes_unified
+
+Each labelled query in crosslingual_queries.json lists the "IPC 302"-style
+sections that answer it. Reported per setup and query language: hit@k, MRR,
+how often the top k holds documents in both languages, and embed / search
+latency percentiles. Only the vector stage is measured (no BM25 fusion or
+re-ranking), so the numbers isolate the embedding model and index layout.
+
+    python scripts/build_unified_statutes.py
+    python benchmarks/crosslingual_retrieval.py --output benchmarks/output/crosslingual.json
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import zip_longest
+from pathlib import Path
+
+import chromadb
+from sentence_transformers import SentenceTransformer
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from app.services.lexical_index import section_key
+from app.services.unified_statutes import MULTILINGUAL_MODEL, UNIFIED_COLLECTION, collection_model
+from app.utils.text_processing import detect_language
+from run_benchmark import git_commit, summarize_latencies
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+QUERIES = Path(__file__).parent / "crosslingual_queries.json"
+SPLIT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def split_collections(language: str) -> list[str]:
+    """Mirrors RAGService._statute_collections for statute_index="split"."""
+    if language == "hi":
+        return ["statutes_hindi"]
+    if language == "mixed":
+        return ["statutes_english", "statutes_hindi"]
+    return ["statutes_english"]
+
+
+class Setup:
+    def __init__(self, name: str, client, model: SentenceTransformer, normalize: bool, k: int):
+        self.name = name
+        self.client = client
+        self.model = model
+        self.normalize = normalize
+        self.k = k
+
+    def collections(self, language: str) -> list[str]:
+        return [UNIFIED_COLLECTION] if self.name == "unified" else split_collections(language)
+
+    def run(self, query: str, language: str) -> tuple[list[dict], float, float]:
+        """Top-k statute metadata, embed ms and search ms."""
+        start = time.perf_counter()
+        embedding = self.model.encode(query, normalize_embeddings=self.normalize).tolist()
+        embedded = time.perf_counter()
+
+        per_collection = []
+        for name in self.collections(language):
+            results = self.client.get_collection(name).query(query_embeddings=[embedding], n_results=self.k)
+            per_collection.append(results["metadatas"][0])
+        searched = time.perf_counter()
+
+        # Several collections are interleaved and capped, as RAGService._collect_results does
+        merged = [m for group in zip_longest(*per_collection) for m in group if m is not None][:self.k]
+        return merged, (embedded - start) * 1000, (searched - embedded) * 1000
+
+
+def score(metadatas: list[dict], expected: set[str]) -> dict:
+    keys = [section_key(m.get("statute_type", ""), m.get("section") or "") for m in metadatas]
+    rank = next((i + 1 for i, key in enumerate(keys) if key in expected), None)
+    languages = {m.get("language") for m in metadatas}
+    return {
+        "hit": rank is not None,
+        "reciprocal_rank": 1 / rank if rank else 0.0,
+        "both_languages": {"english", "hindi"} <= languages,
+        "english_evidence": "english" in languages
+    }
+
+
+def evaluate(setup: Setup, queries: list[dict], repeat: int) -> dict:
+    by_language = defaultdict(lambda: defaultdict(list))
+    for item in queries:
+        language = item["language"]
+        for _ in range(repeat):
+            metadatas, embed_ms, search_ms = setup.run(item["query"], language)
+            for bucket in (by_language[language], by_language["all"]):
+                bucket["embed"].append(embed_ms)
+                bucket["search"].append(search_ms)
+                bucket["total"].append(embed_ms + search_ms)
+        quality = score(metadatas, set(item["expected"]))
+        for bucket in (by_language[language], by_language["all"]):
+            for name, value in quality.items():
+                bucket[name].append(float(value))
+
+    report = {}
+    for language, values in by_language.items():
+        n = len(values["hit"])
+        report[language] = {
+            "queries": n,
+            f"hit@{setup.k}": round(sum(values["hit"]) / n, 3),
+            "mrr": round(sum(values["reciprocal_rank"]) / n, 3),
+            "both_languages": round(sum(values["both_languages"]) / n, 3),
+            "english_evidence": round(sum(values["english_evidence"]) / n, 3),
+            "latency_ms": {stage: summarize_latencies(values[stage]) for stage in ("embed", "search", "total")}
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split vs unified statute retrieval benchmark")
+    parser.add_argument("--vectorstore-dir", default=str(BASE_DIR / "vectorstore"))
+    parser.add_argument("--queries", default=str(QUERIES))
+    parser.add_argument("--k", type=int, default=4, help="Statute documents per query (RAGService.BASE_COUNTS)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    parser.add_argument("--output", default=None, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    with open(args.queries, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+    for item in queries:
+        item["language"] = detect_language(item["query"])
+
+    client = chromadb.PersistentClient(path=args.vectorstore_dir)
+    try:
+        multilingual_model = collection_model(client.get_collection(UNIFIED_COLLECTION)) or MULTILINGUAL_MODEL
+    except Exception:
+        sys.exit(f"{UNIFIED_COLLECTION} not found; run scripts/build_unified_statutes.py first")
+
+    setups = [
+        Setup("split", client, SentenceTransformer(SPLIT_MODEL, device="cpu"), normalize=False, k=args.k),
+        Setup("unified", client, SentenceTransformer(multilingual_model, device="cpu"), normalize=True, k=args.k)
+    ]
+    results = {}
+    for setup in setups:
+        # Warm-up pays for lazy tokenizer and HNSW loading outside the timed runs
+        for item in queries[:3]:
+            setup.run(item["query"], item["language"])
+        logger.info(f"Evaluating {setup.name}...")
+        results[setup.name] = evaluate(setup, queries, args.repeat)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "split_model": SPLIT_MODEL,
+            "multilingual_model": multilingual_model,
+            "k": args.k,
+            "repeat": args.repeat,
+            "languages": dict(sorted(
+                (lang, sum(1 for item in queries if item["language"] == lang))
+                for lang in {item["language"] for item in queries}
+            ))
+        },
+        "results": results
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output, encoding="utf-8")
+        logger.info(f"Wrote {args.output}")
+    else:
+        print(output)
+
+    for name, by_language in results.items():
+        overall = by_language["all"]
+        logger.info(f"{name:<8} hit@{args.k}={overall[f'hit@{args.k}']} mrr={overall['mrr']} "
+                    f"both_languages={overall['both_languages']} "
+                    f"total p50={overall['latency_ms']['total']['p50']} ms")
+
+
+if __name__ == "__main__":
+    main()
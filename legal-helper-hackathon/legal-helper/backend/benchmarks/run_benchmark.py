@@ -0,0 +1,293 @@
+"""
+End-to-end latency benchmark.
+Drives /api/query, /api/compare and /api/summarize at fixed concurrency levels
+and reports throughput plus p50/p95/p99 latency, end to end and per server stage
+(embed, retrieve, rerank, llm, serialize; read from the Server-Timing header), as JSON.
+
+With --launch the stub LLM (stub_llm_server.py) and the API are started against
+the fixture store from build_fixtures.py, so a run needs no network or Groq key:
+
+    python benchmarks/build_fixtures.py
+    python benchmarks/run_benchmark.py --launch --concurrency 1,8,32 --output benchmarks/output/run.json
+    python benchmarks/compare_results.py baseline.json benchmarks/output/run.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent))
+from build_fixtures import FIXTURE_DIR, load_sections, summary_pdf_bytes
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+WORKLOADS = Path(__file__).parent / "workloads.json"
+
+STAGES = ["detect_language", "embed", "retrieve", "rerank", "llm", "build_response", "upload", "summarize",
+          "serialize"]
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_latencies(values: list[float]) -> dict:
+    summary = {f"p{p}": round(percentile(values, p), 2) for p in PERCENTILES}
+    summary["mean"] = round(sum(values) / len(values), 2) if values else 0.0
+    summary["max"] = round(max(values), 2) if values else 0.0
+    return summary
+
+
+def parse_server_timing(header: str) -> dict:
+    """`embed;dur=3.1, llm;dur=800` -> {"embed": 3.1, "llm": 800.0}"""
+    timings = {}
+    for metric in filter(None, (part.strip() for part in (header or "").split(","))):
+        name, *params = metric.split(";")
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                timings[name.strip()] = float(value)
+    return timings
+
+
+class Scenario:
+    """Builds the next request of a workload as httpx.request kwargs."""
+
+    def __init__(self, name: str, workloads: dict, args):
+        self.name = name
+        self.rng = random.Random(args.seed)
+        self.queries = workloads["query"]
+        self.sections = workloads["compare"]
+        self.pdf_pages = args.pdf_pages
+        self.repeat_pdf = args.repeat_pdf
+        self.seed = args.seed
+        self._issued = 0
+        self._sections_text = load_sections() if name == "summarize" else None
+
+    def request(self) -> dict:
+        self._issued += 1
+        if self.name == "query":
+            return {"method": "POST", "url": "/api/query", "json": self.rng.choice(self.queries)}
+        if self.name == "compare":
+            return {"method": "POST", "url": "/api/compare", "json": {"ipc_section": self.rng.choice(self.sections)}}
+        # A fresh document per request unless --repeat-pdf, which measures the result-cache path
+        seed = self.seed if self.repeat_pdf else self.seed * 100003 + self._issued
+        pdf = summary_pdf_bytes(self.pdf_pages, self._sections_text, seed)
+        return {"method": "POST", "url": "/api/summarize",
+                "files": {"file": (f"bench_{seed}.pdf", pdf, "application/pdf")}}
+
+
+async def run_level(client: httpx.AsyncClient, scenario: Scenario, concurrency: int,
+                    total: int, warmup: int) -> dict:
+    """Send `total` requests with at most `concurrency` in flight; the first `warmup` are not recorded."""
+    samples, errors = [], {}
+    counter = iter(range(total))
+
+    async def worker():
+        for _ in counter:
+            kwargs = scenario.request()
+            start = time.perf_counter()
+            try:
+                response = await client.request(**kwargs)
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if response.status_code >= 400:
+                reason = f"HTTP {response.status_code}"
+                errors[reason] = errors.get(reason, 0) + 1
+                continue
+            samples.append((elapsed_ms, parse_server_timing(response.headers.get("server-timing"))))
+
+    # Warm-up runs first, serially, so it does not count towards the measured window
+    for _ in range(warmup):
+        try:
+            await client.request(**scenario.request())
+        except httpx.HTTPError:
+            pass
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    latency = {"total": summarize_latencies([total_ms for total_ms, _ in samples])}
+    latency["server"] = summarize_latencies([timing.get("total", 0.0) for _, timing in samples])
+    for name in STAGES:
+        # A stage the request skipped (cache hit, section fast path) counts as 0 ms
+        values = [timing.get(name, 0.0) for _, timing in samples]
+        if any(values):
+            latency[name] = summarize_latencies(values)
+
+    return {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(samples) / duration, 3) if duration else 0.0,
+        "latency_ms": latency
+    }
+
+
+def wait_ready(url: str, timeout_s: float, process: subprocess.Popen = None):
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Process exited with code {process.returncode} before {url} was ready")
+        try:
+            if httpx.get(url, timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{url} not ready after {timeout_s:.0f}s")
+
+
+def launch(args) -> list[subprocess.Popen]:
+    """Start the stub LLM and the API (against the fixture store) as child processes."""
+    fixtures = Path(args.fixtures)
+    if not (fixtures / "vectorstore").exists():
+        raise SystemExit(f"No fixture store in {fixtures}; run benchmarks/build_fixtures.py first")
+
+    stub = subprocess.Popen([
+        sys.executable, str(Path(__file__).parent / "stub_llm_server.py"),
+        "--port", str(args.stub_port), "--ttft-ms", str(args.ttft_ms), "--token-ms", str(args.token_ms),
+        "--tokens", str(args.tokens), "--seed", str(args.seed)
+    ])
+    wait_ready(f"http://127.0.0.1:{args.stub_port}/stats", 30, stub)
+
+    env = dict(os.environ)
+    env.update({
+        "GROQ_API_KEY": env.get("GROQ_API_KEY", "benchmark"),
+        "LLM_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+        "CHROMADB_PATH": str((fixtures / "vectorstore").resolve()),
+        # A fresh cache directory per run: no answers, page text or summaries from earlier runs
+        "CACHE_DIR": str((fixtures.parent / f"cache-{int(time.time())}").resolve()),
+        "ANSWER_CACHE_ENABLED": "true" if args.answer_cache else "false"
+    })
+    api = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+        "--log-level", "warning"
+    ], cwd=str(BASE_DIR), env=env)
+    try:
+        wait_ready(f"http://127.0.0.1:{args.port}/ready", args.ready_timeout, api)
+    except Exception:
+        for process in (api, stub):
+            process.terminate()
+        raise
+    return [api, stub]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(BASE_DIR),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_all(args) -> list[dict]:
+    workloads = json.loads(WORKLOADS.read_text(encoding="utf-8"))
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    runs = []
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        for name in args.scenarios:
+            scenario = Scenario(name, workloads, args)
+            for concurrency in args.concurrency:
+                total = args.summarize_requests if name == "summarize" else args.requests
+                logger.info(f"{name}: {total} requests at concurrency {concurrency}")
+                run = await run_level(client, scenario, concurrency, total, args.warmup)
+                logger.info(
+                    f"  {run['throughput_rps']} req/s, p50 {run['latency_ms']['total']['p50']} ms, "
+                    f"p95 {run['latency_ms']['total']['p95']} ms, errors {sum(run['errors'].values())}"
+                )
+                runs.append(run)
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legal Helper end-to-end latency benchmark")
+    parser.add_argument("--base-url", default=None, help="Benchmark an already running API instead of --launch")
+    parser.add_argument("--launch", action="store_true", help="Start the stub LLM and the API on the fixture store")
+    parser.add_argument("--fixtures", default=str(FIXTURE_DIR))
+    parser.add_argument("--port", type=int, default=8100, help="API port when launching")
+    parser.add_argument("--stub-port", type=int, default=8900, help="Stub LLM port when launching")
+    parser.add_argument("--ttft-ms", type=float, default=200.0)
+    parser.add_argument("--token-ms", type=float, default=8.0)
+    parser.add_argument("--tokens", type=int, default=300)
+    parser.add_argument("--answer-cache", action="store_true", help="Keep the semantic answer cache enabled")
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    parser.add_argument("--scenarios", default="query,compare,summarize")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per query/compare level")
+    parser.add_argument("--summarize-requests", type=int, default=10, help="Measured requests per summarize level")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--pdf-pages", type=int, default=12, help="Pages per uploaded summarization PDF")
+    parser.add_argument("--repeat-pdf", action="store_true", help="Upload the same PDF every time (cache path)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+    unknown = set(args.scenarios) - {"query", "compare", "summarize"}
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    if not args.launch and not args.base_url:
+        parser.error("Pass --launch or --base-url")
+
+    processes = launch(args) if args.launch else []
+    args.base_url = args.base_url or f"http://127.0.0.1:{args.port}"
+    try:
+        runs = asyncio.run(run_all(args))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "base_url": args.base_url,
+            "launched": args.launch,
+            "stub_llm": {"ttft_ms": args.ttft_ms, "token_ms": args.token_ms, "tokens": args.tokens}
+            if args.launch else None,
+            "answer_cache": args.answer_cache,
+            "seed": args.seed
+        },
+        "runs": runs
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(text, encoding="utf-8")
+        logger.info(f"Report written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Local stand-in for the Groq chat completions API.
+Serves POST /openai/v1/chat/completions (the path the Groq SDK calls, so the
+backend only needs LLM_BASE_URL=http://127.0.0.1:<port>) with a simulated
+latency of
+
+    ttft_ms + prompt_tokens / 1000 * prefill_ms_per_1k + output_tokens * token_ms
+
+(each scaled by +-jitter), plain or streamed as server-sent events. Prompts that
+ask for JSON get a summary/key_points/citations object, so /api/summarize works.
+
+Usage:
+    python benchmarks/stub_llm_server.py --port 8900 --ttft-ms 200 --token-ms 8 --tokens 300
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+_WORDS = ("the accused shall be punished with imprisonment of either description for a term which may "
+          "extend to seven years and shall also be liable to fine under the provisions cited").split()
+
+
+def build_app(ttft_ms: float, token_ms: float, tokens: int, prefill_ms_per_1k: float,
+              jitter: float, seed: int) -> FastAPI:
+    app = FastAPI(title="Stub LLM")
+    rng = random.Random(seed)
+    stats = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def jittered(ms: float) -> float:
+        return max(0.0, ms * (1 + rng.uniform(-jitter, jitter))) / 1000
+
+    def answer_text(messages: list[dict], max_tokens: int) -> list[str]:
+        """Output as a list of token-sized pieces."""
+        n = min(tokens, max_tokens)
+        prompt = messages[-1]["content"] if messages else ""
+        if "JSON" in prompt:
+            body = " ".join(_WORDS[i % len(_WORDS)] for i in range(max(1, n - 20)))
+            text = json.dumps({
+                "summary": body,
+                "key_points": ["Key obligations of the parties", "Penalties for contravention"],
+                "citations": ["Section 302 IPC", "Section 103 BNS"]
+            })
+            # Roughly four characters per token
+            return [text[i:i + 4] for i in range(0, len(text), 4)]
+        pieces = ["According to [IPC Section 302],"]
+        pieces += [f" {_WORDS[i % len(_WORDS)]}" for i in range(max(0, n - 1))]
+        return pieces
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        pieces = answer_text(messages, body.get("max_tokens") or tokens)
+        stats["requests"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += len(pieces)
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "stub")
+        first_token_s = jittered(ttft_ms + prompt_tokens / 1000 * prefill_ms_per_1k)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(pieces),
+                 "total_tokens": prompt_tokens + len(pieces)}
+
+        if body.get("stream"):
+            async def events():
+                await asyncio.sleep(first_token_s)
+                for i, piece in enumerate(pieces):
+                    if i:
+                        await asyncio.sleep(jittered(token_ms))
+                    chunk = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece},
+                                     "finish_reason": None}]
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                final = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                    "x_groq": {"usage": usage}
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(first_token_s + jittered(token_ms * max(0, len(pieces) - 1)))
+        return JSONResponse({
+            "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(pieces)},
+                         "finish_reason": "stop", "logprobs": None}],
+            "usage": usage
+        })
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Groq-compatible stub LLM with simulated latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--ttft-ms", type=float, default=200.0, help="Time to first token")
+    parser.add_argument("--token-ms", type=float, default=8.0, help="Time per further output token")
+    parser.add_argument("--tokens", type=int, default=300, help="Output tokens per completion")
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=20.0, help="Extra latency per 1k prompt tokens")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Uniform +- fraction applied to each delay")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    app = build_app(args.ttft_ms, args.token_ms, args.tokens, args.prefill_ms_per_1k, args.jitter, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
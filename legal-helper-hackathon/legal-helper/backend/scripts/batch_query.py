@@ -0,0 +1,80 @@
+"""
+Offline bulk research: answers every question in a CSV or JSONL file and
+writes one NDJSON result per line, in completion order, using the same
+batched pipeline as POST /api/query/batch.
+
+    python scripts/batch_query.py questions.csv --output answers.ndjson
+
+CSV files need a "query" column (optional "filters" column holding JSON);
+JSONL files hold {"query": ..., "filters": {...}} objects.
+"""
+import sys
+import csv
+import json
+import time
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.rag_service import RAGService
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def load_queries(path: Path) -> list[dict]:
+    items = []
+    if path.suffix == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("query", "").strip():
+                    filters = json.loads(row["filters"]) if row.get("filters") else None
+                    items.append({"query": row["query"].strip(), "filters": filters})
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    items.append({"query": record["query"], "filters": record.get("filters")})
+    return items
+
+
+async def run(items: list[dict], output, concurrency: int):
+    rag_service = RAGService()
+    start_time = time.time()
+    completed = 0
+    async for index, response in rag_service.query_batch(items, concurrency):
+        output.write(json.dumps({"index": index, "query": items[index]["query"], **response},
+                                default=str, ensure_ascii=False) + "\n")
+        output.flush()
+        completed += 1
+        if completed % 25 == 0:
+            logger.info(f"  {completed}/{len(items)} answered ({time.time() - start_time:.1f}s)")
+    logger.info(f"Answered {completed} queries in {time.time() - start_time:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a file of legal research questions")
+    parser.add_argument("input", type=Path, help="CSV (query[, filters]) or JSONL file")
+    parser.add_argument("--output", type=Path, default=None, help="NDJSON output (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Concurrent LLM calls")
+    args = parser.parse_args()
+
+    items = load_queries(args.input)
+    logger.info(f"Loaded {len(items)} queries from {args.input}")
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        asyncio.run(run(items, output, args.concurrency))
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Builds the quantized IVF index used when ANN_RETRIEVAL=true and reports
+recall against brute-force search so nprobe / rerank_k can be chosen safely.
+
+    python scripts/build_ann_index.py                      # build case_law index
+    python scripts/build_ann_index.py --report-only --nprobe 4,8,16,32 --rerank-k 50,100,200
+"""
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import chromadb
+
+from app.services.mmap_vector_store import MmapVectorStore, export_mmap_indexes
+from app.services.ann_index import build_ann_index, recall_report
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+VECTORSTORE_DIR = BASE_DIR / "vectorstore"
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and evaluate the ANN index")
+    parser.add_argument("--collection", default="case_law")
+    parser.add_argument("--nlist", type=int, default=None, help="Partitions (default: 4 * sqrt(N))")
+    parser.add_argument("--iterations", type=int, default=20, help="k-means iterations")
+    parser.add_argument("--report-only", action="store_true", help="Evaluate the existing index")
+    parser.add_argument("--nprobe", type=_int_list, default=[4, 8, 16, 32])
+    parser.add_argument("--rerank-k", type=_int_list, default=[50, 100, 200])
+    parser.add_argument("--k", type=int, default=10, help="Recall@k")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    if not args.report_only:
+        # The index is built over (and re-ranks against) the mmap export
+        if MmapVectorStore(str(VECTORSTORE_DIR)).get(args.collection) is None:
+            client = chromadb.PersistentClient(path=str(VECTORSTORE_DIR))
+            export_mmap_indexes(client, str(VECTORSTORE_DIR), [args.collection])
+        build_ann_index(str(VECTORSTORE_DIR), args.collection, nlist=args.nlist, iterations=args.iterations)
+
+    report = recall_report(str(VECTORSTORE_DIR), args.collection, args.nprobe, args.rerank_k,
+                           k=args.k, n_queries=args.queries)
+    if not report:
+        logger.error(f"No usable ANN index for {args.collection}")
+        sys.exit(1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
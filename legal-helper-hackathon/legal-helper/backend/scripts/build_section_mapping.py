@@ -0,0 +1,33 @@
+"""
+Builds the precomputed IPC <-> BNS correspondence table used by /api/compare.
+Run after ingestion (ingest_all_data.py also runs it when statutes change).
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import chromadb
+
+from app.services.section_mapping import build_section_mapping
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+VECTORSTORE_DIR = BASE_DIR / "vectorstore"
+SAMPLE_DATA = BASE_DIR / "data" / "sample" / "sample_legal_data.json"
+
+
+def main():
+    client = chromadb.PersistentClient(path=str(VECTORSTORE_DIR))
+    index = build_section_mapping(client, str(VECTORSTORE_DIR), sample_data_path=str(SAMPLE_DATA))
+    logger.info(f"Wrote {len(index)} IPC -> BNS entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Builds statutes_unified, the bilingual statute collection used with
+statute_index="unified": English and Hindi IPC/BNS documents embedded with one
+multilingual model and linked by section number. Run after ingestion;
+ingest_all_data.py rebuilds it when statutes change once it exists.
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import chromadb
+
+from app.utils.cache import bump_collection_version
+from app.services.lexical_index import build_lexical_indexes
+from app.services.mmap_vector_store import export_mmap_indexes
+from app.services.unified_statutes import MULTILINGUAL_MODEL, UNIFIED_COLLECTION, build_unified_statutes
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+VECTORSTORE_DIR = BASE_DIR / "vectorstore"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the unified multilingual statute collection")
+    parser.add_argument("--model", default=MULTILINGUAL_MODEL,
+                        help="Multilingual embedding model (must match MULTILINGUAL_EMBEDDING_MODEL in the API)")
+    parser.add_argument("--vectorstore-dir", default=str(VECTORSTORE_DIR))
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--dtype", choices=["float16", "float32"], default="float16",
+                        help="Element type of the memory-mapped export")
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=args.vectorstore_dir)
+    count = build_unified_statutes(client, args.model, batch_size=args.batch_size)
+    build_lexical_indexes(client, args.vectorstore_dir, [UNIFIED_COLLECTION])
+    export_mmap_indexes(client, args.vectorstore_dir, [UNIFIED_COLLECTION], dtype=args.dtype)
+    # Invalidate retrieval caches in running API workers
+    bump_collection_version(args.vectorstore_dir, UNIFIED_COLLECTION)
+    logger.info(f"Wrote {count} documents to {UNIFIED_COLLECTION}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Exports Chroma collections to memory-mapped NumPy matrices for the
+retrieval_backend="mmap" option. The ingestion scripts do this automatically
+for collections they change; run this to (re)export everything by hand.
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import chromadb
+
+from app.services.mmap_vector_store import export_mmap_indexes
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+VECTORSTORE_DIR = BASE_DIR / "vectorstore"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export collections to memory-mapped matrices")
+    parser.add_argument("collections", nargs="*", help="Collections to export (default: all)")
+    parser.add_argument("--dtype", choices=["float16", "float32"], default="float16")
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=str(VECTORSTORE_DIR))
+    names = args.collections or [collection.name for collection in client.list_collections()]
+    counts = export_mmap_indexes(client, str(VECTORSTORE_DIR), names, dtype=args.dtype)
+    logger.info(f"Exported {len(counts)} collections: {counts}")
+
+
+if __name__ == "__main__":
+    main()
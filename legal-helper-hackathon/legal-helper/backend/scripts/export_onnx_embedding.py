@@ -0,0 +1,125 @@
+"""
+Exports embedding models for embedding_backend="onnx": ONNX graph, dynamic int8
+quantization, tokenizer and pooling config under models/onnx/<model>/.
+Each export is checked against the PyTorch model on legal queries and statute
+text. An int8 model below --min-cosine is deleted (the API then serves fp32),
+and an fp32 model below --min-cosine-fp32 invalidates the whole export.
+Per-query latency and load time of both backends are logged for comparison.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sentence_transformers import SentenceTransformer
+
+from app.services.onnx_embedding import (
+    CONFIG_FILE, QUANTIZED_FILE, OnnxEmbeddingService, export_dir, export_onnx_model, parity_check
+)
+from app.services.unified_statutes import MULTILINGUAL_MODEL
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+OUTPUT_DIR = BASE_DIR / "models" / "onnx"
+WORKLOADS = BASE_DIR / "benchmarks" / "workloads.json"
+
+
+def parity_texts(max_sections: int = 100) -> list[str]:
+    """Benchmark queries (English, Hindi, Hinglish) plus statute descriptions of ingestion length."""
+    with open(WORKLOADS, "r", encoding="utf-8") as f:
+        texts = [item["query"] for item in json.load(f)["query"]]
+    for filename in ("ipc_sections.csv", "bns_sections.csv"):
+        path = DATA_DIR / filename
+        if not path.exists():
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                if i >= max_sections // 2:
+                    break
+                texts.append(row["Description"])
+    return texts
+
+
+def per_query_ms(encode, texts: list[str]) -> float:
+    encode(texts[0])
+    start = time.perf_counter()
+    for text in texts:
+        encode(text)
+    return (time.perf_counter() - start) * 1000 / len(texts)
+
+
+def check_export(model_name: str, directory: str, texts: list[str], args) -> bool:
+    """False only if the fp32 export fails parity (a failing int8 model is just removed)."""
+    start = time.perf_counter()
+    reference = SentenceTransformer(model_name, device="cpu")
+    torch_load_ms = (time.perf_counter() - start) * 1000
+    torch_ms = per_query_ms(reference.encode, texts)
+    logger.info(f"  torch: load {torch_load_ms:.0f} ms, {torch_ms:.2f} ms/query")
+
+    passed = True
+    for quantized in ([True, False] if os.path.exists(os.path.join(directory, QUANTIZED_FILE)) else [False]):
+        start = time.perf_counter()
+        service = OnnxEmbeddingService(directory, max_workers=1, quantized=quantized)
+        load_ms = (time.perf_counter() - start) * 1000
+        report = parity_check(reference, service, texts)
+        onnx_ms = per_query_ms(lambda text: service.encode([text]), texts)
+        logger.info(f"  {report['model_file']}: load {load_ms:.0f} ms, {onnx_ms:.2f} ms/query, "
+                    f"cosine min {report['min_cosine']} mean {report['mean_cosine']} over {report['texts']} texts")
+
+        threshold = args.min_cosine if quantized else args.min_cosine_fp32
+        if report["min_cosine"] >= threshold:
+            continue
+        if quantized:
+            # Not a failure: the fp32 model checked next is still served
+            logger.warning(f"  int8 parity below {threshold}; removing it, the API will serve fp32")
+            os.remove(os.path.join(directory, QUANTIZED_FILE))
+        else:
+            passed = False
+            logger.error(f"  fp32 parity below {threshold}; export is not usable")
+            os.remove(os.path.join(directory, CONFIG_FILE))
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export embedding models to ONNX (optionally int8)")
+    parser.add_argument("models", nargs="*",
+                        default=["sentence-transformers/all-MiniLM-L6-v2", MULTILINGUAL_MODEL],
+                        help="SentenceTransformer models (default: the main and multilingual models)")
+    parser.add_argument("--output-dir", default=str(OUTPUT_DIR))
+    parser.add_argument("--no-quantize", action="store_true", help="Export fp32 only")
+    parser.add_argument("--min-cosine", type=float, default=0.98,
+                        help="Minimum per-text cosine to PyTorch for the int8 model")
+    parser.add_argument("--min-cosine-fp32", type=float, default=0.999,
+                        help="Minimum per-text cosine to PyTorch for the fp32 model")
+    parser.add_argument("--skip-check", action="store_true", help="Export without the parity check")
+    args = parser.parse_args()
+
+    texts = parity_texts()
+    failed = []
+    for model_name in args.models:
+        directory = export_dir(args.output_dir, model_name)
+        logger.info(f"Exporting {model_name} -> {directory}")
+        export_onnx_model(model_name, directory, quantize=not args.no_quantize)
+        if not args.skip_check and not check_export(model_name, directory, texts, args):
+            failed.append(model_name)
+
+    if failed:
+        logger.error(f"Parity check failed for: {', '.join(failed)}")
+        sys.exit(1)
+    logger.info("ONNX export complete. Set EMBEDDING_BACKEND=onnx to serve it.")
+
+
+if __name__ == "__main__":
+    main()
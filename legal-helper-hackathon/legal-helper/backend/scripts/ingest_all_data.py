@@ -1,10 +1,13 @@
 """
 Master Data Ingestion Script for Legal Helper
-Clears existing data and creates partitioned collections.
+Creates partitioned collections. By default runs incrementally: unchanged
+sources and chunks are skipped and only new/changed chunks are embedded.
+Pass --full to clear everything and rebuild from scratch.
 """
 import os
 import sys
 import csv
+import argparse
 import logging
 from pathlib import Path
 
@@ -17,10 +20,21 @@ load_dotenv()
 
 import chromadb
 from sentence_transformers import SentenceTransformer
-from PyPDF2 import PdfReader
-from datasets import load_dataset
 from huggingface_hub import login
 
+from app.utils.cache import bump_collection_version, file_sha256
+from app.utils.pdf_text import PageTextCache, extract_pdf_pages
+from app.utils.legal_chunker import CHUNKER_VERSION, chunk_legal_text
+from app.ingestion.incremental import IngestState, make_chunk_ids
+from app.ingestion.case_law import CaseLawCheckpoint, CaseLawPipeline
+from app.services.lexical_index import build_lexical_indexes, index_path
+from app.services.section_mapping import build_section_mapping, mapping_path
+from app.services.mmap_vector_store import export_mmap_indexes
+from app.services.ann_index import build_ann_index
+from app.services.unified_statutes import (
+    MULTILINGUAL_MODEL, UNIFIED_COLLECTION, build_unified_statutes, collection_model
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -37,6 +51,8 @@ else:
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 VECTORSTORE_DIR = BASE_DIR / "vectorstore"
+PAGE_CACHE = PageTextCache(BASE_DIR / "cache" / "pdf_pages")
+PDF_WORKERS = os.cpu_count()
 
 # Collection names
 COLLECTIONS = {
@@ -57,45 +73,33 @@ def get_embedding_model():
 def clear_all_collections(client: chromadb.PersistentClient):
     """Delete all existing collections."""
     logger.info("Clearing existing collections...")
-    for collection in client.list_collections():
-        logger.info(f"  Deleting: {collection.name}")
-        client.delete_collection(collection.name)
+    names = [collection.name for collection in client.list_collections()]
+    for name in names:
+        logger.info(f"  Deleting: {name}")
+        client.delete_collection(name)
+    bump_collection_version(str(VECTORSTORE_DIR), *names)
     logger.info("All collections cleared.")
 
 
-def extract_pdf_text(pdf_path: Path) -> str:
-    """Extract text from a PDF file."""
+def extract_pdf_pages_cached(pdf_path: Path, fingerprint: str = None) -> list[str]:
+    """Extract page text in parallel, reusing cached pages when the file is unchanged."""
     logger.info(f"Extracting text from: {pdf_path.name}")
-    reader = PdfReader(str(pdf_path))
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text
-
+    return extract_pdf_pages(pdf_path, workers=PDF_WORKERS, cache=PAGE_CACHE, file_hash=fingerprint)
 
-def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> list[str]:
-    """Split text into overlapping chunks."""
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-        if chunk.strip():
-            chunks.append(chunk.strip())
-        start = end - overlap
-    return chunks
 
-
-def ingest_ipc_csv(client: chromadb.PersistentClient, model: SentenceTransformer):
+def ingest_ipc_csv(client: chromadb.PersistentClient, model: SentenceTransformer, state: IngestState):
     """Ingest IPC sections from CSV into statutes_english collection."""
     csv_path = DATA_DIR / "ipc_sections.csv"
     logger.info(f"Ingesting IPC sections from: {csv_path.name}")
     
     collection = client.get_or_create_collection(name="statutes_english")
+    fingerprint = file_sha256(csv_path)
+    if state.should_skip(collection, csv_path.name, fingerprint):
+        logger.info(f"  Unchanged, skipping {csv_path.name}")
+        return
     
     documents = []
     metadatas = []
-    ids = []
     
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -111,24 +115,25 @@ def ingest_ipc_csv(client: chromadb.PersistentClient, model: SentenceTransformer
                 "source": "ipc_sections.csv",
                 "language": "english"
             })
-            ids.append(f"ipc_en_{i}")
     
-    # Generate embeddings and add to collection
-    embeddings = model.encode(documents).tolist()
-    collection.add(documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids)
-    logger.info(f"  Added {len(documents)} IPC sections")
+    ids = make_chunk_ids("ipc_en", documents)
+    state.write_chunks(collection, model, csv_path.name, documents, metadatas, ids, fingerprint)
+    logger.info(f"  Processed {len(documents)} IPC sections")
 
 
-def ingest_bns_csv(client: chromadb.PersistentClient, model: SentenceTransformer):
+def ingest_bns_csv(client: chromadb.PersistentClient, model: SentenceTransformer, state: IngestState):
     """Ingest BNS sections from CSV into statutes_english collection."""
     csv_path = DATA_DIR / "bns_sections.csv"
     logger.info(f"Ingesting BNS sections from: {csv_path.name}")
     
     collection = client.get_or_create_collection(name="statutes_english")
+    fingerprint = file_sha256(csv_path)
+    if state.should_skip(collection, csv_path.name, fingerprint):
+        logger.info(f"  Unchanged, skipping {csv_path.name}")
+        return
     
     documents = []
     metadatas = []
-    ids = []
     
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -146,15 +151,13 @@ def ingest_bns_csv(client: chromadb.PersistentClient, model: SentenceTransformer
                 "source": "bns_sections.csv",
                 "language": "english"
             })
-            ids.append(f"bns_en_{i}")
     
-    # Generate embeddings and add to collection
-    embeddings = model.encode(documents).tolist()
-    collection.add(documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids)
-    logger.info(f"  Added {len(documents)} BNS sections")
+    ids = make_chunk_ids("bns_en", documents)
+    state.write_chunks(collection, model, csv_path.name, documents, metadatas, ids, fingerprint)
+    logger.info(f"  Processed {len(documents)} BNS sections")
 
 
-def ingest_hindi_pdfs(client: chromadb.PersistentClient, model: SentenceTransformer):
+def ingest_hindi_pdfs(client: chromadb.PersistentClient, model: SentenceTransformer, state: IngestState):
     """Ingest Hindi IPC and BNS PDFs into statutes_hindi collection."""
     collection = client.get_or_create_collection(name="statutes_hindi")
     
@@ -167,32 +170,38 @@ def ingest_hindi_pdfs(client: chromadb.PersistentClient, model: SentenceTransfor
         pdf_path = DATA_DIR / filename
         if not pdf_path.exists():
             logger.warning(f"  File not found: {filename}")
+            state.remove_source(collection, filename)
+            continue
+        
+        file_hash = file_sha256(pdf_path)
+        # Re-chunk when the chunker changes even if the PDF itself did not
+        fingerprint = f"{file_hash}:{CHUNKER_VERSION}"
+        if state.should_skip(collection, filename, fingerprint):
+            logger.info(f"  Unchanged, skipping {filename}")
             continue
             
         logger.info(f"Ingesting Hindi {statute_type} from: {filename}")
-        text = extract_pdf_text(pdf_path)
-        chunks = chunk_text(text, chunk_size=800, overlap=150)
+        pages = extract_pdf_pages_cached(pdf_path, file_hash)
+        chunks = chunk_legal_text(pages, max_chars=800)
         
         documents = []
         metadatas = []
-        ids = []
         
-        for i, chunk in enumerate(chunks):
+        for i, (chunk, structure) in enumerate(chunks):
             documents.append(chunk)
             metadatas.append({
+                **structure,
                 "statute_type": statute_type,
                 "source": filename,
                 "language": "hindi",
                 "chunk_index": i
             })
-            ids.append(f"{statute_type.lower()}_hi_{i}")
         
-        embeddings = model.encode(documents).tolist()
-        collection.add(documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids)
-        logger.info(f"  Added {len(documents)} chunks from {filename}")
+        ids = make_chunk_ids(f"{statute_type.lower()}_hi", documents)
+        state.write_chunks(collection, model, filename, documents, metadatas, ids, fingerprint)
 
 
-def ingest_regulatory_pdfs(client: chromadb.PersistentClient, model: SentenceTransformer):
+def ingest_regulatory_pdfs(client: chromadb.PersistentClient, model: SentenceTransformer, state: IngestState):
     """Ingest regulatory PDFs into regulations collection with domain tags."""
     collection = client.get_or_create_collection(name="regulations")
     
@@ -206,32 +215,38 @@ def ingest_regulatory_pdfs(client: chromadb.PersistentClient, model: SentenceTra
         pdf_path = DATA_DIR / filename
         if not pdf_path.exists():
             logger.warning(f"  File not found: {filename}")
+            state.remove_source(collection, filename)
+            continue
+        
+        file_hash = file_sha256(pdf_path)
+        # Re-chunk when the chunker changes even if the PDF itself did not
+        fingerprint = f"{file_hash}:{CHUNKER_VERSION}"
+        if state.should_skip(collection, filename, fingerprint):
+            logger.info(f"  Unchanged, skipping {filename}")
             continue
             
         logger.info(f"Ingesting {domain} regulations from: {filename}")
-        text = extract_pdf_text(pdf_path)
-        chunks = chunk_text(text, chunk_size=1000, overlap=200)
+        pages = extract_pdf_pages_cached(pdf_path, file_hash)
+        chunks = chunk_legal_text(pages, max_chars=1000)
         
         documents = []
         metadatas = []
-        ids = []
         
-        for i, chunk in enumerate(chunks):
+        for i, (chunk, structure) in enumerate(chunks):
             documents.append(chunk)
             metadatas.append({
+                **structure,
                 "domain": domain,
                 "source": filename,
                 "act_name": filename.replace(".pdf", "").title(),
                 "chunk_index": i
             })
-            ids.append(f"reg_{domain.lower()}_{i}")
         
-        embeddings = model.encode(documents).tolist()
-        collection.add(documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids)
-        logger.info(f"  Added {len(documents)} chunks from {filename}")
+        ids = make_chunk_ids(f"reg_{domain.lower()}", documents)
+        state.write_chunks(collection, model, filename, documents, metadatas, ids, fingerprint)
 
 
-def ingest_ipc_bns_mapping(client: chromadb.PersistentClient, model: SentenceTransformer):
+def ingest_ipc_bns_mapping(client: chromadb.PersistentClient, model: SentenceTransformer, state: IngestState):
     """Ingest IPC-BNS comparison PDFs into mapping collection."""
     collection = client.get_or_create_collection(name="ipc_bns_mapping")
     
@@ -244,97 +259,64 @@ def ingest_ipc_bns_mapping(client: chromadb.PersistentClient, model: SentenceTra
         pdf_path = DATA_DIR / filename
         if not pdf_path.exists():
             logger.warning(f"  File not found: {filename}")
+            state.remove_source(collection, filename)
+            continue
+        
+        file_hash = file_sha256(pdf_path)
+        # Re-chunk when the chunker changes even if the PDF itself did not
+        fingerprint = f"{file_hash}:{CHUNKER_VERSION}"
+        if state.should_skip(collection, filename, fingerprint):
+            logger.info(f"  Unchanged, skipping {filename}")
             continue
             
         logger.info(f"Ingesting IPC-BNS mapping from: {filename}")
-        text = extract_pdf_text(pdf_path)
-        chunks = chunk_text(text, chunk_size=1200, overlap=250)
+        pages = extract_pdf_pages_cached(pdf_path, file_hash)
+        chunks = chunk_legal_text(pages, max_chars=1200)
         
         documents = []
         metadatas = []
-        ids = []
         
-        for i, chunk in enumerate(chunks):
+        for i, (chunk, structure) in enumerate(chunks):
             documents.append(chunk)
             metadatas.append({
+                **structure,
                 "source": filename,
                 "type": "mapping" if "vs" in filename.lower() else "explanation",
                 "chunk_index": i
             })
-            ids.append(f"mapping_{filename[:10]}_{i}")
         
-        embeddings = model.encode(documents).tolist()
-        collection.add(documents=documents, embeddings=embeddings, metadatas=metadatas, ids=ids)
-        logger.info(f"  Added {len(documents)} chunks from {filename}")
+        ids = make_chunk_ids(f"mapping_{filename[:10]}", documents)
+        state.write_chunks(collection, model, filename, documents, metadatas, ids, fingerprint)
 
 
-def ingest_case_law(client: chromadb.PersistentClient, model: SentenceTransformer, max_cases: int = 1500):
+def ingest_case_law(client: chromadb.PersistentClient, model: SentenceTransformer, state: IngestState,
+                    max_cases: int = 1500, source: str = None):
     """
-    Ingest case law from HuggingFace InJudgements dataset.
+    Ingest case law from HuggingFace InJudgements dataset (or a local JSONL/Parquet stand-in).
     Balances between Supreme Court and High Court cases.
     """
-    logger.info(f"Loading InJudgements dataset from HuggingFace (target: {max_cases} cases)...")
+    logger.info(f"Streaming case law (target: {max_cases} cases)...")
     
     try:
-        # Load the dataset in streaming mode to avoid downloading everything
-        dataset = load_dataset("opennyaiorg/InJudgements_dataset", split="train", streaming=True)
-        
         collection = client.get_or_create_collection(name="case_law")
+        checkpoint = CaseLawCheckpoint(VECTORSTORE_DIR / "case_law_checkpoint.json")
+        if state.incremental:
+            checkpoint.load()
+        else:
+            checkpoint.reset()
         
-        documents = []
-        metadatas = []
-        ids = []
-        
-        sc_count = 0
-        hc_count = 0
-        target_sc = max_cases // 3  # ~500 Supreme Court
-        target_hc = max_cases - target_sc  # ~1000 High Court
-        
-        for i, case in enumerate(dataset):
-            # Determine court type from the case
-            text = case.get('Text', case.get('judgment', ''))[:10000]  # Limit text size
-            court = "Supreme Court" if "Supreme Court" in text[:500] else "High Court"
-            
-            # Balance courts
-            if court == "Supreme Court":
-                if sc_count >= target_sc:
-                    continue
-                sc_count += 1
-            else:
-                if hc_count >= target_hc:
-                    if sc_count >= target_sc:
-                        break  # Done with both quotas
-                    continue
-                hc_count += 1
-            
-            # Create searchable chunk (first 3000 chars for embedding)
-            doc_text = text[:3000] if len(text) > 3000 else text
-            
-            documents.append(doc_text)
-            metadatas.append({
-                "court": court,
-                "case_id": case.get('id', f"case_{i}"),
-                "source": "InJudgements_dataset"
-            })
-            ids.append(f"case_{sc_count + hc_count}")
-            
-            if (sc_count + hc_count) % 100 == 0:
-                logger.info(f"  Progress: {sc_count + hc_count} cases (SC: {sc_count}, HC: {hc_count})")
-            
-            if sc_count + hc_count >= max_cases:
-                break
-        
-        # Add to collection in batches
-        batch_size = 100
-        for j in range(0, len(documents), batch_size):
-            batch_docs = documents[j:j+batch_size]
-            batch_meta = metadatas[j:j+batch_size]
-            batch_ids = ids[j:j+batch_size]
-            
-            embeddings = model.encode(batch_docs).tolist()
-            collection.add(documents=batch_docs, embeddings=embeddings, metadatas=batch_meta, ids=batch_ids)
+        pipeline = CaseLawPipeline(
+            collection, model,
+            max_cases=max_cases,
+            source=source,
+            checkpoint=checkpoint,
+            skip_existing=state.incremental
+        )
+        stats = pipeline.run()
+        if stats["written"]:
+            state.changed_collections.add(collection.name)
         
-        logger.info(f"  Added {len(documents)} cases (Supreme Court: {sc_count}, High Court: {hc_count})")
+        logger.info(f"  Added {stats['written']} cases ({stats['skipped_existing']} already stored)")
         
     except Exception as e:
         logger.error(f"Error loading case law dataset: {e}")
@@ -343,6 +325,26 @@ def ingest_case_law(client: chromadb.PersistentClient, model: SentenceTransforme
 
 def main():
     """Main ingestion workflow."""
+    parser = argparse.ArgumentParser(description="Legal Helper data ingestion")
+    parser.add_argument("--full", action="store_true",
+                        help="Delete all collections and rebuild from scratch instead of syncing incrementally")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Processes used for page-parallel PDF extraction")
+    parser.add_argument("--max-cases", type=int, default=1500,
+                        help="Number of judgments to ingest into case_law")
+    parser.add_argument("--cases-file", default=None,
+                        help="Local JSONL/Parquet case dump to use instead of the HuggingFace stream")
+    parser.add_argument("--vectorstore-dir", default=None,
+                        help="Build into this directory instead of backend/vectorstore (e.g. a benchmark fixture)")
+    parser.add_argument("--unified-statutes", action="store_true",
+                        help="Also build statutes_unified (rebuilt automatically once it exists)")
+    args = parser.parse_args()
+    
+    global PDF_WORKERS, VECTORSTORE_DIR
+    PDF_WORKERS = args.workers
+    if args.vectorstore_dir:
+        VECTORSTORE_DIR = Path(args.vectorstore_dir)
+    
     logger.info("=" * 60)
     logger.info("LEGAL HELPER - DATA INGESTION PIPELINE")
     logger.info("=" * 60)
@@ -350,9 +352,20 @@ def main():
     # Initialize ChromaDB client
     logger.info(f"Initializing ChromaDB at: {VECTORSTORE_DIR}")
     client = chromadb.PersistentClient(path=str(VECTORSTORE_DIR))
+    state = IngestState(VECTORSTORE_DIR, incremental=not args.full)
     
-    # Clear existing data
-    clear_all_collections(client)
+    # Read before --full clears it: an existing unified index is rebuilt with the same model
+    unified_model = None
+    for collection in client.list_collections():
+        if collection.name == UNIFIED_COLLECTION:
+            unified_model = collection_model(collection) or MULTILINGUAL_MODEL
+    
+    if args.full:
+        # Clear existing data
+        clear_all_collections(client)
+        state.manifest.clear()
+    else:
+        logger.info("Incremental mode: unchanged sources and chunks will be skipped")
     
     # Initialize embedding model
     model = get_embedding_model()
@@ -363,20 +376,22 @@ def main():
     logger.info("=" * 40)
     
     # 1. English statutes
-    ingest_ipc_csv(client, model)
-    ingest_bns_csv(client, model)
+    ingest_ipc_csv(client, model, state)
+    ingest_bns_csv(client, model, state)
     
     # 2. Hindi statutes
-    ingest_hindi_pdfs(client, model)
+    ingest_hindi_pdfs(client, model, state)
     
     # 3. Regulatory documents
-    ingest_regulatory_pdfs(client, model)
+    ingest_regulatory_pdfs(client, model, state)
     
     # 4. IPC-BNS mapping
-    ingest_ipc_bns_mapping(client, model)
+    ingest_ipc_bns_mapping(client, model, state)
     
     # 5. Case law (optional - can be slow)
-    ingest_case_law(client, model, max_cases=1500)
+    ingest_case_law(client, model, state, max_cases=args.max_cases, source=args.cases_file)
+    
+    state.manifest.save()
     
     # Summary
     logger.info("\n" + "=" * 40)
@@ -387,6 +402,39 @@ def main():
         count = collection.count()
         logger.info(f"  {collection.name}: {count} documents")
     
+    # Rebuild BM25 / section-number indexes for collections that changed (or have none yet)
+    changed = set(COLLECTIONS) if args.full else state.changed_collections
+    
+    # Keep the bilingual statute index in step with the two statute collections
+    statutes_changed = changed & {"statutes_english", "statutes_hindi"}
+    if args.unified_statutes or (statutes_changed and unified_model):
+        logger.info(f"Building {UNIFIED_COLLECTION}...")
+        build_unified_statutes(client, unified_model or MULTILINGUAL_MODEL)
+        changed.add(UNIFIED_COLLECTION)
+    stale_lexical = changed | {
+        name for name in COLLECTIONS if not os.path.exists(index_path(str(VECTORSTORE_DIR), name))
+    }
+    logger.info("Building lexical indexes...")
+    build_lexical_indexes(client, str(VECTORSTORE_DIR), sorted(stale_lexical))
+    
+    # Precompute the IPC -> BNS table served by /api/compare
+    if changed & {"statutes_english", "ipc_bns_mapping"} or not os.path.exists(mapping_path(str(VECTORSTORE_DIR))):
+        logger.info("Building IPC-BNS section mapping...")
+        build_section_mapping(client, str(VECTORSTORE_DIR),
+                              sample_data_path=str(DATA_DIR / "sample" / "sample_legal_data.json"))
+    
+    # Refresh the memory-mapped exports used by retrieval_backend="mmap"
+    if changed:
+        logger.info("Exporting memory-mapped embedding matrices...")
+        export_mmap_indexes(client, str(VECTORSTORE_DIR), sorted(changed), dtype=os.getenv("MMAP_DTYPE", "float16"))
+    if "case_law" in changed:
+        logger.info("Building case-law ANN index...")
+        build_ann_index(str(VECTORSTORE_DIR), "case_law")
+    
+    # Invalidate retrieval caches in running API workers
+    if changed:
+        bump_collection_version(str(VECTORSTORE_DIR), *changed)
+    
     logger.info("\nData ingestion complete!")
 
 
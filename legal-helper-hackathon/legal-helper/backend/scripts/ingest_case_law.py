@@ -1,9 +1,12 @@
 """
 Case Law Only Ingestion Script
-Adds case law from HuggingFace without clearing existing data.
+Streams case law from HuggingFace (or a local JSONL/Parquet dump) into the
+case_law collection without touching other collections. Resumes from the
+last checkpoint unless --fresh is given.
 """
 import os
 import sys
+import argparse
 import logging
 from pathlib import Path
 
@@ -16,110 +19,76 @@ load_dotenv()
 
 import chromadb
 from sentence_transformers import SentenceTransformer
-from datasets import load_dataset
 from huggingface_hub import login
 
+from app.utils.cache import bump_collection_version
+from app.ingestion.case_law import CaseLawCheckpoint, CaseLawPipeline
+from app.services.lexical_index import build_lexical_indexes
+from app.services.mmap_vector_store import export_mmap_indexes
+from app.services.ann_index import build_ann_index
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# HuggingFace authentication
-HF_TOKEN = os.getenv("HF_TOKEN") or os.getenv("HUGGINGFACE_TOKEN")
-if HF_TOKEN:
-    logger.info("Logging in to HuggingFace with token...")
-    login(token=HF_TOKEN)
-else:
-    logger.error("No HF_TOKEN found in .env! Please add HF_TOKEN=your_token to .env file")
-    sys.exit(1)
-
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 VECTORSTORE_DIR = BASE_DIR / "vectorstore"
 
 
-def ingest_case_law(client: chromadb.PersistentClient, model: SentenceTransformer, max_cases: int = 1500):
+def ingest_case_law(client: chromadb.PersistentClient, model: SentenceTransformer, max_cases: int = 1500,
+                    source: str = None, batch_size: int = 256, fresh: bool = False):
     """
     Ingest case law from HuggingFace InJudgements dataset.
     Balances between Supreme Court and High Court cases.
     """
-    logger.info(f"Loading InJudgements dataset from HuggingFace (target: {max_cases} cases)...")
-    
-    # Load the dataset in streaming mode
-    dataset = load_dataset("opennyaiorg/InJudgements_dataset", split="train", streaming=True)
+    logger.info(f"Streaming case law (target: {max_cases} cases)...")
     
-    # Delete existing collection to remove bad data
-    try:
-        client.delete_collection("case_law")
-        logger.info("Deleted existing case_law collection")
-    except Exception:
-        pass
+    checkpoint = CaseLawCheckpoint(VECTORSTORE_DIR / "case_law_checkpoint.json")
+    if fresh:
+        # Delete existing collection to remove bad data
+        try:
+            client.delete_collection("case_law")
+            logger.info("Deleted existing case_law collection")
+        except Exception:
+            pass
+        checkpoint.reset()
+    else:
+        checkpoint.load()
 
     collection = client.get_or_create_collection(name="case_law")
     
-    documents = []
-    metadatas = []
-    ids = []
-    
-    sc_count = 0
-    hc_count = 0
-    target_sc = max_cases // 3  # ~500 Supreme Court
-    target_hc = max_cases - target_sc  # ~1000 High Court
-    skipped = 0
-    
-    logger.info("Streaming cases and balancing courts...")
+    pipeline = CaseLawPipeline(
+        collection, model,
+        max_cases=max_cases,
+        source=source,
+        batch_size=batch_size,
+        checkpoint=checkpoint
+    )
+    stats = pipeline.run()
     
-    for i, case in enumerate(dataset):
-        # Determine court type from the case
-        text = case.get('Text', case.get('judgment', ''))[:10000]
-        court = "Supreme Court" if "Supreme Court" in text[:500] else "High Court"
-        
-        # Balance courts
-        if court == "Supreme Court":
-            if sc_count >= target_sc:
-                skipped += 1
-                continue
-            sc_count += 1
-        else:
-            if hc_count >= target_hc:
-                if sc_count >= target_sc:
-                    break
-                skipped += 1
-                continue
-            hc_count += 1
-        
-        # Create searchable chunk
-        doc_text = text[:3000] if len(text) > 3000 else text
-        
-        documents.append(doc_text)
-        metadatas.append({
-            "court": court,
-            "case_id": case.get('id', f"case_{i}"),
-            "source": "InJudgements_dataset"
-        })
-        ids.append(f"case_{sc_count + hc_count}")
-        
-        if (sc_count + hc_count) % 100 == 0:
-            logger.info(f"  Progress: {sc_count + hc_count} cases (SC: {sc_count}, HC: {hc_count}), skipped: {skipped}")
-        
-        if sc_count + hc_count >= max_cases:
-            break
-    
-    # Add to collection in batches
-    logger.info(f"Embedding and storing {len(documents)} cases...")
-    batch_size = 100
-    for j in range(0, len(documents), batch_size):
-        batch_docs = documents[j:j+batch_size]
-        batch_meta = metadatas[j:j+batch_size]
-        batch_ids = ids[j:j+batch_size]
-        
-        embeddings = model.encode(batch_docs).tolist()
-        collection.add(documents=batch_docs, embeddings=embeddings, metadatas=batch_meta, ids=batch_ids)
-        logger.info(f"  Batch {j//batch_size + 1}/{(len(documents)-1)//batch_size + 1} complete")
-    
-    logger.info(f"Added {len(documents)} cases (Supreme Court: {sc_count}, High Court: {hc_count})")
+    logger.info(f"Added {stats['written']} cases ({stats['skipped_existing']} already stored)")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Case law ingestion")
+    parser.add_argument("--max-cases", type=int, default=1500)
+    parser.add_argument("--source", default=None,
+                        help="Local JSONL/Parquet case dump to use instead of the HuggingFace stream")
+    parser.add_argument("--batch-size", type=int, default=256, help="Cases per embedding batch")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Delete the case_law collection and checkpoint before ingesting")
+    args = parser.parse_args()
+
+    # HuggingFace authentication (only needed for the remote dataset)
+    hf_token = os.getenv("HF_TOKEN") or os.getenv("HUGGINGFACE_TOKEN")
+    if hf_token:
+        logger.info("Logging in to HuggingFace with token...")
+        login(token=hf_token)
+    elif args.source is None:
+        logger.error("No HF_TOKEN found in .env! Please add HF_TOKEN=your_token to .env file")
+        sys.exit(1)
+
     logger.info("=" * 50)
     logger.info("CASE LAW INGESTION")
     logger.info("=" * 50)
@@ -129,7 +98,12 @@ def main():
     model = SentenceTransformer('all-MiniLM-L6-v2', device="cpu")
     
     # Run ingestion
-    ingest_case_law(client, model, max_cases=1500)
+    ingest_case_law(client, model, max_cases=args.max_cases, source=args.source,
+                    batch_size=args.batch_size, fresh=args.fresh)
+    build_lexical_indexes(client, str(VECTORSTORE_DIR), ["case_law"])
+    export_mmap_indexes(client, str(VECTORSTORE_DIR), ["case_law"], dtype=os.getenv("MMAP_DTYPE", "float16"))
+    build_ann_index(str(VECTORSTORE_DIR), "case_law")
+    bump_collection_version(str(VECTORSTORE_DIR), "case_law")
     
     # Summary
     logger.info("\n" + "=" * 50)
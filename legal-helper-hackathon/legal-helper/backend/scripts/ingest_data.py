@@ -10,7 +10,8 @@ import sys
 # Add backend directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.utils.text_processing import chunk_text, create_legal_metadata
+from app.utils.text_processing import create_legal_metadata
+from app.utils.cache import bump_collection_version
 
 # Configuration
 CHROMADB_PATH = "./vectorstore"
@@ -85,6 +86,7 @@ def ingest_data():
             , embeddings=[embedding]
         )
 
+    bump_collection_version(CHROMADB_PATH, "legal_statutes", "legal_cases")
     logger.info("Data ingestion complete!")
 
 if __name__ == "__main__":
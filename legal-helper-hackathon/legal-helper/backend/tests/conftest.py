@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# Tests import the app package the same way the scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# app.config requires a Groq key at import; tests never call the API
+os.environ.setdefault("GROQ_API_KEY", "test")
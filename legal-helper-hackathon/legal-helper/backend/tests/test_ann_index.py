@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.ann_index import AnnIndexStore, build_ann_index
+from app.services.mmap_vector_store import MMAP_DIR, MmapVectorStore, publish_version
+
+N, DIM = 2000, 32
+
+
+def _export(vectorstore_path, name: str, matrix):
+    """Write an mmap export the way export_collection does, without Chroma."""
+    collection_dir = os.path.join(vectorstore_path, MMAP_DIR, name)
+    version_dir = os.path.join(collection_dir, "v1")
+    os.makedirs(version_dir)
+    np.save(os.path.join(version_dir, "embeddings.npy"), matrix)
+    np.save(os.path.join(version_dir, "sq_norms.npy"), np.einsum("ij,ij->i", matrix, matrix))
+    records = {
+        "ids": [f"doc{i}" for i in range(len(matrix))],
+        "documents": [f"text {i}" for i in range(len(matrix))],
+        "metadatas": [{"court": "SC" if i % 4 == 0 else "HC"} for i in range(len(matrix))]
+    }
+    with open(os.path.join(version_dir, "records.json"), "w", encoding="utf-8") as f:
+        json.dump(records, f)
+    publish_version(collection_dir, "v1")
+
+
+@pytest.fixture(scope="module")
+def stores(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("vectorstore"))
+    rng = np.random.default_rng(0)
+    # Clustered data, like embeddings, so IVF partitions are meaningful
+    centers = rng.normal(size=(20, DIM)).astype(np.float32)
+    matrix = centers[rng.integers(0, 20, size=N)] + 0.3 * rng.normal(size=(N, DIM)).astype(np.float32)
+    _export(path, "case_law", matrix.astype(np.float32))
+    assert build_ann_index(path, "case_law", nlist=32) == N
+    mmap_store = MmapVectorStore(path)
+    return mmap_store.get("case_law"), AnnIndexStore(path, mmap_store).get("case_law"), matrix
+
+
+def _queries(matrix, count=20):
+    rng = np.random.default_rng(1)
+    return matrix[rng.choice(len(matrix), size=count, replace=False)] + 0.05
+
+
+def test_ann_matches_exact_with_every_partition_probed(stores):
+    exact, ann, matrix = stores
+    for query in _queries(matrix):
+        expected = exact.query(query, 10)
+        found = ann.search(query, 10, nprobe=32, rerank_k=200)
+        assert found["ids"] == expected["ids"]
+        # Re-ranking on the exact vectors returns exact distances
+        assert np.allclose(found["distances"][0], expected["distances"][0], rtol=1e-4, atol=1e-4)
+
+
+def test_ann_recall_with_few_partitions(stores):
+    exact, ann, matrix = stores
+    hits = total = 0
+    for query in _queries(matrix):
+        expected = set(exact.query(query, 10)["ids"][0])
+        hits += len(expected & set(ann.search(query, 10, nprobe=8, rerank_k=100)["ids"][0]))
+        total += len(expected)
+    assert hits / total >= 0.9
+
+
+def test_ann_filter_matches_exact(stores):
+    exact, ann, matrix = stores
+    where = {"court": "SC"}
+    for query in _queries(matrix, count=5):
+        found = ann.search(query, 5, where, nprobe=32, rerank_k=200)
+        assert all(metadata["court"] == "SC" for metadata in found["metadatas"][0])
+        assert found["ids"] == exact.query(query, 5, where)["ids"]
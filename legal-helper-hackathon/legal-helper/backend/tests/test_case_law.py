@@ -0,0 +1,89 @@
+import json
+
+from app.ingestion.case_law import CaseLawCheckpoint, CaseLawPipeline, iter_cases
+
+
+def _write_jsonl(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            court = "Supreme Court" if i % 3 == 0 else "High Court"
+            f.write(json.dumps({"id": f"c{i}", "Text": f"In the {court} of India. Judgment number {i}."}) + "\n")
+            if i == 4:
+                f.write("\n")  # blank lines are not records
+
+
+def test_iter_cases_counts_records_not_lines(tmp_path):
+    source = str(tmp_path / "cases.jsonl")
+    _write_jsonl(source, 10)
+    cases = list(iter_cases(source))
+    assert [position for position, _, _ in cases] == list(range(10))
+    assert [case["id"] for _, _, case in cases] == [f"c{i}" for i in range(10)]
+
+
+def test_iter_cases_seeks_to_saved_offset(tmp_path):
+    source = str(tmp_path / "cases.jsonl")
+    _write_jsonl(source, 10)
+    offsets = {position: offset for position, offset, _ in iter_cases(source)}
+
+    resumed = list(iter_cases(source, start=6, offset=offsets[5]))
+    assert [(position, case["id"]) for position, _, case in resumed] == [(i, f"c{i}") for i in range(6, 10)]
+    # Without an offset (older checkpoints) the records before start are skipped by counting
+    assert [position for position, _, _ in iter_cases(source, start=6)] == [6, 7, 8, 9]
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+
+    def get(self, ids, include):
+        return {"ids": [doc_id for doc_id in ids if doc_id in self.docs]}
+
+    def upsert(self, ids, documents, metadatas, embeddings):
+        self.docs.update(zip(ids, metadatas))
+
+
+class FakeModel:
+    class _Rows(list):
+        def tolist(self):
+            return list(self)
+
+    def encode(self, texts):
+        return self._Rows([[0.0, 1.0]] * len(texts))
+
+
+def test_pipeline_resumes_after_checkpoint(tmp_path):
+    source = str(tmp_path / "cases.jsonl")
+    _write_jsonl(source, 30)
+    checkpoint = CaseLawCheckpoint(tmp_path / "checkpoint.json")
+    collection = FakeCollection()
+
+    CaseLawPipeline(collection, FakeModel(), max_cases=9, source=source, batch_size=4,
+                    checkpoint=checkpoint).run()
+    assert len(collection.docs) == 9
+    assert checkpoint.offset > 0
+
+    resumed = CaseLawCheckpoint(tmp_path / "checkpoint.json")
+    resumed.load()
+    assert (resumed.position, resumed.offset) == (checkpoint.position, checkpoint.offset)
+    stats = CaseLawPipeline(collection, FakeModel(), max_cases=15, source=source, batch_size=4,
+                            checkpoint=resumed).run()
+    # Only new records are read: nothing already stored is seen again
+    assert stats["skipped_existing"] == 0
+    assert len(collection.docs) == 15
+    assert {m["case_id"] for m in collection.docs.values()} <= {f"c{i}" for i in range(30)}
+
+
+def test_repeated_judgment_in_one_batch_is_stored_once(tmp_path):
+    source = tmp_path / "cases.jsonl"
+    case = {"id": "c0", "Text": "In the High Court of Delhi. The same judgment, published twice."}
+    source.write_text("\n".join(json.dumps({**case, "id": f"c{i}"}) for i in range(3)) + "\n", encoding="utf-8")
+
+    class StrictCollection(FakeCollection):
+        def upsert(self, ids, documents, metadatas, embeddings):
+            assert len(ids) == len(set(ids)), "duplicate IDs in one upsert"
+            super().upsert(ids, documents, metadatas, embeddings)
+
+    collection = StrictCollection()
+    stats = CaseLawPipeline(collection, FakeModel(), max_cases=10, source=str(source), batch_size=8).run()
+    assert stats == {"written": 1, "skipped_existing": 2}
+    assert len(collection.docs) == 1
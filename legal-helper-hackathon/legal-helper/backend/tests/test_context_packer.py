@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("langdetect")
+
+from app.services.context_packer import estimate_tokens, pack_context
+
+
+def _doc(text: str, citation: str) -> dict:
+    return {"text": text, "citation": citation, "relevance_score": 0.9}
+
+
+def _sentences(topic: str, count: int) -> str:
+    return " ".join(f"Sentence {i} about {topic} and the punishment prescribed for it." for i in range(count))
+
+
+def test_estimate_tokens_by_script():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 10) == 10
+    # Devanagari is denser: ~1.5 characters per token
+    assert estimate_tokens("हत्या") > estimate_tokens("abcde")
+
+
+@pytest.mark.parametrize("budget", [60, 150, 400, 1000])
+def test_packed_context_never_exceeds_budget(budget):
+    documents = [_doc(_sentences(f"topic{n}", 20), f"Doc {n}") for n in range(6)]
+    packed = pack_context("punishment for topic3", documents, budget, doc_max_tokens=300)
+    assert packed
+    assert sum(estimate_tokens(doc["text"]) for doc in packed) <= budget
+    assert all(estimate_tokens(doc["text"]) <= 300 for doc in packed)
+
+
+def test_documents_keep_relevance_order_and_fields():
+    documents = [_doc(_sentences("murder", 3), "IPC 302"), _doc(_sentences("theft", 3), "IPC 379")]
+    packed = pack_context("murder", documents, 1000, 500)
+    assert [doc["citation"] for doc in packed] == ["IPC 302", "IPC 379"]
+    assert packed[0]["relevance_score"] == 0.9
+    # Copies: the retrieved documents are not modified
+    assert documents[0]["text"] == _sentences("murder", 3)
+
+
+def test_repeated_sentences_are_dropped():
+    shared = "Whoever commits murder shall be punished with death."
+    documents = [
+        _doc(f"{shared} The first window ends here.", "chunk 1"),
+        _doc(f"{shared} The second window adds this sentence.", "chunk 2"),
+        _doc(shared, "chunk 3"),
+    ]
+    packed = pack_context("murder", documents, 1000, 500)
+    assert [doc["citation"] for doc in packed] == ["chunk 1", "chunk 2"]
+    assert shared not in packed[1]["text"]
+
+
+def test_long_document_keeps_query_relevant_sentences():
+    filler = " ".join(f"Procedural note {i} on the filing of appeals." for i in range(40))
+    text = f"{filler} The court held that dowry death attracts section 304B. {filler}"
+    packed = pack_context("dowry death", [_doc(text, "case")], 1000, doc_max_tokens=60)
+    assert "dowry death attracts section 304B" in packed[0]["text"]
+    assert estimate_tokens(packed[0]["text"]) <= 60
+
+
+def test_stops_when_budget_too_small_for_another_document():
+    documents = [_doc(_sentences("a", 10), "first"), _doc(_sentences("b", 10), "second")]
+    first_cost = estimate_tokens(pack_context("a", documents[:1], 10000, 10000)[0]["text"])
+    packed = pack_context("a", documents, first_cost + 10, 10000)
+    assert [doc["citation"] for doc in packed] == ["first"]
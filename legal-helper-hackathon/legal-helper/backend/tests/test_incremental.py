@@ -0,0 +1,119 @@
+from app.ingestion.incremental import IngestManifest, IngestState, make_chunk_ids
+
+
+class FakeCollection:
+    """The subset of the Chroma collection API that IngestState uses."""
+
+    def __init__(self, name: str = "statutes_english"):
+        self.name = name
+        self.rows = {}
+        self.embedded = []
+
+    def get(self, where=None, include=None, limit=None):
+        ids = [doc_id for doc_id, row in self.rows.items()
+               if not where or all(row["metadata"].get(k) == v for k, v in where.items())]
+        ids = ids[:limit] if limit else ids
+        return {"ids": ids, "metadatas": [self.rows[doc_id]["metadata"] for doc_id in ids]}
+
+    def upsert(self, documents, embeddings, metadatas, ids):
+        self.embedded.extend(ids)
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self.rows[doc_id] = {"document": document, "metadata": metadata}
+
+    def update(self, ids, metadatas):
+        for doc_id, metadata in zip(ids, metadatas):
+            self.rows[doc_id]["metadata"] = metadata
+
+    def delete(self, ids):
+        for doc_id in ids:
+            self.rows.pop(doc_id, None)
+
+
+class FakeModel:
+    class _Rows(list):
+        def tolist(self):
+            return list(self)
+
+    def encode(self, texts):
+        return self._Rows([[0.0]] * len(texts))
+
+
+def _write(state, collection, documents, source="ipc.pdf", page=1, fingerprint="v1"):
+    metadatas = [{"source": source, "page": page} for _ in documents]
+    ids = make_chunk_ids("ipc", documents)
+    return state.write_chunks(collection, FakeModel(), source, documents, metadatas, ids, fingerprint)
+
+
+def test_chunk_ids_are_content_addressed():
+    ids = make_chunk_ids("ipc", ["a", "b", "a"])
+    assert ids[0] != ids[1]
+    assert ids[2] == f"{ids[0]}_1"
+    assert make_chunk_ids("ipc", ["b"]) == [ids[1]]
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest = IngestManifest(tmp_path)
+    manifest.record("statutes_english", "ipc.pdf", "v1")
+    manifest.save()
+    reloaded = IngestManifest(tmp_path)
+    assert reloaded.is_unchanged("statutes_english", "ipc.pdf", "v1")
+    assert not reloaded.is_unchanged("statutes_english", "ipc.pdf", "v2")
+    assert not reloaded.is_unchanged("statutes_hindi", "ipc.pdf", "v1")
+    reloaded.forget("statutes_english", "ipc.pdf")
+    assert not reloaded.is_unchanged("statutes_english", "ipc.pdf", "v1")
+
+
+def test_diff_adds_updates_and_deletes(tmp_path):
+    state = IngestState(tmp_path)
+    collection = FakeCollection()
+    assert _write(state, collection, ["one", "two", "three"]) == \
+        {"added": 3, "updated": 0, "unchanged": 0, "deleted": 0}
+
+    collection.embedded.clear()
+    state = IngestState(tmp_path)
+    # "two" edited, "three" unchanged but with new metadata, "one" removed
+    stats = _write(state, collection, ["two (amended)", "three"], page=2, fingerprint="v2")
+    assert stats == {"added": 1, "updated": 1, "unchanged": 0, "deleted": 2}
+    assert collection.embedded == make_chunk_ids("ipc", ["two (amended)"])
+    assert sorted(row["document"] for row in collection.rows.values()) == ["three", "two (amended)"]
+    assert state.changed_collections == {"statutes_english"}
+
+
+def test_unchanged_source_is_skipped(tmp_path):
+    state = IngestState(tmp_path)
+    collection = FakeCollection()
+    _write(state, collection, ["one", "two"])
+    state.manifest.save()
+
+    state = IngestState(tmp_path)
+    assert state.should_skip(collection, "ipc.pdf", "v1")
+    assert not state.should_skip(collection, "ipc.pdf", "v2")
+    stats = _write(state, collection, ["one", "two"])
+    assert stats == {"added": 0, "updated": 0, "unchanged": 2, "deleted": 0}
+    assert state.changed_collections == set()
+
+    # A fingerprint match is not enough if the chunks are gone from the collection
+    collection.rows.clear()
+    assert not state.should_skip(collection, "ipc.pdf", "v1")
+
+
+def test_full_mode_embeds_everything(tmp_path):
+    state = IngestState(tmp_path, incremental=False)
+    collection = FakeCollection()
+    _write(state, collection, ["one", "two"])
+    assert not state.should_skip(collection, "ipc.pdf", "v1")
+    stats = _write(state, collection, ["one", "two"])
+    assert stats["added"] == 2
+    assert len(collection.embedded) == 4
+
+
+def test_remove_source(tmp_path):
+    state = IngestState(tmp_path)
+    collection = FakeCollection()
+    _write(state, collection, ["one"], source="old.pdf")
+    _write(state, collection, ["two"], source="ipc.pdf")
+    state.changed_collections.clear()
+    state.remove_source(collection, "old.pdf")
+    assert [row["metadata"]["source"] for row in collection.rows.values()] == ["ipc.pdf"]
+    assert not state.manifest.is_unchanged("statutes_english", "old.pdf", "v1")
+    assert state.changed_collections == {"statutes_english"}
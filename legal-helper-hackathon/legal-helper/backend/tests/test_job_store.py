@@ -0,0 +1,105 @@
+import time
+
+from app.services.job_store import JobStore, QUEUED, RUNNING, DONE, FAILED
+
+
+def _store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_create_queued_job(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.create("summarize", "abc", "a.pdf", input_path="/tmp/a.pdf")
+    job = store.get(job_id)
+    assert job["status"] == QUEUED
+    assert job["progress"] == 0.0
+    assert job["owner"] is None
+    assert job["result"] is None
+    assert [j["id"] for j in store.queued("summarize")] == [job_id]
+    assert store.queued("other") == []
+
+
+def test_claim_is_exclusive(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.create("summarize", "abc")
+    assert store.claim(job_id, "worker-1")
+    assert not store.claim(job_id, "worker-2")
+    job = store.get(job_id)
+    assert job["status"] == RUNNING
+    assert job["owner"] == "worker-1"
+    assert store.queued("summarize") == []
+
+
+def test_claim_across_connections(tmp_path):
+    # Two stores on one file stand in for two uvicorn worker processes
+    first, second = _store(tmp_path), _store(tmp_path)
+    job_id = first.create("summarize", "abc")
+    assert second.claim(job_id, "worker-2")
+    assert not first.claim(job_id, "worker-1")
+    assert first.get(job_id)["owner"] == "worker-2"
+
+
+def test_done_job_returns_result(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.create("summarize", "abc")
+    store.claim(job_id, "worker-1")
+    store.put_result("summarize", "abc", {"summary": "ok"})
+    store.update(job_id, status=DONE, stage=None, progress=1.0)
+    job = store.get(job_id)
+    assert job["status"] == DONE
+    assert job["result"] == {"summary": "ok"}
+    assert not store.claim(job_id, "worker-2")
+
+
+def test_cached_job_created_done(tmp_path):
+    store = _store(tmp_path)
+    store.put_result("summarize", "abc", {"summary": "ok"})
+    job = store.get(store.create("summarize", "abc", status=DONE, cached=True))
+    assert job["status"] == DONE
+    assert job["progress"] == 1.0
+    assert job["cached"] == 1
+    assert job["result"] == {"summary": "ok"}
+
+
+def test_failed_job(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.create("summarize", "abc")
+    store.claim(job_id, "worker-1")
+    store.update(job_id, status=FAILED, error="boom")
+    job = store.get(job_id)
+    assert job["status"] == FAILED
+    assert job["error"] == "boom"
+    assert job["result"] is None
+    assert store.requeue_stale("summarize", lease_s=0) == 0
+
+
+def test_requeue_stale_running_job(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.create("summarize", "abc")
+    store.claim(job_id, "worker-1")
+    store.update(job_id, stage="extracting", progress=0.3)
+
+    # Within the lease the job stays with its owner
+    assert store.requeue_stale("summarize", lease_s=60) == 0
+    assert store.get(job_id)["status"] == RUNNING
+
+    time.sleep(0.01)
+    assert store.requeue_stale("summarize", lease_s=0.001) == 1
+    job = store.get(job_id)
+    assert job["status"] == QUEUED
+    assert job["owner"] is None
+    assert job["stage"] is None
+    assert job["progress"] == 0.0
+    assert store.claim(job_id, "worker-2")
+
+
+def test_heartbeat_keeps_lease(tmp_path):
+    store = _store(tmp_path)
+    job_id = store.create("summarize", "abc")
+    store.claim(job_id, "worker-1")
+    time.sleep(0.05)
+    store.heartbeat("worker-1")
+    assert store.requeue_stale("summarize", lease_s=0.04) == 0
+    store.heartbeat("worker-2")  # another worker's heartbeat does not cover this job
+    time.sleep(0.05)
+    assert store.requeue_stale("summarize", lease_s=0.04) == 1
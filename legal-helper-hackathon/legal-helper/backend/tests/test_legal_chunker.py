@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("langdetect")
+
+from app.utils.legal_chunker import chunk_legal_text
+
+SECTION_420 = """420. Cheating and dishonestly inducing delivery of property.—Whoever cheats and thereby dishonestly induces the person deceived to deliver any property shall be punished.
+Illustration
+A, by falsely pretending to be in the Civil Service, cheats Z."""
+
+SECTION_34 = """34. Acts done by several persons in furtherance of common intention.—(1) When a criminal act is done by several persons in furtherance of the common intention of all, each is liable.
+(2) A person is liable where—
+(a) he does the act himself, or
+(b) he abets the act.
+(c) he is present when the act is committed.
+Explanation.—The intention may be formed on the spot."""
+
+HINDI_SECTION = """३०२. हत्या के लिए दंड.—जो कोई हत्या करेगा, वह मृत्यु या आजीवन कारावास से दंडित किया जाएगा।
+(क) पहला खंड।
+(ख) दूसरा खंड।"""
+
+
+def test_short_section_is_one_chunk_with_merged_block_types():
+    chunks = list(chunk_legal_text([SECTION_420]))
+    assert len(chunks) == 1
+    text, metadata = chunks[0]
+    assert text.startswith("420. Cheating")
+    assert metadata["section"] == "420"
+    assert metadata["block_type"] == "section"
+    assert metadata["block_types"] == "section,illustration"
+
+
+def test_long_section_splits_at_clauses():
+    chunks = list(chunk_legal_text([SECTION_34], max_chars=120))
+    sections = [metadata["section"] for _, metadata in chunks]
+    # Clauses are labelled under their sub-section; (a) and (b) fit one chunk together
+    assert "34(2)(a)" in sections
+    assert "34(2)(c)" in sections
+    assert "34 Explanation" in sections
+    for text, metadata in chunks:
+        assert metadata["parent_section"] == "34"
+        assert metadata["block_type"] in metadata["block_types"].split(",")
+        if metadata["block_type"] == "clause":
+            assert text.startswith("34. Acts done")  # continuation chunks repeat the title
+
+
+def test_hindi_clauses():
+    chunks = list(chunk_legal_text([HINDI_SECTION], max_chars=60))
+    assert chunks[0][1]["section"] == "302"
+    text, metadata = chunks[-1]
+    assert metadata["section"] == "302(क)"
+    assert metadata["block_type"] == "clause"
+    assert "(ख) दूसरा खंड" in text
+
+
+def test_clause_needs_following_space():
+    chunks = list(chunk_legal_text(["12. Title.—Body text.\n(a)bc is not a clause."]))
+    assert len(chunks) == 1
+    assert chunks[0][1]["block_types"] == "section"
+
+
+
+def test_parenthesised_words_are_not_clauses():
+    text = "12. Title.—Body text.\n(see) section 34 for the rule.\n(and) so on."
+    chunks = list(chunk_legal_text([text]))
+    assert len(chunks) == 1
+    assert chunks[0][1]["block_types"] == "section"
+    chunks = list(chunk_legal_text([text + "\n(iv) a real clause."]))
+    assert chunks[0][1]["block_types"] == "section,clause"
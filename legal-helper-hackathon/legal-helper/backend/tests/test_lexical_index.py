@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("langdetect")
+
+from app.services.lexical_index import reciprocal_rank_fusion, section_key
+
+
+def test_rrf_scores_are_summed_reciprocal_ranks():
+    fused = dict(reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60))
+    assert fused["a"] == pytest.approx(1 / 61)
+    assert fused["b"] == pytest.approx(1 / 62 + 1 / 61)
+    assert fused["c"] == pytest.approx(1 / 63)
+    assert fused["d"] == pytest.approx(1 / 62)
+
+
+def test_rrf_prefers_documents_found_by_both_rankings():
+    vector = ["v1", "shared", "v2", "v3"]
+    lexical = ["l1", "l2", "shared"]
+    ranked = [doc_id for doc_id, _ in reciprocal_rank_fusion([vector, lexical])]
+    assert ranked[0] == "shared"
+    assert set(ranked) == set(vector) | set(lexical)
+
+
+def test_rrf_ties_keep_first_seen_order():
+    # Same rank in both lists: equal scores, stable order of first appearance
+    ranked = [doc_id for doc_id, _ in reciprocal_rank_fusion([["x", "y"], ["y", "x"]])]
+    assert ranked == ["x", "y"]
+
+
+def test_rrf_small_k_favours_top_ranks():
+    rankings = [["a", "b", "c", "d"], ["d", "c", "b", "a"], ["a"]]
+    assert reciprocal_rank_fusion(rankings, k=1)[0][0] == "a"
+
+
+def test_rrf_empty():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []
+
+
+@pytest.mark.parametrize("statute_type, section, expected", [
+    ("IPC", "302", "IPC 302"),
+    ("ipc", "IPC_302", "IPC 302"),
+    ("BNS", "318 (4)", "BNS 318"),
+    ("IPC", "304 B", "IPC 304B"),
+    ("IPC", "३०२", "IPC 302"),
+    ("IPC", "", ""),
+    ("", "302", ""),
+    ("IPC", "Preamble", ""),
+])
+def test_section_key(statute_type, section, expected):
+    assert section_key(statute_type, section) == expected
@@ -0,0 +1,52 @@
+import pytest
+
+pytest.importorskip("PyPDF2")
+
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject, NumberObject
+
+from app.utils.pdf_text import _page_key
+
+
+def _stream(data: bytes, **entries) -> DecodedStreamObject:
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    stream.update({NameObject(k): v for k, v in entries.items()})
+    return stream
+
+
+def _form_page(writer: PdfWriter, text: str, encoding: str = "/WinAnsiEncoding"):
+    """A page whose only content is `q /Fm0 Do Q`: the text lives in the Form XObject."""
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+        NameObject("/Encoding"): NameObject(encoding),
+    })
+    form = _stream(
+        f"BT /F1 12 Tf 10 10 Td ({text}) Tj ET".encode("latin-1"),
+        **{"/Type": NameObject("/XObject"), "/Subtype": NameObject("/Form"),
+           "/BBox": ArrayObject([NumberObject(0)] * 4),
+           "/Resources": DictionaryObject({
+               NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)})
+           })}
+    )
+    page = writer.add_blank_page(200, 200)
+    page[NameObject("/Contents")] = writer._add_object(_stream(b"q /Fm0 Do Q"))
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/XObject"): DictionaryObject({NameObject("/Fm0"): writer._add_object(form)})
+    })
+    return page
+
+
+def test_form_xobject_text_is_part_of_the_key():
+    writer = PdfWriter()
+    alpha, beta, alpha_again = (_form_page(writer, text) for text in ("alpha", "beta", "alpha"))
+    assert _page_key(alpha) is not None
+    assert _page_key(alpha) != _page_key(beta)
+    assert _page_key(alpha) == _page_key(alpha_again)
+
+
+def test_font_encoding_is_part_of_the_key():
+    writer = PdfWriter()
+    assert _page_key(_form_page(writer, "alpha")) != _page_key(_form_page(writer, "alpha", "/MacRomanEncoding"))
@@ -0,0 +1,85 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("langdetect")
+
+from app.services.section_mapping import SectionMappingIndex, build_section_mapping, mapping_path
+
+# Unit vectors: IPC 302 ~ BNS 103, IPC 420 ~ BNS 318, IPC 999 has no close BNS section
+STATUTES = [
+    ("ipc_302", {"statute_type": "IPC", "section": "IPC_302"}, [1.0, 0.0, 0.0, 0.0]),
+    ("ipc_420", {"statute_type": "IPC", "section": "420"}, [0.0, 1.0, 0.0, 0.0]),
+    ("ipc_999", {"statute_type": "IPC", "section": "999"}, [0.0, 0.0, 0.0, 1.0]),
+    ("bns_103", {"statute_type": "BNS", "section": "103"}, [0.95, 0.1, 0.0, 0.0]),
+    ("bns_318", {"statute_type": "BNS", "section": "318"}, [0.1, 0.95, 0.0, 0.0]),
+    ("bns_101", {"statute_type": "BNS", "section": "101"}, [0.9, 0.0, 0.3, 0.0]),
+]
+
+
+class FakeCollection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get(self, where=None, include=None):
+        rows = [row for row in self.rows
+                if not where or all(row[1].get(k) == v for k, v in where.items())]
+        return {
+            "ids": [row[0] for row in rows],
+            "metadatas": [row[1] for row in rows],
+            "embeddings": [row[2] for row in rows],
+            "documents": [row[3] if len(row) > 3 else "" for row in rows]
+        }
+
+
+class FakeClient:
+    def __init__(self, collections):
+        self.collections = collections
+
+    def get_collection(self, name):
+        if name not in self.collections:
+            raise ValueError(name)
+        return self.collections[name]
+
+
+@pytest.fixture
+def mapping(tmp_path):
+    client = FakeClient({
+        "statutes_english": FakeCollection(STATUTES),
+        # The comparison table states IPC 302 -> BNS 101 outright, overriding similarity
+        "ipc_bns_mapping": FakeCollection([("m1", {}, [], "IPC Section 302 → BNS Section 101 (murder)")]),
+    })
+    return build_section_mapping(client, str(tmp_path)), tmp_path
+
+
+def test_explicit_pair_wins_over_similarity(mapping):
+    index, _ = mapping
+    entry = index.lookup("302")
+    assert entry["bns_section"] == "101"
+    assert entry["method"] == "explicit"
+    assert (entry["ipc_id"], entry["bns_id"]) == ("ipc_302", "bns_101")
+
+
+def test_similarity_pair_is_inferred(mapping):
+    index, _ = mapping
+    entry = index.lookup("IPC 420")
+    assert entry["bns_section"] == "318"
+    assert entry["method"] == "embedding"
+
+
+def test_pair_below_min_score_is_left_out(mapping):
+    index, _ = mapping
+    assert index.lookup("999") is None
+    assert len(index) == 2
+
+
+def test_reverse_lookup_and_round_trip(mapping):
+    index, tmp_path = mapping
+    assert index.lookup_bns("BNS 101")["ipc_section"] == "302"
+    assert index.lookup_bns("103") is None
+    loaded = SectionMappingIndex.load(mapping_path(str(tmp_path)))
+    assert loaded.ipc_to_bns == index.ipc_to_bns
+    assert loaded.bns_to_ipc == index.bns_to_ipc
+
+
+def test_missing_table_is_empty(tmp_path):
+    assert len(SectionMappingIndex.load(str(tmp_path / "missing.json"))) == 0
@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("langdetect")
+
+from app.utils.text_processing import create_legal_metadata, detect_language, normalize_section_number
+
+
+@pytest.mark.parametrize("text, expected", [
+    # English, including queries full of words that look like Hinglish markers
+    ("What is the punishment for the offence of theft?", "en"),
+    ("What are the rights of the accused?", "en"),
+    ("Is cheating to obtain property a cognizable offence?", "en"),
+    ("Difference between culpable homicide and murder", "en"),
+    # Devanagari, with and without embedded acronyms and digits
+    ("हत्या के लिए क्या सजा है?", "hi"),
+    ("चोरी का अपराध क्या है?", "hi"),
+    ("IPC धारा 302 क्या है", "hi"),
+    # Hinglish: romanized Hindi, or both scripts together
+    ("murder ki saza kya hai", "mixed"),
+    ("dahej ke liye pareshan karne par kya hota hai", "mixed"),
+    ("cheating case mein bail milegi kya", "mixed"),
+    ("cheating ka case धोखाधड़ी", "mixed"),
+    # Acronyms, citations and empty input say nothing about the language
+    ("IPC 302", "en"),
+    ("BNS 318(4)", "en"),
+    ("FIR", "en"),
+    ("", "en"),
+])
+def test_detect_language(text, expected):
+    assert detect_language(text) == expected
+
+
+def test_detect_language_samples_long_text():
+    text = "हत्या के लिए क्या सजा है? " * 200
+    assert detect_language(text) == "hi"
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("murder ki saza kya hai", "en"),
+    ("धोखाधड़ी का मामला, cheating", "hi"),
+    ("Punishment for theft", "en"),
+])
+def test_document_language_is_never_mixed(description, expected):
+    assert create_legal_metadata({"description": description}, "statute")["language"] == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("IPC_140", "140"),
+    ("302", "302"),
+    ("302 A", "302A"),
+    ("498A", "498A"),
+    ("318(4)", "318"),
+    ("३०२", "302"),
+    ("Section", ""),
+])
+def test_normalize_section_number(value, expected):
+    assert normalize_section_number(value) == expected
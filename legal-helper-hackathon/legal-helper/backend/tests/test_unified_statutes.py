@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("langdetect")
+
+from app.services.lexical_index import LexicalIndex
+from app.services.unified_statutes import link_counterparts, link_sections
+
+IDS = ["ipc_en_302", "bns_en_103", "ipc_hi_302a", "ipc_hi_302b", "ipc_hi_intro"]
+DOCUMENTS = ["Section 302 murder", "BNS Section 103 murder", "धारा 302 हत्या", "धारा 302 दंड", "प्रस्तावना"]
+METADATAS = [
+    {"statute_type": "IPC", "section": "IPC_302", "language": "english"},
+    {"statute_type": "BNS", "section": "103", "language": "english"},
+    {"statute_type": "IPC", "section": "३०२", "language": "hindi"},
+    {"statute_type": "IPC", "section": "302", "language": "hindi"},
+    {"statute_type": "IPC", "language": "hindi"},
+]
+
+
+def unified_index() -> LexicalIndex:
+    return LexicalIndex(IDS, DOCUMENTS, link_sections(IDS, METADATAS))
+
+
+def results(index: LexicalIndex, positions: list[int], distance: float = 0.3) -> dict:
+    return index.to_results([(idx, distance) for idx in positions])
+
+
+def test_link_sections_links_same_section_across_languages():
+    linked = {doc_id: m for doc_id, m in zip(IDS, link_sections(IDS, METADATAS))}
+    assert linked["ipc_en_302"]["section_key"] == "IPC 302"
+    assert linked["ipc_en_302"]["linked_ids"] == "ipc_hi_302a,ipc_hi_302b"
+    assert linked["ipc_hi_302b"]["linked_ids"] == "ipc_en_302"
+    # No counterpart in the other language, or no section at all
+    assert linked["bns_en_103"]["linked_ids"] == ""
+    assert linked["ipc_hi_intro"]["section_key"] == ""
+
+
+def test_link_counterparts_adds_other_language_after_hit():
+    index = unified_index()
+    expanded = link_counterparts(results(index, [2, 1]), index, n_results=4)
+    assert expanded["ids"][0] == ["ipc_hi_302a", "ipc_en_302", "bns_en_103"]
+    # The linked document ranks with the hit that brought it in
+    assert expanded["distances"][0] == [0.3, 0.3, 0.3]
+
+
+def test_link_counterparts_skips_sections_already_covered():
+    index = unified_index()
+    expanded = link_counterparts(results(index, [0, 3]), index, n_results=4)
+    assert expanded["ids"][0] == ["ipc_en_302", "ipc_hi_302b"]
+
+
+def test_link_counterparts_caps_results():
+    index = unified_index()
+    expanded = link_counterparts(results(index, [2, 1]), index, n_results=2)
+    assert expanded["ids"][0] == ["ipc_hi_302a", "ipc_en_302"]
+
+
+def test_link_counterparts_without_index_or_hits():
+    index = unified_index()
+    hits = results(index, [2])
+    assert link_counterparts(hits, None, n_results=4) is hits
+    assert link_counterparts(None, index, n_results=4) is None